@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Cargas distribuidas (fuerzas superficiales) sobre los lados de los EF
+rectangulares serendípitos de 8 nodos en el caso AXISIMÉTRICO.
+
+Los lados cargados se ubican con el índice topológico de la malla (ver
+Topologia en leer_GMSH.py), sin recorrer todos los EF, y las fuerzas nodales
+equivalentes de todos los lados se integran a la vez con
+t2ft_R89_axisimetrico_lados (ver funciones.py).
+
+Lados del EF (numeración local de ejemplo_Q8_axisimetrico_*.py):
+
+        7 -------6--------5
+        |       567       |
+        8 781         345 4
+        |       123       |
+        1--------2--------3
+"""
+
+import numpy as np
+from leer_GMSH import Topologia
+from funciones import t2ft_R89_axisimetrico_lados
+
+# nodos locales de cada lado del EF y nombre con el que se identifica
+LADOS_Q8    = np.array([[0, 1, 2], [2, 3, 4], [4, 5, 6], [6, 7, 0]])
+NOMBRE_LADO = np.array([123, 345, 567, 781])
+
+
+def topologia_Q8(LaG):
+    ''' Índice topológico de la malla con los lados 123, 345, 567 y 781 de la
+        numeración local de los EF Q8.
+    '''
+    return Topologia(LaG, LADOS_Q8)
+
+
+def aplicar_fsuperf(topo, cargas):
+    ''' Ubica los lados de los EF sobre los que actúan cargas distribuidas
+        uniformes.
+
+        Recibe:
+            topo:   índice topológico de la malla (ver topologia_Q8).
+            cargas: lista de tuplas (nodos_lado, Fx, Fy), una por cada curva
+                    cargada, con sus nodos (desde 0) y las componentes de la
+                    carga.
+
+        Retorna: (e, lado, carga)
+            e:     array (nlados,). EF al que pertenece cada lado cargado.
+            lado:  array (nlados,). Lado del EF (0 a 3, ver NOMBRE_LADO).
+            carga: array (nlados, 6). [tix tiy tjx tjy tkx tky] en los nodos
+                   del lado.
+    '''
+    e, lado, carga = [np.zeros(0, dtype=int)], [np.zeros(0, dtype=int)], \
+                     [np.zeros((0, 6))]
+    for nodos_lado, Fx, Fy in cargas:
+        e_c, lado_c = topo.lados_frontera(nodos_lado)
+        e.append(e_c)
+        lado.append(lado_c)
+        carga.append(np.tile([Fx, Fy], (e_c.size, 3)))
+
+    return np.concatenate(e), np.concatenate(lado), np.concatenate(carga)
+
+
+def fuerzas_superficiales(xnod, LaG, e, lado, carga, n_gl=2):
+    ''' Calcula las fuerzas nodales equivalentes de las cargas distribuidas
+        que actúan sobre los lados (e, lado) (ver aplicar_fsuperf).
+
+        Retorna: (nodos, fte)
+            nodos: array (nlados, 3). Nodos de cada lado cargado.
+            fte:   array (nlados, 6). Fuerzas nodales equivalentes en esos
+                   nodos [fix fiy fjx fjy fkx fky].
+    '''
+    nodos = LaG[e[:, None], LADOS_Q8[lado]]
+    return nodos, t2ft_R89_axisimetrico_lados(xnod[nodos], carga, n_gl)
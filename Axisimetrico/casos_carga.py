@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Casos y combinaciones de carga para el caso AXISIMÉTRICO con EF Q8.
+
+Las cargas básicas (fuerzas másicas, cada grupo "carga_*" y cada grupo
+"puntual_*") se arman como columnas de una sola matriz (ngdl, nbasicas), y
+cada combinación es una suma ponderada de ellas, de modo que todas las
+combinaciones se obtienen con un solo producto matricial. El sistema se
+resuelve para todas las combinaciones a la vez, como un bloque de lados
+derechos (ngdl, ncasos), con una sola factorización de Kdd: resolver 50
+combinaciones cuesta una factorización más 50 sustituciones.
+
+Uso:
+    casos = CasosCarga(gdl, dict_nombres)
+    casos.fuerzas_masicas('peso_propio', idx, f_ef)
+    casos.puntuales(datos['puntuales'], dict_nodos)
+    casos.distribuidas(datos['cargas'], dict_nodos, xnod, LaG, topo)
+    F = casos.combinar({'servicio': {'peso_propio': 1, 'carga_0_-4000': 1},
+                        'ultima':   {'peso_propio': 1.2, 'carga_0_-4000': 1.6}})
+    A, Q = resolver_casos(particion, K, F, ac)
+    campos = deformaciones_esfuerzos_casos(A, idx, dN, De, mat, LaG)
+"""
+
+import numpy as np
+
+from cargas import aplicar_fsuperf, fuerzas_superficiales
+from elemento_Q8 import deformaciones_Q8, esfuerzos_Q8, extrapolar_promediar
+from nombres_fisicos import nodos_registros
+from solucionadores import factorizar
+
+
+class CasosCarga:
+    ''' Cargas básicas de la estructura, guardadas como columnas de una
+        matriz (ngdl, nbasicas).
+
+        Argumentos:
+        - gdl: array (nno, 2). Grados de libertad de cada nodo.
+        - dict_nombres: dict {tag: (dim, nombre)} de los grupos físicos; las
+                        cargas de cada grupo se identifican con su nombre.
+
+        Atributos:
+        - nombres: list. Nombre de cada carga básica.
+    '''
+
+    def __init__(self, gdl, dict_nombres):
+        self.gdl = gdl
+        self.dict_nombres = dict_nombres
+        self.nombres = []
+        self._columnas = []
+
+    def _agregar(self, nombres, F):
+        repetidos = set(nombres) & set(self.nombres)
+        if repetidos:
+            raise ValueError(f'Las cargas básicas {sorted(repetidos)} ya existen')
+        self.nombres.extend(nombres)
+        self._columnas.append(F)
+
+    def _nombres_grupos(self, registros):
+        return [self.dict_nombres[tag][1] for tag in registros['tag'].tolist()]
+
+    @property
+    def matriz(self):
+        ''' Matriz (ngdl, nbasicas) con las cargas básicas. '''
+        if not self._columnas:
+            return np.zeros((self.gdl.size, 0))
+        return np.concatenate(self._columnas, axis=1)
+
+    def fuerzas_masicas(self, nombre, idx, f_ef):
+        ''' Agrega la carga básica de las fuerzas nodales equivalentes f_ef
+            (nef, 16) de los EF (por ejemplo, las del peso propio que retorna
+            Kfe_Q8_axisimetrico).
+        '''
+        F = np.zeros((self.gdl.size, 1))
+        np.add.at(F[:, 0], idx, f_ef)
+        self._agregar([nombre], F)
+
+    def puntuales(self, puntuales, dict_nodos):
+        ''' Agrega una carga básica por cada grupo "puntual_*". '''
+        nodos, i_reg = nodos_registros(puntuales, dict_nodos)
+        F = np.zeros((self.gdl.size, puntuales.size))
+        np.add.at(F, (self.gdl[nodos], i_reg[:, None]),
+                  np.c_[puntuales['Px'], puntuales['Py']][i_reg])
+        self._agregar(self._nombres_grupos(puntuales), F)
+
+    def distribuidas(self, cargas, dict_nodos, xnod, LaG, topo, n_gl=2):
+        ''' Agrega una carga básica por cada grupo "carga_*"; las fuerzas
+            nodales equivalentes de los lados cargados de todos los grupos se
+            integran a la vez.
+        '''
+        lados = [aplicar_fsuperf(topo, [(np.asarray(dict_nodos[tag]) - 1,
+                                         fx, fy)])
+                 for tag, fx, fy in cargas[['tag', 'fx', 'fy']].tolist()]
+        F = np.zeros((self.gdl.size, cargas.size))
+        if lados:
+            e, lado, carga = [np.concatenate(x) for x in zip(*lados)]
+            i_caso = np.repeat(np.arange(len(lados)), [l[0].size for l in lados])
+            nodos, fte = fuerzas_superficiales(xnod, LaG, e, lado, carga, n_gl)
+            np.add.at(F, (self.gdl[nodos].reshape((e.size, 6)),
+                          i_caso[:, None]), fte)
+        self._agregar(self._nombres_grupos(cargas), F)
+
+    def combinar(self, combinaciones):
+        ''' Arma los vectores de fuerzas de las combinaciones de carga.
+
+            Recibe:
+                combinaciones: dict {nombre: {carga_basica: factor}}.
+
+            Retorna:
+                F: array (ngdl, ncomb). Una columna por combinación, en el
+                   orden de "combinaciones".
+        '''
+        pos = {nombre: i for i, nombre in enumerate(self.nombres)}
+        W = np.zeros((len(self.nombres), len(combinaciones)))
+        for j, (comb, factores) in enumerate(combinaciones.items()):
+            for basica, factor in factores.items():
+                if basica not in pos:
+                    raise ValueError(f'La carga básica "{basica}" de la '
+                                     f'combinación "{comb}" no existe')
+                W[pos[basica], j] = factor
+        return self.matriz @ W
+
+
+def resolver_casos(particion, K, F, ac, metodo='auto', **kwargs):
+    ''' Resuelve K @ a = f + q para todos los casos de carga a la vez, con una
+        sola factorización de Kdd.
+
+        Recibe:
+            particion: ParticionDC con los gdl desconocidos y conocidos.
+            K:         matriz de rigidez global (dispersa).
+            F:         array (ngdl, ncasos). Fuerzas nodales de cada caso.
+            ac:        array (nc,) o (nc, ncasos). Desplazamientos conocidos.
+            metodo, kwargs: ver solucionadores.factorizar().
+
+        Retorna: (A, Q)
+            A: array (ngdl, ncasos). Desplazamientos de cada caso.
+            Q: array (ngdl, ncasos). Fuerzas nodales de equilibrio.
+    '''
+    d, c = particion.d, particion.c
+    Kdd, Kdc, Kcd, Kcc = particion.submatrices(K)
+    ncasos = F.shape[1]
+    AC = np.broadcast_to(np.reshape(ac, (c.size, -1)), (c.size, ncasos))
+
+    resolver_Kdd = factorizar(Kdd, metodo, **kwargs)
+    AD = resolver_Kdd(F[d] - Kdc@AC).reshape((d.size, ncasos))
+    QD = Kcc@AC + Kcd@AD - F[c]
+
+    return particion.unir(AD, AC), particion.unir(np.zeros_like(AD), QD)
+
+
+def deformaciones_esfuerzos_casos(A, idx, dN, De, mat, LaG):
+    ''' Deformaciones y esfuerzos en los nodos (extrapolados y promediados)
+        de todos los casos de carga a la vez.
+
+        Recibe:
+            A:   array (ngdl, ncasos). Desplazamientos de cada caso.
+            idx: array (nef, 16). Gdl de cada EF.
+            dN, De, mat: ver deformaciones_Q8 y esfuerzos_Q8.
+            LaG: array (nef, 8). Nodos de cada EF.
+
+        Retorna:
+            campos: array (ncasos, nno, 8) con [er, ez, et, grz, sr, sz, st,
+                    trz] en cada nodo.
+    '''
+    nno, ncasos = A.shape[0]//2, A.shape[1]
+    ae = np.moveaxis(A[idx], 2, 0)                      # (ncasos, nef, 16)
+    deform = deformaciones_Q8(ae, dN)
+    esfuer = esfuerzos_Q8(deform, De, mat)
+
+    # los campos de todos los casos se extrapolan y promedian juntos
+    campos_gl = np.moveaxis(np.concatenate((deform, esfuer), axis=4), 0, 3)
+    campos_gl = campos_gl.reshape(campos_gl.shape[:3] + (ncasos*8,))
+    campos = extrapolar_promediar(campos_gl, LaG, nno)
+    return np.moveaxis(campos.reshape((nno, ncasos, 8)), 1, 0)
@@ -15,7 +15,18 @@ deformaciones y los esfuerzos de la estructura mostrada en la figura adjunta
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from funciones import t2ft_R89_axisimetrico, compartir_variables, plot_esf_def
+from ensamblaje import ensamblar_K
+from elemento_Q8 import Kfe_Q8_axisimetrico, deformaciones_Q8, esfuerzos_Q8
+from elemento_Q8 import extrapolar_promediar
+from solucionadores import factorizar
+from esfuerzos_principales import esfuerzos_principales
+from cargas import topologia_Q8, aplicar_fsuperf, fuerzas_superficiales
+from nombres_fisicos import leer_nombres, fuerzas_puntuales, cargas_distribuidas
+from restricciones import restricciones, ParticionDC
+from funciones import ResultMesh
+from exportar_figuras import exportar_campos
+from casos_carga import CasosCarga, resolver_casos
+from casos_carga import deformaciones_esfuerzos_casos
 from leer_GMSH import *
 
 
@@ -26,38 +37,27 @@ g = 9.81 # [m/s²]   aceleración de la gravedad
 
 # %% seleccione la malla a emplear:
 
-malla = 'malla_boussinesq.msh'
+# el archivo .msh se lee una sola vez; las funciones de leer_GMSH reciben
+# directamente el objeto Mesh para no volver a abrirlo. Con cache=True la
+# malla leída se guarda en disco y las siguientes ejecuciones no usan GMSH
+malla = Mesh('malla_boussinesq.msh', cache=False)
 
 # %% Se obtienen los grupos físicos de la malla:
-# dict_nombres: Diccionario de la forma {tag : nombre_fisico}
-# dict_nodos:   Diccionario de la forma {tag : (dim, nodos_grupo_fisico)}
+# dict_nombres: Diccionario de la forma {tag : (dim, nombre_fisico)}
+# dict_nodos:   Diccionario de la forma {tag : nodos_grupo_fisico}
 
-dict_nombres, dict_nodos = grupos_fisicos(malla)
+dict_nombres, dict_nodos = malla.grupos_fisicos()
+
+# Los materiales, apoyos y cargas se leen de una vez de los nombres de los
+# grupos físicos (ver la gramática en nombres_fisicos.py)
+datos = leer_nombres(dict_nombres)
 
 # %% Opción para leer las propiedades del material:
 
 # Se leen directamente desde la malla:
-Ee = np.array([])   # Módulo de elasticidad [Pa]
-nue = np.array([])  # Relación de Poisson
-rhoe = np.array([]) # Densidad [kg/m³]
-
-for tag in dict_nombres.keys():
-    nombre_grupo = dict_nombres[tag]  # Nombre del grupo físico
-    if nombre_grupo[:3] == 'mat':
-        # Se identifican posiciones de los separadores
-        g1 = nombre_grupo.index('_')
-        g2 = nombre_grupo.index('_', g1+1)
-        g3 = nombre_grupo.index('_', g2+1)
-        
-        # Se leen las propiedades entre separadores
-        E = float(nombre_grupo[g1+1:g2])
-        nu = float(nombre_grupo[g2+1:g3])
-        rho = float(nombre_grupo[g3+1:])
-        
-        # Y se agregan a los vectores respectivos
-        Ee = np.append(Ee, E)
-        nue = np.append(nue, nu)
-        rhoe = np.append(rhoe, rho)
+Ee   = datos['materiales']['E']    # Módulo de elasticidad [Pa]
+nue  = datos['materiales']['nu']   # Relación de Poisson
+rhoe = datos['materiales']['rho']  # Densidad [kg/m³]
 
 nmat = Ee.size  # Número de materiales distintos en la malla
 
@@ -89,59 +89,18 @@ nef = LaG.shape[0]    # número de EFs (número de filas de la matriz LaG)
 
 # %% Se leen condiciones de frontera de la malla y se aplican restricciones:
 
-# Se inicializa vector de GDL restringidos
-c = np.array([], dtype=int) # gdl del desplazamiento conocidos (c)
-
-for tag in dict_nombres.keys():
-    nombre_fis = dict_nombres[tag] # Se lee el nombre del grupo físico
-    
-    # Si se trata de puntos individuales con restricciones:
-    if nombre_fis[:5] == 'punto':
-        if nombre_fis[5:] =='_res_xy':
-            nodos_pxy = dict_nodos[tag][1] - 1
-            c = np.append(c, gdl[nodos_pxy, :].flatten())
-        elif nombre_fis[5:] =='_res_x':
-            nodos_px = dict_nodos[tag][1] - 1
-            c = np.append(c, gdl[nodos_px, X])
-        elif nombre_fis[5:] =='_res_y':
-            nodos_py = dict_nodos[tag][1] - 1
-            c = np.append(c, gdl[nodos_py, Y])
-    
-    # Si se trata de bordes con restricciones:
-    if nombre_fis[:5] == 'borde':
-        if nombre_fis[5:] =='_res_xy':
-            nodos_bxy = dict_nodos[tag][1] - 1
-            c = np.append(c, gdl[nodos_bxy, :].flatten())
-        elif nombre_fis[5:] =='_res_x':
-            nodos_bx = dict_nodos[tag][1] - 1
-            c = np.append(c, gdl[nodos_bx, X])
-        elif nombre_fis[5:] =='_res_y':
-            nodos_by = dict_nodos[tag][1] - 1
-            c = np.append(c, gdl[nodos_by, Y])
-
-c = np.unique(c)       # Se descartan valores repetidos en c
-ac = np.zeros_like(c)  # Desplazamientos conocidos (nulos)
-
-# grados de libertad del desplazamiento desconocidos
-d = np.setdiff1d(range(ngdl), c)
-
-# %% Relación de cargas puntuales:
-f = np.zeros(ngdl)
+# gdl restringidos y desplazamientos prescritos de todos los grupos
+# "punto_*" y "borde_*" (ver la gramática en nombres_fisicos.py)
+restringido, u_prescrito = restricciones(datos['apoyos'], dict_nodos, gdl)
 
-for tag in dict_nombres.keys():
-    nombre_grupo = dict_nombres[tag]
-    if nombre_grupo[:7] == 'puntual':
-        nodos_puntual = dict_nodos[tag][1] - 1
-        
-        # Se identifican posiciones de los separadores
-        g1 = nombre_grupo.index('_')
-        g2 = nombre_grupo.index('_', g1+1)
+# partición de los gdl: c = gdl del desplazamiento conocidos,
+# d = gdl del desplazamiento desconocidos
+particion = ParticionDC(restringido)
+c, d = particion.c, particion.d
+ac = u_prescrito[c]    # Desplazamientos conocidos
 
-        # Se leen las cargas y se agregan al vector f
-        Px = float(nombre_grupo[g1+1:g2])
-        Py = float(nombre_grupo[g2+1:])
-        f[gdl[nodos_puntual, X]] += Px
-        f[gdl[nodos_puntual, Y]] += Py
+# %% Relación de cargas puntuales:
+f = fuerzas_puntuales(datos['puntuales'], dict_nodos, gdl)
 
 
 # %% Se dibuja la malla de elementos finitos
@@ -152,55 +111,15 @@ mostrar_num_elem = False
 
 plot_msh(malla, '2D', mostrar_nodos, mostrar_num_nodo, mostrar_num_elem)
 
-#%% Funciones de forma (serendípitas) y sus derivadas del elemento rectangular
-#   de 8 nodos:
-Nforma = lambda xi,eta: np.array(
-                        [-((eta - 1)*(xi - 1)*(eta + xi + 1))/4,    # N1
-                          ((xi**2 - 1)*(eta - 1))/2,                # N2
-                          ((eta - 1)*(xi + 1)*(eta - xi + 1))/4,    # N3
-                         -((eta**2 - 1)*(xi + 1))/2,                # N4
-                          ((eta + 1)*(xi + 1)*(eta + xi - 1))/4,    # N5
-                         -((xi**2 - 1)*(eta + 1))/2,                # N6
-                          ((eta + 1)*(xi - 1)*(xi - eta + 1))/4,    # N7
-                          ((eta**2 - 1)*(xi - 1))/2              ]) # N8
-
-# derivadas de las funciones de forma con respecto a xi
-dN_dxi = lambda xi,eta: np.array(
-                        [-((eta + 2*xi)*(eta - 1))/4,    # dN1_dxi
-                          eta*xi - xi,                   # dN2_dxi
-                          ((eta - 2*xi)*(eta - 1))/4,    # dN3_dxi
-                          1/2 - eta**2/2,                # dN4_dxi
-                          ((eta + 2*xi)*(eta + 1))/4,    # dN5_dxi
-                         -xi*(eta + 1),                  # dN6_dxi
-                         -((eta - 2*xi)*(eta + 1))/4,    # dN7_dxi
-                          eta**2/2 - 1/2              ]) # dN8_dxi
-
-# derivadas de N con respecto a eta
-dN_deta = lambda xi,eta: np.array(
-                         [-((2*eta + xi)*(xi - 1))/4,    # dN1_deta
-                           xi**2/2 - 1/2,                # dN2_deta
-                           ((xi + 1)*(2*eta - xi))/4,    # dN3_deta
-                          -eta*(xi + 1),                 # dN4_deta
-                           ((2*eta + xi)*(xi + 1))/4,    # dN5_deta
-                           1/2 - xi**2/2,                # dN6_deta
-                          -((xi - 1)*(2*eta - xi))/4,    # dN7_deta
-                           eta*(xi - 1)               ]) # dN8_deta
-
 #%% Cuadratura de Gauss-Legendre
 # NOTA: se asumirá aquí el mismo orden de la cuadratura tanto en la dirección
 #       de xi como en la dirección de eta
 n_gl       = 2                       # orden de la cuadratura de Gauss-Legendre
-x_gl, w_gl = np.polynomial.legendre.leggauss(n_gl)
 
 # %% Ensamblaje la matriz de rigidez global y el vector de fuerzas másicas
 #    nodales equivalentes global
 
-# se inicializan la matriz de rigidez global y los espacios en memoria que
-#  almacenarán las matrices de forma y de deformación
-K = np.zeros((ngdl, ngdl))          # matriz de rigidez global
-N = np.empty((nef,n_gl,n_gl,2,2*8)) # matriz de forma en cada punto de GL
-B = np.empty((nef,n_gl,n_gl,4,2*8)) # matriz de deformaciones en cada punto de GL
-idx = nef * [None]                  # indices asociados a los gdl del EF e
+idx = gdl[LaG].reshape((nef, 2*8))  # indices asociados a los gdl de cada EF
 
 # matriz constitutiva del elemento para el caso AXISIMETRICO
 De = nmat * [ None ]
@@ -213,74 +132,20 @@ for i in range(nmat):
                   [0,           0,         0,         (1-2*nue[i])/2]])
     be[i] = np.array([0, -rhoe[i]*g])  # [kgf/m³] vector de fuerzas másicas
 
-# para cada elemento finito en la malla:
-for e in range(nef):
-    # se calculan con el siguiente ciclo las matrices de rigidez y el vector de
-    # fuerzas nodales equivalentes del elemento usando las cuadraturas de GL
-    Ke = np.zeros((16, 16))
-    fe = np.zeros(16)
-    det_Je = np.empty((n_gl, n_gl))      # matriz para almacenar los jacobianos
-
-    for p in range(n_gl):
-        for q in range(n_gl):
-            # en cada punto de la cuadratura de Gauss-Legendre se evalúan las
-            # funciones de forma y sus derivadas
-            xi_gl, eta_gl = x_gl[p], x_gl[q]
-
-            NNforma  = Nforma (xi_gl, eta_gl)
-            ddN_dxi  = dN_dxi (xi_gl, eta_gl)
-            ddN_deta = dN_deta(xi_gl, eta_gl)
-
-            # se llaman las coordenadas nodales del elemento para calcular las
-            # derivadas de la función de transformación
-            xe, ye = xnod[LaG[e], X], xnod[LaG[e], Y]
-
-            dx_dxi  = np.sum(ddN_dxi  * xe);    dy_dxi  = np.sum(ddN_dxi  * ye)
-            dx_deta = np.sum(ddN_deta * xe);    dy_deta = np.sum(ddN_deta * ye)
-
-            # se calcula el radio del punto de Gauss
-            r = np.sum(NNforma * xe)
-
-            # con ellas se ensambla la matriz Jacobiana del elemento y se
-            # calcula su determinante
-            Je = np.array([[dx_dxi,  dy_dxi ],
-                           [dx_deta, dy_deta]])
-            det_Je[p, q] = np.linalg.det(Je)
-
-            # las matrices de forma y de deformación se evalúan y se ensamblan
-            # en el punto de Gauss
-            Npq = np.empty((2, 2*8))
-            Bpq = np.empty((4, 2*8))
-            for i in range(8):
-                Npq[:,[2*i, 2*i+1]] = np.array([[NNforma[i], 0         ],
-                                                [0,          NNforma[i]]])
-
-                dNi_dx = (+dy_deta*ddN_dxi[i] - dy_dxi*ddN_deta[i])/det_Je[p,q]
-                dNi_dy = (-dx_deta*ddN_dxi[i] + dx_dxi*ddN_deta[i])/det_Je[p,q]
-                Bpq[:,[2*i, 2*i+1]] = np.array([[dNi_dx,       0     ],
-                                                [0,            dNi_dy],
-                                                [NNforma[i]/r, 0     ],
-                                                [dNi_dy,       dNi_dx]])
-            N[e,p,q] = Npq
-            B[e,p,q] = Bpq
-
-            # se ensamblan la matriz de rigidez del elemento y el vector de
-            # fuerzas nodales equivalentes del elemento
-            Ke += Bpq.T @ De[mat[e]] @ Bpq * det_Je[p,q]*r*w_gl[p]*w_gl[q]
-            fe += Npq.T @ be[mat[e]]       * det_Je[p,q]*r*w_gl[p]*w_gl[q]
-    Ke *= 2*np.pi
-    fe *= 2*np.pi
-
-    # se determina si hay puntos con jacobiano negativo, en caso tal se termina
-    # el programa y se reporta
-    if np.any(det_Je <= 0):
-        raise Exception(f'Hay puntos con det_Je negativo en el elemento {e+1}')
-
-    # y se añaden la matriz de rigidez del elemento y el vector de fuerzas
-    # nodales del elemento a sus respectivos arreglos de la estructura
-    idx[e] = gdl[LaG[e]].flatten() # se obtienen los grados de libertad
-    K[np.ix_(idx[e], idx[e])] += Ke
-    f[np.ix_(idx[e])]         += fe
+# se calculan de una vez, para todos los EF, las matrices de rigidez, los
+# vectores de fuerzas nodales equivalentes y las derivadas de las funciones
+# de forma en cada punto de GL, que se guardan para calcular luego las
+# deformaciones (ver elemento_Q8.py). Con dtype_dN=np.float32 se reduce a la
+# mitad la memoria que ocupan
+K_ef, f_ef, dN = Kfe_Q8_axisimetrico(xnod, LaG, mat, De, be, n_gl,
+                                     dtype_dN=np.float64)
+
+# se añaden los vectores de fuerzas nodales de los elementos al vector de
+# fuerzas de la estructura
+np.add.at(f, idx, f_ef)
+
+# se ensambla la matriz de rigidez global (dispersa) de una sola vez
+K = ensamblar_K(idx, K_ef, ngdl)
 
 # %% Muestro la configuración de la matriz K (K es rala)
 plt.figure()
@@ -290,38 +155,25 @@ plt.show()
 
 # %% Se obtienen las cargas distribuidas de la malla:
 
-cd = pd.DataFrame()  # se inicializa el dataframe 
-
-for tag in dict_nombres.keys():
-    nombre_grupo = dict_nombres[tag]
-    if nombre_grupo[:5] == 'carga':
-        nodos_lado = dict_nodos[tag][1] - 1
-        
-        # Se leen posiciones de los separadores en el nombre
-        g1 = 5
-        g2 = nombre_grupo.index('_', g1+1)
-        
-        # Se leen las cargas y se agregan a un DataFrame
-        Fx = float(nombre_grupo[g1+1:g2])
-        Fy = float(nombre_grupo[g2+1:])
-        df = aplicar_fsuperf(LaG, nodos_lado, Fx, Fy)
-        cd = cd.append(df, ignore_index=True)
-
-nlcd = cd.shape[0]  # número de lados con carga distribuida
+# índice topológico de la malla con los lados 123, 345, 567 y 781 de los EF;
+# con él se ubican los lados cargados sin recorrer todos los EF
+topo = topologia_Q8(LaG)
+
+# (nodos, Fx, Fy) de cada grupo físico con carga distribuida
+cargas_cd = cargas_distribuidas(datos['cargas'], dict_nodos)
+
+# se ubican de una vez los lados de los EF con carga distribuida
+e_cd, lado_cd, carga_cd = aplicar_fsuperf(topo, cargas_cd)
+nlcd = e_cd.size  # número de lados con carga distribuida
 
 #%% Cálculo de las cargas nodales equivalentes de las cargas distribuidas:
    
 ft   = np.zeros(ngdl)  # fuerzas nodales equivalentes de cargas superficiales
 
-# por cada lado cargado se obtienen las fuerzas nodales equivalentes en los
-# nodos y se añaden al vector de fuerzas superficiales
-for i in range(nlcd):
-   e     = cd['elemento'][i] - 1
-   lado  = cd['lado'][i]
-   carga = cd[['tix', 'tiy', 'tjx', 'tjy', 'tkx', 'tky']].loc[i].to_numpy()
-   fte   = t2ft_R89_axisimetrico(xnod[LaG[e,:],:], lado, carga)
-
-   ft[np.ix_(idx[e])] += fte
+# se obtienen de una vez las fuerzas nodales equivalentes en los nodos de
+# todos los lados cargados y se añaden al vector de fuerzas superficiales
+nodos_cd, ft_cd = fuerzas_superficiales(xnod, LaG, e_cd, lado_cd, carga_cd)
+np.add.at(ft, gdl[nodos_cd].reshape((nlcd, 6)), ft_cd)
 
 
 # %% agrego al vector de fuerzas nodales equivalentes las fuerzas
@@ -337,17 +189,23 @@ f += ft
 #| qd |   | Kcc Kcd || ac |   | fd |  # recuerde que qc=0 (siempre)
 #|    | = |         ||    | - |    |
 #| qc |   | Kdc Kdd || ad |   | fc |
-Kcc = K[np.ix_(c,c)];  Kcd = K[np.ix_(c,d)]; fd = f[c]
-Kdc = K[np.ix_(d,c)];  Kdd = K[np.ix_(d,d)]; fc = f[d]
+# (las submatrices se extraen de K dispersa renumerando los gdl en el orden
+# [d, c], sin copias con np.ix_)
+Kdd, Kdc, Kcd, Kcc = particion.submatrices(K)
+fd = f[c]
+fc = f[d]
 
 # %% resuelvo el sistema de ecuaciones
-ad = np.linalg.solve(Kdd, fc - Kdc@ac) # desplazamientos desconocidos
+# solucionador: 'auto' (CHOLMOD si está instalado, si no SuperLU), 'superlu',
+# 'cholmod' o 'gc' (gradientes conjugados con precondicionador 'jacobi', 'ilu'
+# o 'amg'). La factorización de Kdd se puede reutilizar para otras cargas
+resolver_Kdd = factorizar(Kdd, metodo='auto')
+ad = resolver_Kdd(fc - Kdc@ac)         # desplazamientos desconocidos
 qd = Kcc@ac + Kcd@ad - fd              # fuerzas de equilibrio desconocidas
 
 # armo los vectores de desplazamientos (a) y fuerzas (q)
-a = np.zeros(ngdl); q = np.zeros(ngdl) # separo la memoria
-a[c] = ac;          a[d] = ad          # desplazamientos
-q[c] = qd         # q[d] = qc = 0      # fuerzas nodales de equilibrio
+a = particion.unir(ad, ac)                # desplazamientos
+q = particion.unir(np.zeros_like(ad), qd) # fuerzas de equilibrio (qc = 0)
 
 # %% Dibujo la malla de elementos finitos y las deformada de esta
 delta  = np.reshape(a, (nno,2))
@@ -370,108 +228,99 @@ plt.tight_layout()
 plt.show()
 
 #%% Deformaciones y los esfuerzos en los puntos de Gauss
-deform = np.zeros((nef,n_gl,n_gl,4)) # deformaciones en cada punto de GL
-esfuer = np.zeros((nef,n_gl,n_gl,4)) # esfuerzos en cada punto de GL
-
-for e in range(nef):
-    ae = a[idx[e]]    # desplazamientos nodales del elemento e
-    for pp in range(n_gl):
-        for qq in range(n_gl):
-            deform[e,pp,qq] = B[e,pp,qq] @ ae              # calculo las deformaciones
-            esfuer[e,pp,qq] = De[mat[e]] @ deform[e,pp,qq] # calculo los esfuerzos
+# calculo las deformaciones y los esfuerzos en cada punto de GL de todos los EF
+deform = deformaciones_Q8(a[idx], dN)
+esfuer = esfuerzos_Q8(deform, De, mat)
 
 #%% Esfuerzos y deformaciones en los nodos:
-num_elem_ady = np.zeros(nno)
-sr  = np.zeros(nno);        er  = np.zeros(nno)
-sz  = np.zeros(nno);        ez  = np.zeros(nno)
-st  = np.zeros(nno);        et = np.zeros(nno)
-trz = np.zeros(nno);        grz = np.zeros(nno)
-
-# matriz de extrapolación
-A = np.array([
-    [  3**(1/2)/2 + 1,             -1/2,             -1/2,   1 - 3**(1/2)/2],
-    [3**(1/2)/4 + 1/4, 1/4 - 3**(1/2)/4, 3**(1/2)/4 + 1/4, 1/4 - 3**(1/2)/4],
-    [            -1/2,   1 - 3**(1/2)/2,   3**(1/2)/2 + 1,             -1/2],
-    [1/4 - 3**(1/2)/4, 1/4 - 3**(1/2)/4, 3**(1/2)/4 + 1/4, 3**(1/2)/4 + 1/4],
-    [  1 - 3**(1/2)/2,             -1/2,             -1/2,   3**(1/2)/2 + 1],
-    [1/4 - 3**(1/2)/4, 3**(1/2)/4 + 1/4, 1/4 - 3**(1/2)/4, 3**(1/2)/4 + 1/4],
-    [            -1/2,   3**(1/2)/2 + 1,   1 - 3**(1/2)/2,             -1/2],
-    [3**(1/2)/4 + 1/4, 3**(1/2)/4 + 1/4, 1/4 - 3**(1/2)/4, 1/4 - 3**(1/2)/4]])
-
-# se hace la extrapolación de los esfuerzos y las deformaciones en cada elemento
-# a partir de las lecturas en los puntos de Gauss
-for e in range(nef):
-    #sr[LaG[e]]  += A @ np.array([esfuer[e,0,0,0],   # I   = (p=0, q=0)
-    #                             esfuer[e,0,1,0],   # II  = (p=0, q=1)
-    #                             esfuer[e,1,0,0],   # III = (p=1, q=0)
-    #                             esfuer[e,1,1,0]])  # IV  = (p=1, q=1)
-    sr [LaG[e]] += A @ esfuer[e,:,:,0].ravel()
-    sz [LaG[e]] += A @ esfuer[e,:,:,1].ravel()
-    st [LaG[e]] += A @ esfuer[e,:,:,2].ravel()
-    trz[LaG[e]] += A @ esfuer[e,:,:,3].ravel()
-    er [LaG[e]] += A @ deform[e,:,:,0].ravel()
-    ez [LaG[e]] += A @ deform[e,:,:,1].ravel()
-    et [LaG[e]] += A @ deform[e,:,:,2].ravel()    
-    grz[LaG[e]] += A @ deform[e,:,:,3].ravel()
-
-    # se lleva un conteo de los elementos adyacentes a un nodo
-    num_elem_ady[LaG[e]] += 1
-
-# en todos los nodos se promedia los esfuerzos y las deformaciones de los
-# elementos, se alisa la malla de resultados
-sr  /= num_elem_ady;   er  /= num_elem_ady
-sz  /= num_elem_ady;   ez  /= num_elem_ady
-st  /= num_elem_ady;   et  /= num_elem_ady
-trz /= num_elem_ady;   grz /= num_elem_ady
+# se hace la extrapolación de los esfuerzos y las deformaciones de todos los
+# elementos a partir de las lecturas en los puntos de Gauss, y en todos los
+# nodos se promedian los valores de los elementos adyacentes (se alisa la
+# malla de resultados)
+er, ez, et, grz, sr, sz, st, trz = extrapolar_promediar(
+                      np.concatenate((deform, esfuer), axis=3), LaG, nno).T
 trt = 0
 ttz = 0
 
 
-# %% Se calculan para cada nodo los esfuerzos principales y sus direcciones
-s1 = np.zeros(nno);  n1 = np.zeros((nno, 3))
-s2 = np.zeros(nno);  n2 = np.zeros((nno, 3))
-s3 = np.zeros(nno);  n3 = np.zeros((nno, 3))
-for i in range(nno):
-    esfppales, dirppales = np.linalg.eigh(
-                             [[sr[i],   trt,    trz[i]],  # matriz de esfuerzos
-                              [trt,     st[i],  ttz   ],  # de Cauchy para 
-                              [trz[i],  ttz,    sz[i] ]]) # theta = grados
-
-    idx_esf = esfppales.argsort()[::-1] # ordene de mayor a menor
-    s1[i], s2[i], s3[i] = esfppales[idx_esf]
-    n1[i] = dirppales[:,idx_esf[0]]
-    n2[i] = dirppales[:,idx_esf[1]]
-    n3[i] = dirppales[:,idx_esf[2]]
-
-# Esfuerzo cortante máximo
-tmax = (s1-s3)/2                               # esfuerzo cortante máximo
-   
-# %% Calculo de los esfuerzos de von Mises
-sv   = np.sqrt(((s1-s2)**2 + (s2-s3)**2 + (s1-s3)**2)/2)
+# %% Se calculan para cada nodo los esfuerzos principales y sus direcciones,
+# el esfuerzo cortante máximo y los esfuerzos de von Mises (como trt = ttz = 0,
+# se usa la solución en forma cerrada del caso axisimétrico)
+s1, s2, s3, n1, n2, n3, tmax, sv = esfuerzos_principales(sr, sz, st, trz,
+                                                         trt, ttz)
 
 # %% Gráfica del post-proceso:
-# las matrices xnod y LaG se vuelven variables globales por facilidad
-compartir_variables(xnod, LaG)
+# contexto de graficación de la malla: guarda xnod, LaG y la triangulación,
+# que se construye una sola vez para todas las gráficas
+malla_res = ResultMesh(xnod, LaG)
 
 # deformaciones
-plot_esf_def(er,   r'$\epsilon_r$')
-plot_esf_def(ez,   r'$\epsilon_z$')
-plot_esf_def(et,   r'$\epsilon_\theta$')
-plot_esf_def(grz,  r'$\gamma_{rz}$ [rad]')
+malla_res.plot_esf_def(er,   r'$\epsilon_r$')
+malla_res.plot_esf_def(ez,   r'$\epsilon_z$')
+malla_res.plot_esf_def(et,   r'$\epsilon_\theta$')
+malla_res.plot_esf_def(grz,  r'$\gamma_{rz}$ [rad]')
 
 # esfuerzos
-plot_esf_def(sr,   r'$\sigma_r$ [Pa]')
-plot_esf_def(sz,   r'$\sigma_z$ [Pa]')
-plot_esf_def(st,   r'$\sigma_\theta$ [Pa]')
-plot_esf_def(trz,  r'$\tau_{rz}$ [Pa]')
+malla_res.plot_esf_def(sr,   r'$\sigma_r$ [Pa]')
+malla_res.plot_esf_def(sz,   r'$\sigma_z$ [Pa]')
+malla_res.plot_esf_def(st,   r'$\sigma_\theta$ [Pa]')
+malla_res.plot_esf_def(trz,  r'$\tau_{rz}$ [Pa]')
 
 # esfuerzos principales con sus orientaciones
-# plot_esf_def(s1,   r'$\sigma_1$ [Pa]',     ang                       )
-# plot_esf_def(s2,   r'$\sigma_2$ [Pa]',     ang+np.pi/2               )
-# plot_esf_def(tmax, r'$\tau_{máx}$ [Pa]', [ ang-np.pi/4, ang+np.pi/4 ])
+# malla_res.plot_esf_def(s1,   r'$\sigma_1$ [Pa]',     ang                       )
+# malla_res.plot_esf_def(s2,   r'$\sigma_2$ [Pa]',     ang+np.pi/2               )
+# malla_res.plot_esf_def(tmax, r'$\tau_{máx}$ [Pa]', [ ang-np.pi/4, ang+np.pi/4 ])
 
 # esfuerzos de von Mises
-# plot_esf_def(sv,   r'$\sigma_{VM}$ [Pa]')
+# malla_res.plot_esf_def(sv,   r'$\sigma_{VM}$ [Pa]')
+
+# %% Exportación de las figuras de todos los resultados:
+# con exportar_figuras = True se guardan en el directorio "figuras" las
+# gráficas de todos los campos (sin abrir ventanas), repartidas entre varios
+# procesos (ver exportar_figuras.py)
+exportar_figuras = False
+if exportar_figuras:
+    archivos = exportar_campos(xnod, LaG, {
+        'er':   (er,   r'$\epsilon_r$'),
+        'ez':   (ez,   r'$\epsilon_z$'),
+        'et':   (et,   r'$\epsilon_\theta$'),
+        'grz':  (grz,  r'$\gamma_{rz}$ [rad]'),
+        'sr':   (sr,   r'$\sigma_r$ [Pa]'),
+        'sz':   (sz,   r'$\sigma_z$ [Pa]'),
+        'st':   (st,   r'$\sigma_\theta$ [Pa]'),
+        'trz':  (trz,  r'$\tau_{rz}$ [Pa]'),
+        's1':   (s1,   r'$\sigma_1$ [Pa]'),
+        's2':   (s2,   r'$\sigma_2$ [Pa]'),
+        's3':   (s3,   r'$\sigma_3$ [Pa]'),
+        'tmax': (tmax, r'$\tau_{máx}$ [Pa]'),
+        'sv':   (sv,   r'$\sigma_{VM}$ [Pa]')},
+        directorio='figuras', formatos=('png', 'pdf'))
+    print(f'Se guardaron {len(archivos)} figuras en el directorio "figuras".')
+
+# %% Casos y combinaciones de carga:
+# con analizar_combinaciones = True se resuelven a la vez varias
+# combinaciones de las cargas básicas (peso propio, cada grupo "carga_*" y
+# cada grupo "puntual_*"), con una sola factorización de Kdd (ver
+# casos_carga.py). Los factores de cada combinación son solo un ejemplo
+analizar_combinaciones = False
+if analizar_combinaciones:
+    casos = CasosCarga(gdl, dict_nombres)
+    casos.fuerzas_masicas('peso_propio', idx, f_ef)
+    casos.distribuidas(datos['cargas'], dict_nodos, xnod, LaG, topo)
+    casos.puntuales(datos['puntuales'], dict_nodos)
+
+    externas = casos.nombres[1:]   # cargas básicas distintas al peso propio
+    combinaciones = {
+        'servicio':      {'peso_propio': 1.0, **{n: 1.0 for n in externas}},
+        'solo_peso':     {'peso_propio': 1.0},
+        'ultima':        {'peso_propio': 1.2, **{n: 1.6 for n in externas}}}
+    F_comb = casos.combinar(combinaciones)                  # (ngdl, ncomb)
+
+    A_comb, Q_comb = resolver_casos(particion, K, F_comb, ac)
+    campos_comb = deformaciones_esfuerzos_casos(A_comb, idx, dN, De, mat, LaG)
+    for j, nombre in enumerate(combinaciones):
+        print(f'{nombre:10s}: |a|máx = {np.abs(A_comb[:, j]).max():.3e} m, '
+              f'sz mín = {campos_comb[j, :, 5].min():.3e} Pa')
 
 # %% Reporte de los resultados:
 
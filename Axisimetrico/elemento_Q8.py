@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+Cálculo vectorizado de las matrices de rigidez y de los vectores de fuerzas
+másicas nodales equivalentes de todos los EF rectangulares serendípitos de 8
+nodos en el caso AXISIMÉTRICO.
+
+Las funciones de forma y sus derivadas se evalúan una sola vez en los puntos
+de Gauss, y los jacobianos, las matrices B y las integrales se calculan para
+todos los EF a la vez con np.einsum, en lugar de recorrer cada EF, cada punto
+de Gauss y cada nodo con ciclos de Python. Lo mismo se hace en la recuperación
+de deformaciones y esfuerzos y en su extrapolación a los nodos.
+
+Numeración local de los nodos (la misma de ejemplo_Q8_axisimetrico_*.py):
+
+        7 -------6--------5
+        |                 |
+        8                 4
+        |                 |
+        1--------2--------3
+"""
+
+import numpy as np
+
+# %% constantes que ayudarán en la lectura del código
+X, Y = 0, 1
+
+#%% Funciones de forma (serendípitas) y sus derivadas del elemento rectangular
+#   de 8 nodos:
+Nforma = lambda xi,eta: np.array(
+                        [-((eta - 1)*(xi - 1)*(eta + xi + 1))/4,    # N1
+                          ((xi**2 - 1)*(eta - 1))/2,                # N2
+                          ((eta - 1)*(xi + 1)*(eta - xi + 1))/4,    # N3
+                         -((eta**2 - 1)*(xi + 1))/2,                # N4
+                          ((eta + 1)*(xi + 1)*(eta + xi - 1))/4,    # N5
+                         -((xi**2 - 1)*(eta + 1))/2,                # N6
+                          ((eta + 1)*(xi - 1)*(xi - eta + 1))/4,    # N7
+                          ((eta**2 - 1)*(xi - 1))/2              ]) # N8
+
+# derivadas de las funciones de forma con respecto a xi
+dN_dxi = lambda xi,eta: np.array(
+                        [-((eta + 2*xi)*(eta - 1))/4,    # dN1_dxi
+                          eta*xi - xi,                   # dN2_dxi
+                          ((eta - 2*xi)*(eta - 1))/4,    # dN3_dxi
+                          1/2 - eta**2/2,                # dN4_dxi
+                          ((eta + 2*xi)*(eta + 1))/4,    # dN5_dxi
+                         -xi*(eta + 1),                  # dN6_dxi
+                         -((eta - 2*xi)*(eta + 1))/4,    # dN7_dxi
+                          eta**2/2 - 1/2              ]) # dN8_dxi
+
+# derivadas de N con respecto a eta
+dN_deta = lambda xi,eta: np.array(
+                         [-((2*eta + xi)*(xi - 1))/4,    # dN1_deta
+                           xi**2/2 - 1/2,                # dN2_deta
+                           ((xi + 1)*(2*eta - xi))/4,    # dN3_deta
+                          -eta*(xi + 1),                 # dN4_deta
+                           ((2*eta + xi)*(xi + 1))/4,    # dN5_deta
+                           1/2 - xi**2/2,                # dN6_deta
+                          -((xi - 1)*(2*eta - xi))/4,    # dN7_deta
+                           eta*(xi - 1)               ]) # dN8_deta
+
+# matriz de extrapolación de los puntos de Gauss (n_gl = 2) a los nodos:
+# nodos = A_EXTRAP @ [I, II, III, IV], con I = (p=0, q=0), II = (p=0, q=1),
+# III = (p=1, q=0) y IV = (p=1, q=1)
+A_EXTRAP = np.array([
+    [  3**(1/2)/2 + 1,             -1/2,             -1/2,   1 - 3**(1/2)/2],
+    [3**(1/2)/4 + 1/4, 1/4 - 3**(1/2)/4, 3**(1/2)/4 + 1/4, 1/4 - 3**(1/2)/4],
+    [            -1/2,   1 - 3**(1/2)/2,   3**(1/2)/2 + 1,             -1/2],
+    [1/4 - 3**(1/2)/4, 1/4 - 3**(1/2)/4, 3**(1/2)/4 + 1/4, 3**(1/2)/4 + 1/4],
+    [  1 - 3**(1/2)/2,             -1/2,             -1/2,   3**(1/2)/2 + 1],
+    [1/4 - 3**(1/2)/4, 3**(1/2)/4 + 1/4, 1/4 - 3**(1/2)/4, 3**(1/2)/4 + 1/4],
+    [            -1/2,   3**(1/2)/2 + 1,   1 - 3**(1/2)/2,             -1/2],
+    [3**(1/2)/4 + 1/4, 3**(1/2)/4 + 1/4, 1/4 - 3**(1/2)/4, 1/4 - 3**(1/2)/4]])
+
+# %%
+def funciones_forma_gl(n_gl):
+    ''' Evalúa las funciones de forma y sus derivadas en los n_gl x n_gl
+        puntos de la cuadratura de Gauss-Legendre.
+
+        Retorna: (NN, ddN_dxi, ddN_deta, w_pq)
+            NN, ddN_dxi, ddN_deta: arrays (n_gl, n_gl, 8), donde el punto
+                                   (p, q) corresponde a xi = x_gl[p] y
+                                   eta = x_gl[q].
+            w_pq:                  array (n_gl, n_gl) con los pesos
+                                   w_gl[p]*w_gl[q].
+    '''
+    x_gl, w_gl = np.polynomial.legendre.leggauss(n_gl)
+    xi_gl, eta_gl = np.meshgrid(x_gl, x_gl, indexing='ij')
+
+    NN       = np.moveaxis(Nforma (xi_gl, eta_gl), 0, -1)
+    ddN_dxi  = np.moveaxis(dN_dxi (xi_gl, eta_gl), 0, -1)
+    ddN_deta = np.moveaxis(dN_deta(xi_gl, eta_gl), 0, -1)
+
+    return NN, ddN_dxi, ddN_deta, np.outer(w_gl, w_gl)
+
+
+def _geometria_gl(xnod, LaG, n_gl, tam_bloque):
+    ''' Recorre los EF por bloques de tam_bloque EF y, para cada bloque,
+        retorna (b, NN, w_pq, r, det_Je, dN_dx, dN_dy), donde b es la tajada
+        de EF del bloque y r, det_Je (nef_b, n_gl, n_gl) y dN_dx, dN_dy
+        (nef_b, n_gl, n_gl, 8) se evalúan en cada punto de Gauss.
+    '''
+    nef = LaG.shape[0]
+
+    # funciones de forma y sus derivadas en los puntos de Gauss (se evalúan
+    # una sola vez para todos los EF)
+    NN, ddN_dxi, ddN_deta, w_pq = funciones_forma_gl(n_gl)
+
+    for ini in range(0, nef, tam_bloque):
+        b = slice(ini, min(ini + tam_bloque, nef))
+
+        # se llaman las coordenadas nodales de los EF para calcular las
+        # derivadas de la función de transformación en cada punto de Gauss
+        xe, ye = xnod[LaG[b], X], xnod[LaG[b], Y]
+
+        dx_dxi  = np.einsum('pqi,ei->epq', ddN_dxi,  xe)
+        dy_dxi  = np.einsum('pqi,ei->epq', ddN_dxi,  ye)
+        dx_deta = np.einsum('pqi,ei->epq', ddN_deta, xe)
+        dy_deta = np.einsum('pqi,ei->epq', ddN_deta, ye)
+
+        # radio de cada punto de Gauss y determinante del Jacobiano
+        r      = np.einsum('pqi,ei->epq', NN, xe)
+        det_Je = dx_dxi*dy_deta - dy_dxi*dx_deta
+
+        # se determina si hay puntos con jacobiano negativo, en caso tal se
+        # termina el programa y se reporta
+        malos = np.flatnonzero(np.any(det_Je <= 0, axis=(1, 2)))
+        if malos.size > 0:
+            raise Exception(f'Hay puntos con det_Je negativo en el elemento '
+                            f'{ini+malos[0]+1}')
+
+        # derivadas de las funciones de forma con respecto a r y z
+        dN_dx = (+dy_deta[..., None]*ddN_dxi - dy_dxi[..., None]*ddN_deta) \
+                / det_Je[..., None]
+        dN_dy = (-dx_deta[..., None]*ddN_dxi + dx_dxi[..., None]*ddN_deta) \
+                / det_Je[..., None]
+
+        yield b, NN, w_pq, r, det_Je, dN_dx, dN_dy
+
+
+def Kfe_Q8_axisimetrico(xnod, LaG, mat, De, be, n_gl=2, tam_bloque=20000,
+                        dtype_dN=np.float64):
+    ''' Calcula las matrices de rigidez y los vectores de fuerzas másicas
+        nodales equivalentes de todos los EF de la malla.
+
+        Recibe:
+            xnod:  array (nno, 2). Coordenadas nodales [r, z].
+            LaG:   array (nef, 8). Nodos de cada EF (numeración local de los
+                   programas ejemplo_Q8_axisimetrico_*.py).
+            mat:   array (nef,). Material de cada EF.
+            De:    lista o array (nmat, 4, 4). Matriz constitutiva de cada
+                   material.
+            be:    lista o array (nmat, 2). Fuerzas másicas de cada material.
+            n_gl:  orden de la cuadratura de Gauss-Legendre.
+            tam_bloque: número de EF que se procesan a la vez; limita la
+                   memoria de los arreglos intermedios.
+            dtype_dN: tipo de dato con el que se guardan las derivadas de las
+                   funciones de forma en los puntos de Gauss (np.float64 o
+                   np.float32), o None para no guardarlas.
+
+        Retorna: (K_ef, f_ef, dN)
+            K_ef:  array (nef, 16, 16). Matriz de rigidez de cada EF.
+            f_ef:  array (nef, 16). Fuerzas másicas nodales equivalentes.
+            dN:    array (nef, n_gl, n_gl, 3, 8) con [dN/dr, dN/dz, N/r] en
+                   cada punto de Gauss (ver derivadas_Q8). Reemplaza a las
+                   matrices N y B, que en su mayoría son ceros, para calcular
+                   las deformaciones con deformaciones_Q8().
+    '''
+    nef = LaG.shape[0]
+    De = np.asarray(De)
+    be = np.asarray(be)
+
+    K_ef = np.empty((nef, 2*8, 2*8))
+    f_ef = np.empty((nef, 2*8))
+    dN = None if dtype_dN is None else \
+         np.empty((nef, n_gl, n_gl, 3, 8), dtype=dtype_dN)
+    for b, NN, w_pq, r, det_Je, dN_dx, dN_dy in \
+            _geometria_gl(xnod, LaG, n_gl, tam_bloque):
+        # matrices de deformación en todos los puntos de Gauss del bloque
+        # (solo se requieren mientras se calcula Ke)
+        Bb = np.zeros(det_Je.shape + (4, 2*8))
+        Bb[..., 0, 0::2] = dN_dx
+        Bb[..., 1, 1::2] = dN_dy
+        Bb[..., 2, 0::2] = NN/r[..., None]
+        Bb[..., 3, 0::2] = dN_dy
+        Bb[..., 3, 1::2] = dN_dx
+
+        if dN is not None:
+            dN[b, ..., 0, :] = dN_dx
+            dN[b, ..., 1, :] = dN_dy
+            dN[b, ..., 2, :] = NN/r[..., None]
+
+        # Ke = 2*pi * sum_pq B.T @ De @ B * det_Je * r * w_p * w_q
+        dV = 2*np.pi*det_Je*r*w_pq
+        DB = np.einsum('ekl,epqlj->epqkj', De[mat[b]], Bb, optimize=True)
+        K_ef[b] = np.einsum('epqki,epqkj,epq->eij', Bb, DB, dV, optimize=True)
+
+        # fe = 2*pi * sum_pq N.T @ be * det_Je * r * w_p * w_q
+        int_N = np.einsum('pqi,epq->ei', NN, dV)
+        f_ef[b, 0::2] = int_N * be[mat[b], X, None]
+        f_ef[b, 1::2] = int_N * be[mat[b], Y, None]
+
+    return K_ef, f_ef, dN
+
+
+def derivadas_Q8(xnod, LaG, n_gl=2, dtype=np.float64, tam_bloque=20000):
+    ''' Calcula (o vuelve a calcular cuando no se guardaron) las derivadas de
+        las funciones de forma en los puntos de Gauss de todos los EF.
+
+        Retorna:
+            dN: array (nef, n_gl, n_gl, 3, 8), donde dN[e, p, q] contiene las
+                filas [dN/dr, dN/dz, N/r] de los 8 nodos del EF e en el punto
+                de Gauss (p, q). Son los únicos valores distintos de cero de la
+                matriz B, así que ocupan 3*8 números por punto en lugar de 4*16.
+    '''
+    dN = np.empty((LaG.shape[0], n_gl, n_gl, 3, 8), dtype=dtype)
+    for b, NN, w_pq, r, det_Je, dN_dx, dN_dy in \
+            _geometria_gl(xnod, LaG, n_gl, tam_bloque):
+        dN[b, ..., 0, :] = dN_dx
+        dN[b, ..., 1, :] = dN_dy
+        dN[b, ..., 2, :] = NN/r[..., None]
+
+    return dN
+
+
+def deformaciones_Q8(ae, dN):
+    ''' Calcula las deformaciones [er, ez, et, grz] en los puntos de Gauss de
+        todos los EF, directamente a partir de las derivadas compactas dN
+        (equivale a B @ ae en cada punto de Gauss).
+
+        Recibe:
+            ae:  array (nef, 16). Desplazamientos nodales de cada EF, a[idx].
+                 También puede ser (ncasos, nef, 16), con los desplazamientos
+                 de varios casos de carga.
+            dN:  array (nef, n_gl, n_gl, 3, 8). Ver derivadas_Q8().
+
+        Retorna:
+            deform: array (nef, n_gl, n_gl, 4) (o (ncasos, nef, n_gl, n_gl, 4)).
+    '''
+    ur, uz = ae[..., 0::2], ae[..., 1::2] # desplazamientos radiales y axiales
+    dN_dr, dN_dz, N_r = dN[..., 0, :], dN[..., 1, :], dN[..., 2, :]
+
+    deform = np.empty(ae.shape[:-2] + dN.shape[:3] + (4,))
+    deform[..., 0] = np.einsum('epqi,...ei->...epq', dN_dr, ur)   # er
+    deform[..., 1] = np.einsum('epqi,...ei->...epq', dN_dz, uz)   # ez
+    deform[..., 2] = np.einsum('epqi,...ei->...epq', N_r,   ur)   # et
+    deform[..., 3] = np.einsum('epqi,...ei->...epq', dN_dz, ur) \
+                   + np.einsum('epqi,...ei->...epq', dN_dr, uz)   # grz
+    return deform
+
+
+def esfuerzos_Q8(deform, De, mat):
+    ''' Calcula los esfuerzos [sr, sz, st, trz] en los puntos de Gauss de
+        todos los EF, esfuer = De[mat[e]] @ deform[e, p, q].
+
+        Se hace una sola multiplicación matricial por material, en lugar de
+        una por cada punto de Gauss de cada EF. deform puede tener una
+        dimensión inicial adicional con los casos de carga (ver
+        deformaciones_Q8).
+    '''
+    De = np.asarray(De)
+    esfuer = np.empty_like(deform)
+    for m in np.unique(mat):
+        em = mat == m
+        esfuer[..., em, :, :, :] = deform[..., em, :, :, :] @ De[m].T
+    return esfuer
+
+
+def extrapolar_promediar(campos_gl, LaG, nno):
+    ''' Extrapola a los nodos los campos calculados en los puntos de Gauss
+        de cada EF y promedia en cada nodo los valores de los EF adyacentes
+        (se alisa la malla de resultados).
+
+        Recibe:
+            campos_gl: array (nef, 2, 2, ncomp). Campos en los puntos de Gauss
+                       (por ejemplo np.c_ de deformaciones y esfuerzos).
+            LaG:       array (nef, 8). Nodos de cada EF.
+            nno:       número de nodos de la malla.
+
+        Retorna:
+            campos_nod: array (nno, ncomp). Campos promediados en los nodos.
+    '''
+    nef = LaG.shape[0]
+    if campos_gl.shape[1:3] != (2, 2):
+        raise ValueError('La extrapolación a los nodos solo está definida '
+                         'para n_gl = 2')
+    ncomp = campos_gl.shape[3]
+
+    # extrapolación de todas las componentes de todos los EF a la vez
+    campos_ef = np.einsum('ig,egk->eik', A_EXTRAP,
+                          campos_gl.reshape((nef, 4, ncomp)))
+
+    # se suman las contribuciones de los EF en cada nodo y se lleva un conteo
+    # de los elementos adyacentes a un nodo
+    nodos = LaG.ravel()
+    num_elem_ady = np.bincount(nodos, minlength=nno)
+    campos_nod = np.empty((nno, ncomp))
+    for k in range(ncomp):
+        campos_nod[:, k] = np.bincount(nodos, weights=campos_ef[..., k].ravel(),
+                                       minlength=nno)
+
+    return campos_nod / num_elem_ady[:, None]
+
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Funciones para ensamblar la matriz de rigidez global como una matriz dispersa
+(scipy.sparse), de modo que la memoria requerida crezca con el número de EF y
+no con el cuadrado del número de grados de libertad.
+"""
+
+import numpy as np
+import scipy.sparse as sp  # pip install scipy
+
+# %%
+def ensamblar_K(idx, K_ef, ngdl):
+    ''' Ensambla la matriz de rigidez global a partir de las matrices de
+        rigidez de todos los EF.
+
+        Recibe:
+            idx:   array (nef, ngdl_ef). Grados de libertad de cada EF.
+            K_ef:  array (nef, ngdl_ef, ngdl_ef). Matriz de rigidez de cada EF.
+            ngdl:  número de grados de libertad de la estructura.
+
+        Retorna:
+            K:     matriz de rigidez global en formato CSR (scipy.sparse).
+
+        Se arman de una vez las tripletas (fila, columna, valor) de todos los
+        EF y se convierten a CSR, lo cual suma los valores repetidos.
+    '''
+    idx = np.asarray(idx)
+    filas = np.broadcast_to(idx[:, :, np.newaxis], K_ef.shape).ravel()
+    cols  = np.broadcast_to(idx[:, np.newaxis, :], K_ef.shape).ravel()
+
+    return sp.csr_matrix((np.ravel(K_ef), (filas, cols)), shape=(ngdl, ngdl))
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Cálculo vectorizado de los esfuerzos principales, sus direcciones, el
+esfuerzo cortante máximo y el esfuerzo de von Mises en todos los nodos (o
+puntos de Gauss) a la vez.
+
+Las componentes de la matriz de esfuerzos de Cauchy se organizan en el orden
+(r, theta, z):
+
+        [[ sr,  trt, trz ],
+         [ trt, st,  ttz ],
+         [ trz, ttz, sz  ]]
+
+En el caso axisimétrico trt = ttz = 0, así que st ya es un esfuerzo principal
+(con dirección theta) y los otros dos se obtienen en forma cerrada del bloque
+2x2 r-z (círculo de Mohr). Para estados de esfuerzo generales se diagonalizan
+todas las matrices con una sola llamada a np.linalg.eigh.
+"""
+
+import numpy as np
+
+
+def _ppales_cerrada(sr, sz, st, trz):
+    ''' Valores y vectores propios del estado de esfuerzos axisimétrico,
+        calculados en forma cerrada. Retorna (val, vec), con val (..., 3) y
+        vec (..., 3, 3), donde vec[..., :, i] es la dirección de val[..., i].
+    '''
+    centro = (sr + sz)/2                       # centro del círculo de Mohr
+    radio  = np.hypot((sr - sz)/2, trz)        # radio del círculo de Mohr
+    ang    = np.arctan2(2*trz, sr - sz)/2      # ángulo de la dirección de sa
+    c, s   = np.cos(ang), np.sin(ang)
+    cero, uno = np.zeros_like(c), np.ones_like(c)
+
+    val = np.stack((centro + radio, st, centro - radio), axis=-1)
+    vec = np.stack((np.stack((c,    cero, -s  ), axis=-1),    # componente r
+                    np.stack((cero, uno,  cero), axis=-1),    # componente theta
+                    np.stack((s,    cero,  c  ), axis=-1)),   # componente z
+                   axis=-2)
+    return val, vec
+
+
+def _ppales_eigh(sr, sz, st, trz, trt, ttz):
+    ''' Valores y vectores propios de un estado de esfuerzos general, con una
+        sola llamada vectorizada a np.linalg.eigh.
+    '''
+    sigma = np.stack((np.stack((sr,  trt, trz), axis=-1),
+                      np.stack((trt, st,  ttz), axis=-1),
+                      np.stack((trz, ttz, sz ), axis=-1)), axis=-2)
+    return np.linalg.eigh(sigma)
+
+
+def esfuerzos_principales(sr, sz, st, trz, trt=0, ttz=0, metodo='auto'):
+    ''' Calcula los esfuerzos principales y sus direcciones.
+
+        Recibe:
+            sr, sz, st, trz, trt, ttz: arrays (o escalares) con las
+                   componentes del esfuerzo, de cualquier forma compatible
+                   (por ejemplo (nno,) o (nef, n_gl, n_gl)).
+            metodo: 'cerrada' usa la solución en forma cerrada del caso
+                   axisimétrico (requiere trt = ttz = 0), 'eigh' diagonaliza
+                   la matriz de esfuerzos 3x3 completa y 'auto' escoge
+                   'cerrada' cuando trt y ttz son cero y 'eigh' en otro caso.
+
+        Retorna: (s1, s2, s3, n1, n2, n3, tmax, sv)
+            s1, s2, s3: esfuerzos principales, de mayor a menor.
+            n1, n2, n3: arrays (..., 3) con sus direcciones (r, theta, z).
+            tmax:       esfuerzo cortante máximo.
+            sv:         esfuerzo de von Mises.
+    '''
+    sr, sz, st, trz, trt, ttz = np.broadcast_arrays(
+                    *(np.asarray(c, dtype=float)
+                      for c in (sr, sz, st, trz, trt, ttz)))
+
+    cortantes_theta_nulos = not (np.any(trt) or np.any(ttz))
+    if metodo == 'auto':
+        metodo = 'cerrada' if cortantes_theta_nulos else 'eigh'
+
+    if metodo == 'cerrada':
+        if not cortantes_theta_nulos:
+            raise ValueError("El método 'cerrada' requiere trt = ttz = 0")
+        val, vec = _ppales_cerrada(sr, sz, st, trz)
+    elif metodo == 'eigh':
+        val, vec = _ppales_eigh(sr, sz, st, trz, trt, ttz)
+    else:
+        raise ValueError(f'Método "{metodo}" desconocido. Use "auto", '
+                         '"cerrada" o "eigh"')
+
+    # se ordenan los esfuerzos principales de mayor a menor
+    idx_esf = np.argsort(val, axis=-1)[..., ::-1]
+    val = np.take_along_axis(val, idx_esf, axis=-1)
+    vec = np.take_along_axis(vec, idx_esf[..., None, :], axis=-1)
+
+    s1, s2, s3 = val[..., 0], val[..., 1], val[..., 2]
+    n1, n2, n3 = vec[..., 0], vec[..., 1], vec[..., 2]
+
+    # esfuerzo cortante máximo y esfuerzo de von Mises
+    tmax = (s1 - s3)/2
+    sv   = np.sqrt(((s1 - s2)**2 + (s2 - s3)**2 + (s1 - s3)**2)/2)
+
+    return s1, s2, s3, n1, n2, n3, tmax, sv
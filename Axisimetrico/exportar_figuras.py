@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Exportación de las figuras de los resultados (plot_esf_def) sin abrir
+ventanas, usando varios procesos a la vez.
+
+Cada proceso trabajador usa el backend Agg de matplotlib y lee xnod, LaG y
+los campos a graficar desde memoria compartida (ver memoria_compartida.py),
+de modo que estos arreglos no se copian (ni se serializan) con cada figura; a
+cada tarea solo se le envía el nombre del archivo, el título y la fila del
+campo que debe graficar.
+
+NOTA: en los sistemas que no tienen "fork" (por ejemplo Windows), los
+procesos se crean con "spawn", que vuelve a importar el programa principal;
+en ese caso, la llamada a exportar_campos() debe quedar dentro de un bloque
+if __name__ == '__main__':
+"""
+
+import os
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from funciones import ResultMesh
+from memoria_compartida import mapa_compartido
+
+
+def _inicializar(trabajador):
+    ''' Se ejecuta una vez en cada proceso trabajador. '''
+    plt.switch_backend('Agg')   # sin ventanas
+
+    # la malla se crea una sola vez por proceso, así la triangulación se
+    # reutiliza en todas las figuras que este grafique
+    trabajador['malla'] = ResultMesh(trabajador['xnod'], trabajador['LaG'])
+
+
+def _exportar(trabajador, tarea):
+    archivos, titulo, i_campo, i_angulos = tarea
+    campos = trabajador['campos']
+    angulo = [campos[i] for i in i_angulos] if i_angulos else None
+    trabajador['malla'].guardar_esf_def(campos[i_campo], titulo, archivos,
+                                        angulo)
+    return archivos
+
+
+def exportar_campos(xnod, LaG, campos, directorio='figuras',
+                    formatos=('png',), procesos=None):
+    ''' Grafica con plot_esf_def() los campos dados y guarda las figuras en
+        "directorio", sin abrir ventanas y repartiendo las figuras entre
+        varios procesos.
+
+        Recibe:
+            xnod:       array (nno, 2). Coordenadas nodales.
+            LaG:        array (nef, 8). Nodos de cada EF.
+            campos:     dict {nombre: (variable, titulo)} o
+                        {nombre: (variable, titulo, angulo)}, donde variable
+                        es un array (nno,) y angulo un array (nno,) o una
+                        lista de ellos (ver plot_esf_def). Cada figura se
+                        guarda como "nombre.formato".
+            formatos:   formatos de archivo, por ejemplo ('png', 'pdf').
+            procesos:   número de procesos; por defecto, uno por núcleo.
+
+        Retorna:
+            lista con los nombres de los archivos creados.
+    '''
+    os.makedirs(directorio, exist_ok=True)
+
+    # todos los campos (y ángulos) se apilan en un solo arreglo, y cada tarea
+    # solo lleva las filas que le corresponden
+    filas, tareas = [], []
+    for nombre, (variable, titulo, *angulo) in campos.items():
+        i_campo = len(filas)
+        filas.append(variable)
+        angulos = angulo[0] if angulo and angulo[0] is not None else []
+        if isinstance(angulos, np.ndarray):
+            angulos = [angulos]
+        i_angulos = list(range(len(filas), len(filas) + len(angulos)))
+        filas.extend(angulos)
+        archivos = [os.path.join(directorio, f'{nombre}.{formato}')
+                    for formato in formatos]
+        tareas.append((archivos, titulo, i_campo, i_angulos))
+
+    creados = mapa_compartido(_exportar, tareas,
+                              {'xnod': xnod, 'LaG': LaG,
+                               'campos': np.array(filas, dtype=float)},
+                              _inicializar, procesos=procesos)
+
+    return [archivo for archivos in creados for archivo in archivos]
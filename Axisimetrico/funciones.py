@@ -2,28 +2,48 @@
 
 # Código creado por: Diego Andrés Alvarez (github.com/diegoandresalvarez)
 
+import threading
+from functools              import lru_cache
 import numpy                as np
 import matplotlib.pyplot    as plt
-import warnings
+import matplotlib.tri       as mtri
+from matplotlib.collections import LineCollection
+from matplotlib.figure      import Figure
 
 # %% constantes que ayudaran en la lectura del codigo
 X, Y = 0, 1
 NL1, NL2, NL3, NL4, NL5, NL6, NL7, NL8 = range(8)
 
-# %% variables globales que se heredarán del programa principal
-xnod = None
-LaG = None
+# división de cada EF en 6 triángulos para graficar (ver
+# ResultMesh.malla_graficacion)
+TRIANGULOS_Q8 = np.array([[NL1, NL2, NL8],
+                          [NL2, NL3, NL4],
+                          [NL4, NL5, NL6],
+                          [NL2, NL4, NL6],
+                          [NL2, NL6, NL8],
+                          [NL6, NL7, NL8]])
+
+# %% malla que comparten compartir_variables() y plot_esf_def(); solo se
+# conserva por compatibilidad con los programas que usan esas funciones (para
+# graficar varias mallas a la vez use directamente objetos ResultMesh)
+_malla_compartida = None
+
+# pyplot (estado global) y el dibujo de los textos de matplotlib (mathtext,
+# que se interpreta al dibujar) no son seguros entre hilos: solo esas llamadas
+# se hacen de a una a la vez; los triángulos, colores y curvas de nivel de cada
+# figura se arman en paralelo
+_candado_matplotlib = threading.Lock()
 
 # %%
 def compartir_variables(xnod_, LaG_):
     '''
     Importa variables globales del programa principal a este módulo
     '''
-    global xnod, LaG
-    xnod, LaG = xnod_, LaG_
+    global _malla_compartida
+    _malla_compartida = ResultMesh(xnod_, LaG_)
         
 # %%
-def t2ft_R89_axisimetrico(xnod, lado, carga):
+def t2ft_R89_axisimetrico(xnod, lado, carga, n_gl=2):
     '''Función que convierte las fuerzas superficiales aplicadas a un elemento
     finito rectangular de 8 (serendípito) o 9 (lagrangiano) nodos a sus 
     correspondientes cargas nodales equivalentes ft en el caso AXISIMETRICO   
@@ -45,6 +65,10 @@ def t2ft_R89_axisimetrico(xnod, lado, carga):
                [ t3x t3y t4x t4y t5x t5y ]; % si carga se aplica sobre lado 345
                [ t5x t5y t6x t6y t7x t7y ]; % si carga se aplica sobre lado 567
                [ t7x t7y t8x t8y t1x t1y ]; % si carga se aplica sobre lado 781
+
+        n_gl:  orden de la cuadratura de Gauss-Legendre.
+
+    Para muchos lados a la vez use t2ft_R89_axisimetrico_lados().
     '''
     
     # se definen los indices de los lados
@@ -59,131 +83,219 @@ def t2ft_R89_axisimetrico(xnod, lado, carga):
     if nno not in (8, 9):
         raise Exception('Solo para elementos rectangulares de 8 o 9 nodos')
 
-    # parámetros para mejorar la lectura del código
-    X, Y = 0, 1
-   
-    # se define el número de puntos de la cuadratura y se obtienen los puntos
-    # de evaluación y los pesos de la cuadratura
-    n_gl       = 2
+    # se calcula el vector de fuerzas nodales equivalentes del lado cargado
+    # y se ubica en los gdl de sus nodos
+    ft = np.zeros((nno, 2))
+    ft[idx] = t2ft_R89_axisimetrico_lados(xnod[idx][None], np.asarray(carga)[None],
+                                          n_gl)[0].reshape((3, 2))
+    return ft.ravel()
+
+# %%
+@lru_cache(maxsize=None)
+def _funciones_forma_lado(n_gl):
+    ''' Funciones de forma unidimensionales del lado de 3 nodos y sus
+    derivadas, evaluadas en los n_gl puntos de Gauss-Legendre: arrays (n_gl, 3)
+    NN, dNN_dxi y pesos w_gl (n_gl,).
+    '''
     x_gl, w_gl = np.polynomial.legendre.leggauss(n_gl)
-    
-    # se definen las funciones de forma unidimensionales y sus derivadas
-    NN      = lambda xi: np.array([ xi*(xi-1)/2, (1+xi)*(1-xi), xi*(1+xi)/2 ])
-    dNN_dxi = lambda xi: np.array([ xi - 1/2   , -2*xi        , xi + 1/2    ])
-       
-    # se calcula el vector de fuerzas distribuidas en los nodos
-    te = np.zeros(2*nno)
-    te[np.c_[2*idx, 2*idx + 1].ravel()] = carga
-    
-    # cálculo de la integral:
-    suma   = np.zeros((2*nno, 2*nno))
-    N      = np.zeros(nno)
-    dN_dxi = np.zeros(nno)
-    for p in range(n_gl):
-        # se evalúan las funciones de forma
-        N[idx] = NN(x_gl[p])
-        matN = np.empty((2,2*nno))
-        for i in range(nno):
-            matN[:,[2*i, 2*i+1]] = np.array([[N[i], 0   ],
-                                             [0,    N[i]]])
-
-        # se calcula el jacobiano
-        dN_dxi[idx] = dNN_dxi(x_gl[p])
-        r           = np.dot(N,      xnod[:,X])
-        dx_dxi      = np.dot(dN_dxi, xnod[:,X])
-        dy_dxi      = np.dot(dN_dxi, xnod[:,Y])
-        ds_dxi      = np.hypot(dx_dxi, dy_dxi)
-
-        # y se calcula la sumatoria
-        suma += r * matN.T @ matN * ds_dxi*w_gl[p]
-
-    # finalmente, se retorna el vector de fuerzas nodales equivalentes
-    return suma @ te
+    NN      = np.c_[ x_gl*(x_gl-1)/2, (1+x_gl)*(1-x_gl), x_gl*(1+x_gl)/2 ]
+    dNN_dxi = np.c_[ x_gl - 1/2     , -2*x_gl          , x_gl + 1/2      ]
+    for v in (NN, dNN_dxi, w_gl):
+        v.flags.writeable = False
+    return NN, dNN_dxi, w_gl
 
-#%%
-def plot_esf_def(variable, titulo, angulo = None):
+
+def t2ft_R89_axisimetrico_lados(xlados, carga, n_gl=2):
+    '''Versión vectorizada de t2ft_R89_axisimetrico: convierte las fuerzas
+    superficiales aplicadas sobre muchos lados de 3 nodos (de EF rectangulares
+    de 8 o 9 nodos) a sus cargas nodales equivalentes en el caso AXISIMETRICO,
+    integrando todos los lados a la vez.
+
+    Recibe:
+        xlados: array (nlados, 3, 2). Coordenadas [r, z] de los 3 nodos de
+                cada lado, en el orden en que se recorre (por ejemplo 1, 2, 3
+                para el lado 123).
+
+        carga:  array (nlados, 6). Fuerza distribuida en los nodos de cada
+                lado [ tix tiy tjx tjy tkx tky ].
+
+        n_gl:   orden de la cuadratura de Gauss-Legendre.
+
+    Retorna:
+        ft:     array (nlados, 6). Fuerzas nodales equivalentes en los nodos
+                de cada lado [ fix fiy fjx fjy fkx fky ].
     '''
-    Grafica variable para la malla de EFs especificada.
+    # funciones de forma unidimensionales y sus derivadas en los puntos de GL
+    # (se calculan una sola vez para cada n_gl)
+    NN, dNN_dxi, w_gl = _funciones_forma_lado(n_gl)
+
+    # radio, jacobiano y carga distribuida en cada punto de GL de cada lado
+    xlados = np.asarray(xlados)
+    r      = np.einsum('pi,ei->ep',   NN, xlados[:, :, X])
+    ds_dxi = np.linalg.norm(np.einsum('pi,eik->epk', dNN_dxi, xlados), axis=2)
+    t      = np.einsum('pi,eik->epk', NN, np.reshape(carga, (-1, 3, 2)))
+
+    # ft = sum_p N.T @ t * r * ds_dxi * w_p
+    ft = np.einsum('pi,epk,ep->eik', NN, t, r*ds_dxi*w_gl)
+    return ft.reshape((-1, 6))
+
+#%%
+class ResultMesh:
+    r'''
+    Malla de EF sobre la que se grafican los resultados (contexto de
+    graficación).
+
+    Guarda sus propias xnod y LaG y la triangulación que usa plot_esf_def(),
+    que se construye una sola vez y se reutiliza en todas sus gráficas. Como
+    no usa variables globales, se pueden posprocesar varias mallas a la vez
+    (por ejemplo, con un ThreadPoolExecutor), cada una con su ResultMesh; en
+    ese caso las figuras se deben guardar con guardar_esf_def().
+
+    Limitación: las figuras se arman en paralelo, pero su dibujo (ajuste del
+    diseño y guardado, que es cuando matplotlib interpreta los textos) se
+    hace de a una figura a la vez en todo el programa.
 
     Uso:
-        variable: es la variable que se quiere graficar
-        titulo:   título del gráfico
-        angulo:   opcional para los esfuerzos principales s1 y s2 y tmax
+        malla = ResultMesh(xnod, LaG)
+        malla.plot_esf_def(sr, r'$\sigma_r$ [Pa]')
+        malla.guardar_esf_def(sr, r'$\sigma_r$ [Pa]', ['sr.png', 'sr.pdf'])
     '''
+
+    def __init__(self, xnod, LaG):
+        self.xnod = xnod
+        self.LaG  = LaG
+        self._triangulacion = None
+        self._contornos     = None
+        self._candado = threading.Lock()
+
+    def malla_graficacion(self):
+        '''
+        Retorna la triangulación de la malla (cada EF dividido en 6
+        triángulos, ver abajo) y los contornos de los EF, array
+        (nef, 9, 2). Se construyen la primera vez que se piden.
+        '''
+        # Para propósitos de graficación el EF se divide en 6 triángulos así: 
+        #     
+        #                             7 -------6--------5
+        #                             |       /|\       |
+        #                             | EFT6 / | \ EFT3 |
+        #                             |     /  |  \     |
+        #                             |    /   |   \    |
+        #                             |   /    |    \   |
+        #                             |  /     |     \  |
+        #                             | /      |      \ |
+        #                             8/  EFT5 | EFT4  \4
+        #                             |\       |       /|
+        #                             | \      |      / |
+        #                             |  \     |     /  |
+        #                             |   \    |    /   |
+        #                             |    \   |   /    |
+        #                             |     \  |  /     |
+        #                             | EFT1 \ | / EFT2 |
+        #                             |       \|/       |
+        #                             1--------2--------3
+
+        with self._candado:
+            if self._triangulacion is None:
+                xnod, LaG = self.xnod, self.LaG
+
+                # matriz de correspondencia (LaG) de la nueva malla
+                # triangular: fila 6*e + k = triángulo k del EF e
+                LaG_t = LaG[:, TRIANGULOS_Q8].reshape((-1, 3))
+                triang = mtri.Triangulation(xnod[:, X], xnod[:, Y], LaG_t)
+                triang.get_cpp_triangulation()  # se construye desde ya
+                self._contornos = xnod[LaG[:, [NL1, NL2, NL3, NL4, NL5, NL6,
+                                               NL7, NL8, NL1]]][:, :, [X, Y]]
+                self._triangulacion = triang
+        return self._triangulacion, self._contornos
+
+    def plot_esf_def(self, variable, titulo, angulo = None, mostrar = True):
+        '''
+        Grafica variable para la malla de EFs especificada.
+
+        Uso:
+            variable: es la variable que se quiere graficar
+            titulo:   título del gráfico
+            angulo:   opcional para los esfuerzos principales s1 y s2 y tmax
+            mostrar:  si es False no se llama plt.show() y la figura se crea
+                      sin pyplot (para guardar figuras desde varios hilos a
+                      la vez use guardar_esf_def)
+
+        Retorna la figura creada.
+        '''
+        triang, contornos = self.malla_graficacion()
+
+        # si la figura no se va a mostrar, se crea sin pyplot para poder
+        # graficar desde varios hilos a la vez
+        if mostrar:
+            with _candado_matplotlib:
+                fig = plt.figure()
+        else:
+            fig = Figure()
+        self._graficar(fig, triang, contornos, variable, titulo, angulo)
+        with _candado_matplotlib:
+            fig.tight_layout()
+        if mostrar:
+            plt.show()
+
+        return fig
+
+    def guardar_esf_def(self, variable, titulo, archivos, angulo = None):
+        '''
+        Grafica variable (ver plot_esf_def) sin mostrarla y la guarda en cada
+        uno de los archivos dados. Se puede llamar desde varios hilos a la vez.
+        '''
+        triang, contornos = self.malla_graficacion()
+        fig = Figure()
+        self._graficar(fig, triang, contornos, variable, titulo, angulo)
+        with _candado_matplotlib:
+            fig.tight_layout()
+            for archivo in archivos:
+                fig.savefig(archivo)
+
+    def _graficar(self, fig, triang, contornos, variable, titulo, angulo):
+        xnod = self.xnod
+        ax = fig.subplots()
+
+        # se encuentra el máximo en valor absoluto para ajustar el colorbar()
+        val_max = np.max(np.abs(variable))    
+
+        # se grafica la malla de EFS (todas las aristas de una vez), los
+        # colores en cada triángulo y las curvas de nivel
+        ax.add_collection(LineCollection(contornos, lw = 0.5, color = 'gray'))
+
+        im = ax.tripcolor(triang, variable, cmap = 'bwr',
+                          shading = 'gouraud', vmin = -val_max, vmax = val_max)
+        ax.tricontour(triang, variable, 20)
     
-    # Para propósitos de graficación el EF se divide en 6 triángulos así: 
-    #     
-    #                             7 -------6--------5
-    #                             |       /|\       |
-    #                             | EFT6 / | \ EFT3 |
-    #                             |     /  |  \     |
-    #                             |    /   |   \    |
-    #                             |   /    |    \   |
-    #                             |  /     |     \  |
-    #                             | /      |      \ |
-    #                             8/  EFT5 | EFT4  \4
-    #                             |\       |       /|
-    #                             | \      |      / |
-    #                             |  \     |     /  |
-    #                             |   \    |    /   |
-    #                             |    \   |   /    |
-    #                             |     \  |  /     |
-    #                             | EFT1 \ | / EFT2 |
-    #                             |       \|/       |
-    #                             1--------2--------3
-        
-    nef = LaG.shape[0]    # número de elementos finitos en la malla original
-    
-    # se arma la matriz de correspondencia (LaG) de la nueva malla triangular
-    LaG_t = np.zeros((6*nef, 3), dtype = int)
-    for e in range(nef):
-        LaG_t[6*e + 0, :] = LaG[e, [NL1, NL2, NL8]]
-        LaG_t[6*e + 1, :] = LaG[e, [NL2, NL3, NL4]]
-        LaG_t[6*e + 2, :] = LaG[e, [NL4, NL5, NL6]]
-        LaG_t[6*e + 3, :] = LaG[e, [NL2, NL4, NL6]]
-        LaG_t[6*e + 4, :] = LaG[e, [NL2, NL6, NL8]]
-        LaG_t[6*e + 5, :] = LaG[e, [NL6, NL7, NL8]]
-    
-    # se inicializa el lienzo
-    fig, ax = plt.subplots() 
-
-    # se encuentra el máximo en valor absoluto para ajustar el colorbar()
-    val_max = np.max(np.abs(variable))    
-
-    # se grafica la malla de EFS, los colores en cada triángulo y las curvas 
-    # de nivel
-    for e in range(nef):
-        # se dibujan las aristas
-        nod_ef = LaG[e, [NL1, NL2, NL3, NL4, NL5, NL6, NL7, NL8, NL1]]
-        plt.plot(xnod[nod_ef, X], xnod[nod_ef, Y], lw = 0.5, color = 'gray')
-
-    im = ax.tripcolor(xnod[:, X], xnod[:, Y], LaG_t, variable, cmap = 'bwr',
-                      shading = 'gouraud', vmin = -val_max, vmax = val_max)
-    ax.tricontour(xnod[:, X], xnod[:, Y], LaG_t, variable, 20)
-    
-    # a veces sale un warning, simplemente porque no existe la curva 0
-    warnings.filterwarnings("ignore")
-    ax.tricontour(xnod[:, X], xnod[:, Y], LaG_t, variable, levels=[0], linewidths=3)
-    warnings.filterwarnings("default")
+        # la curva 0 solo se grafica si existe (si no, sale un warning)
+        if np.min(variable) < 0 < np.max(variable):
+            ax.tricontour(triang, variable, levels=[0], linewidths=3)
 
-    fig.colorbar(im, ax = ax, format = '%6.3g')
+        fig.colorbar(im, ax = ax, format = '%6.3g')
                 
-    # para los esfuerzos principales se grafican las líneas que indiquen las
-    # direcciones de los esfuerzos en cada nodo de la malla
-    if angulo is not None:
-       if type(angulo) is np.ndarray: 
-           angulo = [ angulo ]
-       for ang in angulo:
-           ax.quiver(xnod[:, X], xnod[:, Y], 
-                variable*np.cos(ang), variable*np.sin(ang), 
-                headwidth=0, headlength=0, headaxislength=0, pivot='middle')
+        # para los esfuerzos principales se grafican las líneas que indiquen
+        # las direcciones de los esfuerzos en cada nodo de la malla
+        if angulo is not None:
+           if type(angulo) is np.ndarray: 
+               angulo = [ angulo ]
+           for ang in angulo:
+               ax.quiver(xnod[:, X], xnod[:, Y], 
+                    variable*np.cos(ang), variable*np.sin(ang), 
+                    headwidth=0, headlength=0, headaxislength=0, pivot='middle')
     
-    # se especifican los ejes y el título, y se colocan los ejes iguales
-    ax.set_xlabel('$r$ [m]')
-    ax.set_ylabel('$z$ [m]')
-    ax.set_title(titulo, fontsize=20)
-
-    ax.set_aspect('equal')
-    ax.autoscale(tight=True)    
-    plt.tight_layout()
-    plt.show()
+        # se especifican los ejes y el título, y se colocan los ejes iguales
+        ax.set_xlabel('$r$ [m]')
+        ax.set_ylabel('$z$ [m]')
+        ax.set_title(titulo, fontsize=20)
+
+        ax.set_aspect('equal')
+        ax.autoscale(tight=True)    
+
+#%%
+def plot_esf_def(variable, titulo, angulo = None, mostrar = True):
+    '''
+    Grafica variable para la malla compartida con compartir_variables() (ver
+    ResultMesh.plot_esf_def).
+    '''
+    return _malla_compartida.plot_esf_def(variable, titulo, angulo, mostrar)
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Gráficos de una malla de EF a partir de sus arreglos xnod, LaG y mat: la
+malla completa (graficar_malla) y una vista previa rasterizada para mallas muy
+grandes (vista_previa_malla).
+
+Los usan leer_GMSH.py y Mallas_python/leer_GMSH.py (plot_msh y
+vista_previa_msh), que solo se encargan de leer el archivo .msh.
+
+Este archivo está copiado, sin cambios, en Axisimetrico/ y Mallas_python/,
+para que cada carpeta funcione por sí sola; los cambios se hacen en la copia
+de la carpeta raíz y se copian a las demás.
+"""
+
+import warnings
+
+import numpy as np
+import matplotlib.pyplot as plt
+from mpl_toolkits.mplot3d import Axes3D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+from matplotlib.collections import LineCollection
+from matplotlib.colors import BASE_COLORS, TABLEAU_COLORS, to_rgba_array
+
+from topologia_malla import Topologia
+
+# Tipo de EF según su número de nodos, y orden en el que se recorren sus nodos
+# para dibujar su contorno
+TIPO_EF = {3: 'T3', 4: 'Q4', 6: 'T6', 8: 'Q8', 9: 'Q9', 10: 'T10'}
+CONTORNO_EF = {'T3':  [0, 1, 2],
+               'Q4':  [0, 1, 2, 3],
+               'T6':  [0, 3, 1, 4, 2, 5],
+               'Q8':  [0, 4, 1, 5, 2, 6, 3, 7],
+               'Q9':  [0, 4, 1, 5, 2, 6, 3, 7],
+               'T10': [0, 3, 4, 1, 5, 6, 2, 7, 8]}
+
+# Número máximo de etiquetas (números de nodos o de EF) que se escriben en una
+# gráfica; matplotlib dibuja cada texto por separado, así que por encima de
+# este valor la gráfica se vuelve inmanejable
+MAX_ETIQUETAS = 2000
+
+# Colores de los materiales (se repiten si hay más materiales que colores)
+COLORES = list(BASE_COLORS.values()) + list(TABLEAU_COLORS.values())
+
+
+def _tipo_ef(LaG):
+    elem = TIPO_EF.get(LaG.shape[1])
+    if elem is None:
+        raise ValueError(f'No se pueden graficar EF de {LaG.shape[1]} nodos')
+    return elem
+
+
+def _escribir_numeros(ax, posiciones, colores, max_etiquetas, que):
+    ''' Escribe en "ax" los números 1, 2, ... en las posiciones dadas, siempre
+        y cuando no superen "max_etiquetas"; "que" solo se usa en el aviso.
+    '''
+    if posiciones.shape[0] > max_etiquetas:
+        warnings.warn(f'No se muestran los números de los {que}: hay '
+                      f'{posiciones.shape[0]} y el máximo es {max_etiquetas}')
+        return
+    for i, pos in enumerate(posiciones):
+        ax.text(*pos, f'{i+1}', horizontalalignment='center',
+                verticalalignment='center', color=colores[i])
+
+
+def graficar_malla(xnod_3d, LaG, mat, tipo, mostrar_nodos=False,
+                   mostrar_num_nodo=False, mostrar_num_elem=False,
+                   max_etiquetas=MAX_ETIQUETAS, colores=COLORES,
+                   color_num_elem=None):
+    ''' Grafica la malla de EF (ver leer_GMSH.plot_msh).
+
+        Argumentos:
+        - xnod_3d: array (nno, 3). Coordenadas nodales.
+        - LaG: array (nef, nno_ef). Nodos de cada EF (desde 0).
+        - mat: array (nef,). Material de cada EF (desde 0); define su color.
+        - tipo, mostrar_nodos, mostrar_num_nodo, mostrar_num_elem,
+          max_etiquetas: ver leer_GMSH.plot_msh.
+        - colores: lista de colores de los materiales.
+        - color_num_elem: color de los números de los EF; por defecto, el de
+                          cada EF.
+
+        Los contornos de todos los EF se dibujan con una sola colección de
+        líneas y los nodos con un solo scatter, de modo que el tiempo de
+        dibujo casi no depende del número de EF.
+    '''
+    nef = LaG.shape[0]
+
+    # Se determina el tipo de elemento finito
+    elem = _tipo_ef(LaG)
+
+    if tipo == 'shell':
+        dim = 3
+    elif tipo == '2D':
+        dim = 2
+    else:
+        raise ValueError('El argumento "tipo" introducido no es válido')
+    xnod = xnod_3d[:, :dim]
+    nno = xnod.shape[0]
+
+    colores = to_rgba_array(colores)
+    color_ef = colores[mat % len(colores)]  # color de cada EF
+
+    # Contornos (cerrados) de todos los EF: array (nef, nodos del contorno+1, dim)
+    contorno = CONTORNO_EF[elem] + CONTORNO_EF[elem][:1]
+    lineas = xnod[LaG[:, contorno]]
+    nodos = np.unique(LaG)  # nodos que pertenecen a algún EF
+
+    fig = plt.figure(figsize=(12, 12))
+    if tipo == 'shell':
+        ax = fig.add_subplot(projection='3d')
+        ax.add_collection3d(Line3DCollection(lineas, colors=color_ef, lw=0.8))
+        ax.auto_scale_xyz(xnod[nodos, 0], xnod[nodos, 1], xnod[nodos, 2])
+        if mostrar_nodos:
+            ax.scatter(xnod[nodos, 0], xnod[nodos, 1], xnod[nodos, 2], s=25,
+                       c='r', edgecolors='k', depthshade=False)
+    else:
+        ax = fig.add_subplot()
+        ax.add_collection(LineCollection(lineas, colors=color_ef, lw=0.8))
+        ax.autoscale_view()
+        if mostrar_nodos:
+            ax.scatter(xnod[nodos, 0], xnod[nodos, 1], s=25, c='r',
+                       edgecolors='k', zorder=3)
+
+    if mostrar_num_elem:
+        # se calcula la posición del centro de gravedad de los EF y se reporta
+        # el número de cada elemento
+        cg = xnod[LaG].mean(axis=1)
+        color_num = color_ef if color_num_elem is None else [color_num_elem]*nef
+        _escribir_numeros(ax, cg, color_num, max_etiquetas, 'EF')
+    if mostrar_num_nodo:
+        _escribir_numeros(ax, xnod, ['r']*nno, max_etiquetas, 'nodos')
+
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+    if tipo == 'shell':
+        fig.suptitle(f'Malla de EF Shell ({elem})', fontsize='x-large')
+        ax.set_zlabel('z')
+        ax.view_init(45, 45)
+    else:
+        fig.suptitle(f'Malla de EF 2D ({elem})', fontsize='x-large')
+        ax.set_aspect('equal', adjustable='box')
+
+
+def _rasterizar(p0, p1, ancho, alto, tam_bloque=10**6):
+    ''' Cuenta cuántos de los segmentos p0-p1 (en coordenadas de píxel) pasan
+        por cada píxel de una imagen de alto x ancho píxeles.
+
+        Los segmentos más cortos que un píxel se reducen a un solo punto y los
+        demás se muestrean una vez por píxel que recorren, por bloques de a
+        tam_bloque segmentos para limitar la memoria.
+    '''
+    cuenta = np.zeros(alto*ancho, dtype=np.int64)
+    for i in range(0, p0.shape[0], tam_bloque):
+        a, b = p0[i:i+tam_bloque], p1[i:i+tam_bloque]
+        npix = np.ceil(np.abs(b - a).max(axis=1)).astype(np.int64) + 1
+        seg = np.repeat(np.arange(a.shape[0]), npix)
+        t = np.arange(seg.size) - np.repeat(np.cumsum(npix) - npix, npix)
+        t = t/np.maximum(npix - 1, 1)[seg]
+        pts = a[seg] + t[:, None]*(b - a)[seg]
+        col = np.clip(pts[:, 0].astype(np.int64), 0, ancho - 1)
+        fil = np.clip(pts[:, 1].astype(np.int64), 0, alto - 1)
+        cuenta += np.bincount(fil*ancho + col, minlength=alto*ancho)
+    return cuenta.reshape((alto, ancho))
+
+
+def vista_previa_malla(xnod, LaG, mat, topologia=None, ancho=1200, alto=None,
+                       todas_aristas=False):
+    ''' Vista previa rasterizada de una malla 2D (ver
+        leer_GMSH.vista_previa_msh).
+
+        Argumentos:
+        - xnod: array (nno, 2) o (nno, 3). Coordenadas nodales.
+        - LaG: array (nef, nno_ef). Nodos de cada EF (desde 0).
+        - mat: array (nef,). Material de cada EF (desde 0).
+        - topologia: función sin argumentos que retorna la Topologia de la
+                     malla (por ejemplo Mesh.topologia, que la construye una
+                     sola vez); por defecto se construye en cada llamada.
+        - ancho, alto, todas_aristas: ver leer_GMSH.vista_previa_msh.
+    '''
+    xnod = xnod[:, :2]
+
+    # Se determina el tipo de elemento finito
+    elem = _tipo_ef(LaG)
+
+    topo = Topologia(LaG) if topologia is None else topologia()
+
+    # aristas de la frontera (un solo EF) y de las interfaces entre materiales
+    # (dos EF de distinto material); cada arista se divide en los segmentos
+    # que unen sus nodos consecutivos
+    ef1, ef2 = topo.ef_arista.T
+    frontera = ef2 == -1
+    interfaz = ~frontera & (mat[ef1] != mat[ef2])
+    nseg = topo.nodos_arista.shape[1] - 1
+    ini = topo.nodos_arista[:, :-1].ravel()
+    fin = topo.nodos_arista[:, 1:].ravel()
+    frontera = np.repeat(frontera, nseg)
+    interfaz = np.repeat(interfaz, nseg)
+
+    # transformación de coordenadas de la malla a coordenadas de píxel
+    nodos = np.unique(LaG)
+    xmin, ymin = xnod[nodos].min(axis=0)
+    xmax, ymax = xnod[nodos].max(axis=0)
+    escala = (ancho - 1)/max(xmax - xmin, ymax - ymin, np.finfo(float).tiny)
+    if alto is None:
+        alto = int(round((ymax - ymin)*escala)) + 1
+    else:
+        escala = min(escala, (alto - 1)/max(ymax - ymin, np.finfo(float).tiny))
+    pix = (xnod - [xmin, ymin])*escala
+
+    # se rasterizan las capas de la imagen: aristas interiores, interfaces
+    # entre materiales y frontera (cada una se pinta encima de la anterior)
+    imagen = np.ones((alto, ancho, 3))
+    capas = [(interfaz, (0.84, 0.15, 0.16)),
+             (frontera, (0.0,  0.0,  0.0 ))]
+    if todas_aristas:
+        capas.insert(0, (np.ones_like(frontera), (0.6, 0.6, 0.6)))
+    for mascara, color in capas:
+        cuenta = _rasterizar(pix[ini[mascara]], pix[fin[mascara]], ancho, alto)
+        imagen[cuenta > 0] = color
+
+    fig = plt.figure(figsize=(12, 12))
+    ax = fig.add_subplot()
+    ax.imshow(imagen, origin='lower', interpolation='antialiased',
+              extent=(xmin, xmin + (ancho - 1)/escala,
+                      ymin, ymin + (alto - 1)/escala))
+    fig.suptitle(f'Vista previa de la malla de EF 2D ({elem}, {LaG.shape[0]} EF)',
+                 fontsize='x-large')
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Reparto de tareas entre varios procesos que leen los mismos arreglos de NumPy
+desde memoria compartida.
+
+Los arreglos se copian una sola vez a bloques de memoria compartida y cada
+proceso trabajador los abre al iniciar, de modo que no se copian (ni se
+serializan) con cada tarea: a cada tarea solo se le envían sus propios datos.
+Lo usan calidad_malla.py y Axisimetrico/exportar_figuras.py (en
+Axisimetrico/ hay una copia idéntica de este archivo, para que la carpeta
+funcione por sí sola).
+
+Uso:
+    def evaluar(trabajador, tarea):
+        ini, fin = tarea
+        return trabajador['LaG'][ini:fin].sum()
+
+    resultados = mapa_compartido(evaluar, [(0, 10), (10, 20)], {'LaG': LaG})
+
+NOTA: en los sistemas que no tienen "fork" (por ejemplo Windows), los
+procesos se crean con "spawn", que vuelve a importar el programa principal;
+en ese caso, la llamada a mapa_compartido() debe quedar dentro de un bloque
+if __name__ == '__main__':
+"""
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# estado de cada proceso trabajador: los arreglos abiertos desde la memoria
+# compartida y lo que agregue la función de inicialización
+_trabajador = {}
+_funcion = None
+
+
+def a_memoria_compartida(arr):
+    ''' Copia arr a un bloque nuevo de memoria compartida. Retorna el bloque y
+        la descripción (nombre, forma, dtype) con la que se abre en los
+        procesos trabajadores.
+    '''
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+def de_memoria_compartida(desc):
+    ''' Abre el bloque de memoria compartida descrito por desc (ver
+        a_memoria_compartida). Retorna el bloque y el arreglo que lo usa.
+    '''
+    nombre, forma, dtype = desc
+    shm = shared_memory.SharedMemory(name=nombre)
+    return shm, np.ndarray(forma, dtype=dtype, buffer=shm.buf)
+
+
+def _inicializar(descripciones, funcion, inicializar, args):
+    ''' Se ejecuta una vez en cada proceso trabajador. '''
+    global _funcion
+    bloques = []
+    for nombre, desc in descripciones.items():
+        shm, _trabajador[nombre] = de_memoria_compartida(desc)
+        bloques.append(shm)
+    _trabajador['_bloques'] = bloques   # se conservan abiertos
+    _funcion = funcion
+    if inicializar is not None:
+        inicializar(_trabajador, *args)
+
+
+def _ejecutar(tarea):
+    return _funcion(_trabajador, tarea)
+
+
+def mapa_compartido(funcion, tareas, arreglos, inicializar=None, args=(),
+                    procesos=None):
+    ''' Evalúa funcion(trabajador, tarea) para cada tarea, repartiendo las
+        tareas entre varios procesos.
+
+        Argumentos:
+        - funcion: función (definida al nivel de un módulo) que recibe el
+                   diccionario "trabajador" del proceso y una tarea.
+        - tareas: lista de tareas.
+        - arreglos: dict {nombre: array}. Arreglos que se copian a memoria
+                    compartida; en cada proceso quedan en trabajador[nombre].
+        - inicializar: función opcional inicializar(trabajador, *args) que se
+                       ejecuta una vez en cada proceso, después de abrir los
+                       arreglos (por ejemplo, para crear objetos que se
+                       reutilizan en todas sus tareas).
+        - procesos: número de procesos; por defecto, uno por núcleo.
+
+        Retorna: lista con el resultado de cada tarea, en el orden de tareas.
+    '''
+    compartidos = []
+    try:
+        descripciones = {}
+        for nombre, arr in arreglos.items():
+            shm, descripciones[nombre] = a_memoria_compartida(arr)
+            compartidos.append(shm)
+
+        metodo = 'fork' if 'fork' in mp.get_all_start_methods() else 'spawn'
+        with mp.get_context(metodo).Pool(
+                procesos, _inicializar,
+                (descripciones, funcion, inicializar, args)) as pool:
+            return pool.map(_ejecutar, tareas)
+    finally:
+        for shm in compartidos:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Lectura de los datos del problema (materiales, apoyos y cargas) codificados
+en los nombres de los grupos físicos de la malla de GMSH.
+
+Gramática de los nombres (los valores son números reales, por ejemplo 1e6,
+-4000 o 0.3):
+
+    mat_E_nu_rho                  material: módulo de elasticidad [Pa],
+                                  relación de Poisson y densidad [kg/m³]
+    punto_res_xy | punto_res_x | punto_res_y
+    borde_res_xy | borde_res_x | borde_res_y
+                                  apoyos: desplazamientos restringidos en las
+                                  direcciones indicadas
+    punto_des_x_ux | punto_des_y_uy | punto_des_xy_ux_uy
+    borde_des_x_ux | borde_des_y_uy | borde_des_xy_ux_uy
+                                  desplazamientos prescritos [m] (no nulos)
+                                  en las direcciones indicadas
+    puntual_Px_Py                 carga puntual [N] en cada nodo del grupo
+    carga_fx_fy                   carga distribuida uniforme [N/m²] sobre los
+                                  lados de los EF que están en el grupo
+
+Todos los nombres se analizan en una sola pasada con una expresión regular
+compilada, y cada tipo de dato se retorna como un array estructurado de
+NumPy (un registro por grupo físico, con su etiqueta en el campo 'tag').
+Los nombres que no empiezan por una palabra clave seguida de "_" (por
+ejemplo, el de una superficie sin material, "material_base" o "bordes") se
+ignoran; si empiezan por "mat_", "punto_", "borde_", "puntual_" o "carga_"
+pero no cumplen la gramática (por ejemplo, "mat_1e8_0.3", al que le falta la
+densidad), se lanza un error en lugar de ignorar el grupo o leer datos
+equivocados.
+"""
+
+import re
+
+import numpy as np
+
+X, Y = 0, 1
+
+_NUM = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+
+GRAMATICA = re.compile(rf'''
+      mat_(?P<E>{_NUM})_(?P<nu>{_NUM})_(?P<rho>{_NUM})
+    | (?P<apoyo>punto|borde)_(?:
+          res_(?P<dir>xy|x|y)
+        | des_(?:x_(?P<ux>{_NUM}) | y_(?P<uy>{_NUM})
+                 | xy_(?P<uxy_x>{_NUM})_(?P<uxy_y>{_NUM})))
+    | puntual_(?P<Px>{_NUM})_(?P<Py>{_NUM})
+    | carga_(?P<fx>{_NUM})_(?P<fy>{_NUM})
+''', re.VERBOSE)
+
+# prefijo de los nombres que deben cumplir la gramática
+PALABRAS_CLAVE = re.compile(r'(?:mat|punto|borde|puntual|carga)_')
+
+# tipos de registro de cada dato
+DTYPE_MATERIAL = np.dtype([('tag', np.int64), ('E', float), ('nu', float),
+                           ('rho', float)])
+DTYPE_APOYO    = np.dtype([('tag', np.int64), ('borde', bool),
+                           ('res_x', bool), ('res_y', bool),
+                           ('ux', float), ('uy', float)])
+DTYPE_PUNTUAL  = np.dtype([('tag', np.int64), ('Px', float), ('Py', float)])
+DTYPE_CARGA    = np.dtype([('tag', np.int64), ('fx', float), ('fy', float)])
+
+
+def leer_nombres(dict_nombres):
+    ''' Analiza los nombres de los grupos físicos.
+
+        Recibe:
+            dict_nombres: dict {tag: (dim, nombre)}, como el que retorna
+                          Mesh.grupos_fisicos().
+
+        Retorna: dict con los arrays estructurados
+            'materiales': (tag, E, nu, rho), en el orden de los grupos (el
+                          material i es el de la superficie i de la malla).
+            'apoyos':     (tag, borde, res_x, res_y, ux, uy), con los
+                          desplazamientos prescritos ux, uy (0 en los
+                          grupos "res" y en las direcciones libres).
+            'puntuales':  (tag, Px, Py).
+            'cargas':     (tag, fx, fy).
+    '''
+    materiales, apoyos, puntuales, cargas = [], [], [], []
+    for tag, (dim, nombre) in dict_nombres.items():
+        m = GRAMATICA.fullmatch(nombre)
+        if m is None:
+            if PALABRAS_CLAVE.match(nombre):
+                raise ValueError(f'El nombre del grupo físico {tag} ("{nombre}")'
+                                 ' no cumple la gramática de nombres_fisicos.py')
+            continue
+
+        if m['E'] is not None:
+            materiales.append((tag, m['E'], m['nu'], m['rho']))
+        elif m['apoyo'] is not None:
+            if m['dir'] is not None:
+                ux = uy = 0
+                res_x, res_y = 'x' in m['dir'], 'y' in m['dir']
+            else:
+                ux = float(m['ux'] or m['uxy_x'] or 0.0)
+                uy = float(m['uy'] or m['uxy_y'] or 0.0)
+                res_x = m['ux'] is not None or m['uxy_x'] is not None
+                res_y = m['uy'] is not None or m['uxy_y'] is not None
+            apoyos.append((tag, m['apoyo'] == 'borde', res_x, res_y, ux, uy))
+        elif m['Px'] is not None:
+            puntuales.append((tag, m['Px'], m['Py']))
+        else:
+            cargas.append((tag, m['fx'], m['fy']))
+
+    return {'materiales': np.array(materiales, dtype=DTYPE_MATERIAL),
+            'apoyos':     np.array(apoyos,     dtype=DTYPE_APOYO),
+            'puntuales':  np.array(puntuales,  dtype=DTYPE_PUNTUAL),
+            'cargas':     np.array(cargas,     dtype=DTYPE_CARGA)}
+
+
+def nodos_registros(registros, dict_nodos):
+    ''' Nodos (desde 0) de los grupos físicos de los registros dados, en un
+        solo array, y el registro al que corresponde cada uno.
+
+        Retorna: (nodos, i_reg), arrays (n,).
+    '''
+    nodos = [np.asarray(dict_nodos[tag], dtype=np.int64) - 1
+             for tag in registros['tag'].tolist()]
+    if not nodos:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    i_reg = np.repeat(np.arange(len(nodos)), [n.size for n in nodos])
+    return np.concatenate(nodos), i_reg
+
+
+def fuerzas_puntuales(puntuales, dict_nodos, gdl):
+    ''' Vector de fuerzas nodales (ngdl,) de las cargas puntuales; las
+        cargas de los nodos que están en varios grupos se suman.
+    '''
+    nodos, i_reg = nodos_registros(puntuales, dict_nodos)
+    f = np.zeros(gdl.size)
+    np.add.at(f, gdl[nodos], np.c_[puntuales['Px'], puntuales['Py']][i_reg])
+    return f
+
+
+def cargas_distribuidas(cargas, dict_nodos):
+    ''' Lista de tuplas (nodos_lado, Fx, Fy) de las cargas distribuidas,
+        como la recibe cargas.aplicar_fsuperf().
+    '''
+    return [(np.asarray(dict_nodos[tag], dtype=np.int64) - 1, fx, fy)
+            for tag, fx, fy in cargas[['tag', 'fx', 'fy']].tolist()]
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Condiciones de frontera de Dirichlet (desplazamientos conocidos) y partición
+del sistema de ecuaciones en los grados de libertad desconocidos (d) y
+conocidos (c):
+
+    | qd |   | Kcc Kcd || ac |   | fd |
+    |    | = |         ||    | - |    |
+    | qc |   | Kdc Kdd || ad |   | fc |
+
+(se conserva la notación de ejemplo_Q8_axisimetrico_*.py: fd = f[c] y
+fc = f[d]).
+
+Los gdl restringidos de todos los grupos "punto_*" y "borde_*" se marcan de
+una vez en un arreglo booleano, junto con los desplazamientos prescritos
+(que pueden ser distintos de cero). Las submatrices de K se extraen
+renumerando los gdl con la permutación [d, c] sobre las tripletas (fila,
+columna, valor) de K, de modo que K nunca se indexa con np.ix_ ni se
+convierte a una matriz llena.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+from nombres_fisicos import nodos_registros
+
+X, Y = 0, 1
+
+
+def restricciones(apoyos, dict_nodos, gdl):
+    ''' Marca los gdl restringidos y sus desplazamientos prescritos.
+
+        Recibe:
+            apoyos:     array estructurado de apoyos (ver
+                        nombres_fisicos.leer_nombres).
+            dict_nodos: dict {tag: nodos} de los grupos físicos.
+            gdl:        array (nno, 2). Grados de libertad de cada nodo.
+
+        Retorna: (restringido, u)
+            restringido: array (ngdl,) de bool. True en los gdl conocidos.
+            u:           array (ngdl,). Desplazamiento prescrito de cada gdl
+                         (0 en los gdl libres).
+    '''
+    nodos, i_reg = nodos_registros(apoyos, dict_nodos)
+    restringido = np.zeros(gdl.size, dtype=bool)
+    u = np.zeros(gdl.size)
+    for direccion, res, val in ((X, 'res_x', 'ux'), (Y, 'res_y', 'uy')):
+        sel = apoyos[res][i_reg]
+        gdl_sel = gdl[nodos[sel], direccion]
+        val_sel = apoyos[val][i_reg[sel]]
+        restringido[gdl_sel] = True
+        u[gdl_sel] = val_sel
+
+        # un gdl que está en varios grupos debe tener el mismo valor en todos
+        distinto = u[gdl_sel] != val_sel
+        if np.any(distinto):
+            raise ValueError('Se prescribieron desplazamientos distintos en '
+                             f'el gdl {gdl_sel[distinto][0]}')
+
+    return restringido, u
+
+
+class ParticionDC:
+    ''' Partición de los gdl en desconocidos (d) y conocidos (c).
+
+        Argumentos:
+        - restringido: array (ngdl,) de bool. True en los gdl conocidos.
+
+        Atributos:
+        - d, c: arrays. Gdl desconocidos y conocidos (ordenados).
+        - perm: array (ngdl,). Permutación [d, c] de los gdl.
+        - nuevo: array (ngdl,). Posición de cada gdl en perm.
+    '''
+
+    def __init__(self, restringido):
+        restringido = np.asarray(restringido, dtype=bool)
+        self.d = np.flatnonzero(~restringido)
+        self.c = np.flatnonzero(restringido)
+        self.perm = np.r_[self.d, self.c]
+        self.nuevo = np.empty_like(self.perm)
+        self.nuevo[self.perm] = np.arange(self.perm.size)
+
+    def submatrices(self, K):
+        ''' Retorna (Kdd, Kdc, Kcd, Kcc) en formato CSC, a partir de la matriz
+            dispersa K, con una sola pasada sobre sus tripletas.
+        '''
+        K = sp.coo_matrix(K)
+        nd = self.d.size
+        fila, col = self.nuevo[K.row], self.nuevo[K.col]
+        fila_d, col_d = fila < nd, col < nd
+
+        def bloque(en_fila, en_col, f0, c0, forma):
+            sel = en_fila & en_col
+            return sp.csc_matrix((K.data[sel], (fila[sel] - f0, col[sel] - c0)),
+                                 shape=forma)
+
+        nc = self.c.size
+        return (bloque( fila_d,  col_d, 0,  0,  (nd, nd)),
+                bloque( fila_d, ~col_d, 0,  nd, (nd, nc)),
+                bloque(~fila_d,  col_d, nd, 0,  (nc, nd)),
+                bloque(~fila_d, ~col_d, nd, nd, (nc, nc)))
+
+    def unir(self, vd, vc):
+        ''' Arma el vector (o la matriz, con una columna por caso) de todos
+            los gdl a partir de sus valores en d y en c.
+        '''
+        vd, vc = np.asarray(vd), np.asarray(vc)
+        v = np.empty((self.perm.size,) + vd.shape[1:],
+                     dtype=np.result_type(vd, vc))
+        v[self.d] = vd
+        v[self.c] = vc
+        return v
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Solucionadores del sistema de ecuaciones Kdd @ ad = fc - Kdc @ ac para matrices
+de rigidez dispersas.
+
+Métodos disponibles:
+- 'superlu': factorización LU dispersa (scipy.sparse.linalg.splu).
+- 'cholmod': factorización de Cholesky dispersa (requiere scikit-sparse); es
+             la más eficiente ya que Kdd es simétrica y definida positiva.
+- 'auto':    'cholmod' si está instalado, y si no, 'superlu'.
+- 'gc':      gradientes conjugados precondicionados, con precondicionador
+             'jacobi', 'ilu', 'amg' (requiere pyamg) o None.
+
+Como la factorización se calcula una sola vez, la función que retorna
+factorizar() se puede aplicar a varios vectores de cargas (por ejemplo, en un
+barrido de cargas) a costa únicamente de sustituciones hacia atrás.
+"""
+
+import inspect
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+try:
+    from sksparse.cholmod import cholesky  # pip install scikit-sparse
+except ImportError:
+    cholesky = None
+
+try:
+    import pyamg  # pip install pyamg
+except ImportError:
+    pyamg = None
+
+# argumento de la tolerancia relativa de spla.cg: "rtol" desde SciPy 1.12 y
+# "tol" en las versiones anteriores
+_TOL_CG = 'rtol' if 'rtol' in inspect.signature(spla.cg).parameters else 'tol'
+
+# %%
+def factorizar(A, metodo='auto', precondicionador='jacobi', tol=1e-10,
+               maxiter=None):
+    ''' Prepara la solución del sistema A @ x = b, con A dispersa, simétrica y
+        definida positiva.
+
+        Recibe:
+            A:                matriz del sistema (scipy.sparse o np.ndarray).
+            metodo:           'auto', 'superlu', 'cholmod' o 'gc'.
+            precondicionador: solo para metodo='gc': 'jacobi', 'ilu', 'amg'
+                              o None.
+            tol, maxiter:     tolerancia relativa y número máximo de iteracio-
+                              nes (solo para metodo='gc').
+
+        Retorna:
+            resolver: función tal que x = resolver(b), donde b puede ser un
+                      vector (n,) o una matriz (n, ncasos) con varios lados
+                      derechos. La factorización (o el precondicionador) se
+                      calcula una sola vez y se reutiliza en cada llamado.
+    '''
+    A = sp.csc_matrix(A)
+
+    if metodo == 'auto':
+        metodo = 'superlu' if cholesky is None else 'cholmod'
+
+    if metodo == 'superlu':
+        lu = spla.splu(A)
+        return lu.solve
+
+    if metodo == 'cholmod':
+        if cholesky is None:
+            raise ImportError('El método "cholmod" requiere scikit-sparse')
+        factor = cholesky(A)
+        return lambda b: factor(np.asarray(b))
+
+    if metodo == 'gc':
+        M = _precondicionador(A, precondicionador)
+
+        def resolver_gc(b):
+            b = np.asarray(b, dtype=float)
+            x = np.empty_like(b)
+            columnas = b.reshape((b.shape[0], -1))
+            for j, bj in enumerate(columnas.T):
+                xj, info = spla.cg(A, bj, maxiter=maxiter, M=M,
+                                   **{_TOL_CG: tol})
+                if info != 0:
+                    raise RuntimeError('El método de gradientes conjugados '
+                                       f'no convergió ({info} iteraciones)')
+                x.reshape(columnas.shape)[:, j] = xj
+            return x
+
+        return resolver_gc
+
+    raise ValueError(f'Método de solución "{metodo}" no válido')
+
+
+def _precondicionador(A, tipo):
+    ''' Retorna el precondicionador (LinearOperator) para el método de los
+        gradientes conjugados.
+    '''
+    if tipo is None:
+        return None
+
+    if tipo == 'jacobi':
+        inv_diag = 1/A.diagonal()
+        return spla.LinearOperator(A.shape, matvec=lambda x: inv_diag*x)
+
+    if tipo == 'ilu':
+        ilu = spla.spilu(A, drop_tol=1e-4, fill_factor=10)
+        return spla.LinearOperator(A.shape, matvec=ilu.solve)
+
+    if tipo == 'amg':
+        if pyamg is None:
+            raise ImportError('El precondicionador "amg" requiere pyamg')
+        return pyamg.smoothed_aggregation_solver(A.tocsr()).aspreconditioner()
+
+    raise ValueError(f'Precondicionador "{tipo}" no válido')
+
+
+def resolver(A, b, metodo='auto', **kwargs):
+    ''' Resuelve el sistema A @ x = b (ver factorizar() para los argumentos).
+    '''
+    return factorizar(A, metodo, **kwargs)(b)
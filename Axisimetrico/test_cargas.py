@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la ubicación de los lados cargados y de sus fuerzas nodales
+equivalentes contra el ciclo por lado de ejemplo_Q8_axisimetrico_original.py
+(ejecutar con: python -m pytest test_cargas.py).
+"""
+
+import numpy as np
+
+from cargas import (NOMBRE_LADO, topologia_Q8, aplicar_fsuperf,
+                    fuerzas_superficiales)
+from test_elemento_Q8 import malla_Q8
+from test_funciones import t2ft_original
+
+
+def test_igual_al_ciclo_original():
+    nx, ny = 3, 2
+    xnod, LaG = malla_Q8(nx, ny)
+    nno = xnod.shape[0]
+    arriba  = [a*ny + ny - 1 for a in range(nx)]     # EF del borde superior
+    derecha = [(nx - 1)*ny + b for b in range(ny)]   # EF del borde derecho
+    cargas = [(np.unique(LaG[arriba][:, 4:7]),  0,   -1000),
+              (np.unique(LaG[derecha][:, 2:5]), 500,  0)]
+
+    e, lado, carga = aplicar_fsuperf(topologia_Q8(LaG), cargas)
+    assert sorted(zip(e, lado)) == sorted([(i, 2) for i in arriba] +
+                                          [(i, 1) for i in derecha])
+    np.testing.assert_array_equal(carga[lado == 2], [[0, -1000]*3]*nx)
+    np.testing.assert_array_equal(carga[lado == 1], [[500, 0]*3]*ny)
+
+    gdl = np.arange(2*nno).reshape((nno, 2))
+    ft = np.zeros(2*nno)
+    nodos, fte = fuerzas_superficiales(xnod, LaG, e, lado, carga)
+    np.add.at(ft, gdl[nodos].reshape((-1, 6)), fte)
+
+    # ciclo original: ft[idx[e]] += t2ft_R89_axisimetrico(xnod[LaG[e]], ...)
+    ft_ref = np.zeros(2*nno)
+    for e_i, lado_i, carga_i in zip(e, lado, carga):
+        ft_ref[gdl[LaG[e_i]].ravel()] += t2ft_original(
+                                xnod[LaG[e_i]], NOMBRE_LADO[lado_i], carga_i)
+    np.testing.assert_allclose(ft, ft_ref, atol=1e-9)
+
+
+def test_sin_cargas():
+    xnod, LaG = malla_Q8()
+    e, lado, carga = aplicar_fsuperf(topologia_Q8(LaG), [])
+    assert e.size == lado.size == 0 and carga.shape == (0, 6)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los casos de carga contra la solución caso por caso de
+ejemplo_Q8_axisimetrico_original.py (K llena, np.ix_ y np.linalg.solve)
+(ejecutar con: python -m pytest test_casos_carga.py).
+"""
+
+import numpy as np
+import pytest
+
+from cargas import topologia_Q8
+from casos_carga import (CasosCarga, resolver_casos,
+                         deformaciones_esfuerzos_casos)
+from elemento_Q8 import (Kfe_Q8_axisimetrico, deformaciones_Q8, esfuerzos_Q8,
+                         extrapolar_promediar)
+from ensamblaje import ensamblar_K
+from nombres_fisicos import leer_nombres
+from restricciones import restricciones, ParticionDC
+from test_elemento_Q8 import malla_Q8, materiales
+
+
+def test_igual_a_la_solucion_caso_por_caso():
+    nx, ny = 3, 2
+    xnod, LaG = malla_Q8(nx, ny)
+    nef, nno = LaG.shape[0], xnod.shape[0]
+    mat = np.arange(nef) % 2
+    De, be = materiales()
+    gdl = np.arange(2*nno).reshape((nno, 2))
+    idx = gdl[LaG].reshape((nef, 16))
+
+    dict_nombres = {1: (1, 'borde_res_xy'), 2: (0, 'punto_des_x_1e-4'),
+                    3: (0, 'puntual_300_-1000'), 4: (1, 'carga_0_-4000')}
+    arriba = [a*ny + ny - 1 for a in range(nx)]
+    dict_nodos = {1: np.unique(LaG[::ny, 0:3]) + 1,
+                  2: LaG[nef - 1, [4]] + 1,
+                  3: LaG[arriba[0], [6]] + 1,
+                  4: np.unique(LaG[arriba][:, 4:7]) + 1}
+    datos = leer_nombres(dict_nombres)
+
+    K_ef, f_ef, dN = Kfe_Q8_axisimetrico(xnod, LaG, mat, De, be)
+    casos = CasosCarga(gdl, dict_nombres)
+    casos.fuerzas_masicas('peso_propio', idx, f_ef)
+    casos.puntuales(datos['puntuales'], dict_nodos)
+    casos.distribuidas(datos['cargas'], dict_nodos, xnod, LaG,
+                       topologia_Q8(LaG))
+    assert casos.nombres == ['peso_propio', 'puntual_300_-1000',
+                             'carga_0_-4000']
+    combinaciones = {'servicio': {'peso_propio': 1, 'carga_0_-4000': 1},
+                     'ultima':   {'peso_propio': 1.2, 'carga_0_-4000': 1.6,
+                                  'puntual_300_-1000': 1}}
+    F = casos.combinar(combinaciones)
+    np.testing.assert_allclose(F[:, 0], casos.matriz[:, [0, 2]].sum(axis=1))
+
+    restringido, u = restricciones(datos['apoyos'], dict_nodos, gdl)
+    particion = ParticionDC(restringido)
+    K = ensamblar_K(idx, K_ef, 2*nno)
+    A, Q = resolver_casos(particion, K, F, u[particion.c])
+    campos = deformaciones_esfuerzos_casos(A, idx, dN, De, mat, LaG)
+
+    # solución de ejemplo_Q8_axisimetrico_original.py, caso por caso
+    K_llena = np.zeros((2*nno, 2*nno))
+    for e in range(nef):
+        K_llena[np.ix_(idx[e], idx[e])] += K_ef[e]
+    c = np.flatnonzero(restringido)
+    d = np.setdiff1d(range(2*nno), c)
+    ac = u[c]
+    for j in range(F.shape[1]):
+        f = F[:, j]
+        ad = np.linalg.solve(K_llena[np.ix_(d, d)],
+                             f[d] - K_llena[np.ix_(d, c)] @ ac)
+        qd = K_llena[np.ix_(c, c)] @ ac + K_llena[np.ix_(c, d)] @ ad - f[c]
+        a = np.zeros(2*nno); a[c] = ac; a[d] = ad
+        q = np.zeros(2*nno); q[c] = qd
+        np.testing.assert_allclose(A[:, j], a, rtol=1e-8,
+                                   atol=1e-10*np.abs(a).max())
+        np.testing.assert_allclose(Q[:, j], q, rtol=1e-8,
+                                   atol=1e-8*np.abs(q).max())
+
+        deform = deformaciones_Q8(a[idx], dN)
+        esfuer = esfuerzos_Q8(deform, De, mat)
+        np.testing.assert_allclose(
+            campos[j], extrapolar_promediar(np.concatenate((deform, esfuer),
+                                                           axis=3), LaG, nno),
+            rtol=1e-8, atol=1e-8*np.abs(campos[j]).max())
+
+
+def test_cargas_basicas_no_validas():
+    casos = CasosCarga(np.arange(4).reshape((2, 2)), {})
+    casos.fuerzas_masicas('peso_propio', np.array([[0, 1, 2, 3]]),
+                          np.ones((1, 4)))
+    with pytest.raises(ValueError):
+        casos.fuerzas_masicas('peso_propio', np.array([[0, 1, 2, 3]]),
+                              np.ones((1, 4)))
+    with pytest.raises(ValueError):
+        casos.combinar({'servicio': {'viento': 1}})
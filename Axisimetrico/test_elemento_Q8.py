@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del cálculo vectorizado de los EF Q8 axisimétricos contra el ciclo por
+EF y por punto de Gauss de ejemplo_Q8_axisimetrico_original.py
+(ejecutar con: python -m pytest test_elemento_Q8.py).
+"""
+
+import numpy as np
+import pytest
+
+from elemento_Q8 import (Nforma, dN_dxi, dN_deta, A_EXTRAP,
+                         Kfe_Q8_axisimetrico, derivadas_Q8, deformaciones_Q8,
+                         esfuerzos_Q8, extrapolar_promediar)
+
+X, Y = 0, 1
+
+
+def malla_Q8(nx=3, ny=2, r0=0.5, seed=0):
+    ''' Malla de nx x ny EF Q8 distorsionados en [r0, r0+nx] x [0, ny], con
+        la numeración local de ejemplo_Q8_axisimetrico_*.py.
+    '''
+    rng = np.random.default_rng(seed)
+    i, j = np.meshgrid(np.arange(2*nx + 1), np.arange(2*ny + 1), indexing='ij')
+    num = np.full(i.shape, -1)
+    sin_centro = (i % 2 == 0) | (j % 2 == 0)
+    num[sin_centro] = np.arange(np.count_nonzero(sin_centro))
+    xnod = np.c_[r0 + i[sin_centro]/2, j[sin_centro]/2]
+    xnod += rng.uniform(-0.08, 0.08, xnod.shape)
+
+    LaG = np.array([[num[2*a,   2*b  ], num[2*a+1, 2*b  ], num[2*a+2, 2*b  ],
+                     num[2*a+2, 2*b+1], num[2*a+2, 2*b+2], num[2*a+1, 2*b+2],
+                     num[2*a,   2*b+2], num[2*a,   2*b+1]]
+                    for a in range(nx) for b in range(ny)])
+    return xnod, LaG
+
+
+def materiales():
+    De, be = [], []
+    for E, nu, rho in ((2e7, 0.30, 1800), (5e6, 0.45, 2200)):
+        De.append(E/((1 + nu)*(1 - 2*nu))*np.array([[1 - nu, nu,     nu,     0],
+                                                    [nu,     1 - nu, nu,     0],
+                                                    [nu,     nu,     1 - nu, 0],
+                                                    [0, 0, 0, (1 - 2*nu)/2]]))
+        be.append(np.array([0, -rho*9.81]))
+    return De, be
+
+
+def Kfe_original(xnod, LaG, mat, De, be, n_gl=2):
+    ''' Ciclo de ejemplo_Q8_axisimetrico_original.py. Retorna (K_ef, f_ef, B).
+    '''
+    x_gl, w_gl = np.polynomial.legendre.leggauss(n_gl)
+    nef = LaG.shape[0]
+    K_ef = np.empty((nef, 16, 16))
+    f_ef = np.empty((nef, 16))
+    B = np.empty((nef, n_gl, n_gl, 4, 16))
+    for e in range(nef):
+        Ke = np.zeros((16, 16))
+        fe = np.zeros(16)
+        xe, ye = xnod[LaG[e], X], xnod[LaG[e], Y]
+        for p in range(n_gl):
+            for q in range(n_gl):
+                NN = Nforma(x_gl[p], x_gl[q])
+                ddN_dxi = dN_dxi(x_gl[p], x_gl[q])
+                ddN_deta = dN_deta(x_gl[p], x_gl[q])
+                Je = np.array([[ddN_dxi  @ xe, ddN_dxi  @ ye],
+                               [ddN_deta @ xe, ddN_deta @ ye]])
+                det_Je = np.linalg.det(Je)
+                r = NN @ xe
+
+                Npq = np.zeros((2, 16))
+                Bpq = np.zeros((4, 16))
+                for i in range(8):
+                    Npq[:, [2*i, 2*i+1]] = np.eye(2)*NN[i]
+                    dNi_dx, dNi_dy = np.linalg.solve(Je, [ddN_dxi[i],
+                                                          ddN_deta[i]])
+                    Bpq[:, [2*i, 2*i+1]] = [[dNi_dx,   0     ],
+                                            [0,        dNi_dy],
+                                            [NN[i]/r,  0     ],
+                                            [dNi_dy,   dNi_dx]]
+                B[e, p, q] = Bpq
+                Ke += Bpq.T @ De[mat[e]] @ Bpq * det_Je*r*w_gl[p]*w_gl[q]
+                fe += Npq.T @ be[mat[e]]       * det_Je*r*w_gl[p]*w_gl[q]
+        K_ef[e] = 2*np.pi*Ke
+        f_ef[e] = 2*np.pi*fe
+    return K_ef, f_ef, B
+
+
+@pytest.mark.parametrize('n_gl, tam_bloque', [(2, 20000), (2, 4), (3, 5)])
+def test_Kfe_igual_al_ciclo_original(n_gl, tam_bloque):
+    xnod, LaG = malla_Q8()
+    mat = np.arange(LaG.shape[0]) % 2
+    De, be = materiales()
+
+    K_ef, f_ef, dN = Kfe_Q8_axisimetrico(xnod, LaG, mat, De, be, n_gl,
+                                         tam_bloque)
+    K_ref, f_ref, B_ref = Kfe_original(xnod, LaG, mat, De, be, n_gl)
+
+    np.testing.assert_allclose(K_ef, K_ref, rtol=1e-10,
+                               atol=1e-10*np.abs(K_ref).max())
+    np.testing.assert_allclose(f_ef, f_ref, rtol=1e-10,
+                               atol=1e-10*np.abs(f_ref).max())
+
+    # dN contiene los únicos valores distintos de cero de B
+    np.testing.assert_allclose(dN[..., 0, :], B_ref[..., 0, 0::2], atol=1e-12)
+    np.testing.assert_allclose(dN[..., 1, :], B_ref[..., 1, 1::2], atol=1e-12)
+    np.testing.assert_allclose(dN[..., 2, :], B_ref[..., 2, 0::2], atol=1e-12)
+    np.testing.assert_array_equal(derivadas_Q8(xnod, LaG, n_gl), dN)
+
+
+def test_Kfe_sin_dN_y_simetria():
+    xnod, LaG = malla_Q8()
+    mat = np.zeros(LaG.shape[0], dtype=int)
+    De, be = materiales()
+    K_ef, f_ef, dN = Kfe_Q8_axisimetrico(xnod, LaG, mat, De, be,
+                                         dtype_dN=None)
+    assert dN is None
+    np.testing.assert_allclose(K_ef, K_ef.transpose(0, 2, 1),
+                               atol=1e-8*np.abs(K_ef).max())
+
+
+def test_Kfe_jacobiano_negativo():
+    xnod, LaG = malla_Q8()
+    LaG[3] = LaG[3, ::-1]      # numeración en sentido horario
+    De, be = materiales()
+    with pytest.raises(Exception, match='elemento 4'):
+        Kfe_Q8_axisimetrico(xnod, LaG, np.zeros(LaG.shape[0], dtype=int),
+                            De, be, tam_bloque=2)
+
+
+def test_deformaciones_esfuerzos_y_extrapolacion():
+    xnod, LaG = malla_Q8()
+    nef, nno = LaG.shape[0], xnod.shape[0]
+    mat = np.arange(nef) % 2
+    De, be = materiales()
+    _, _, dN = Kfe_Q8_axisimetrico(xnod, LaG, mat, De, be)
+    _, _, B = Kfe_original(xnod, LaG, mat, De, be)
+
+    gdl = np.arange(2*nno).reshape((nno, 2))
+    idx = gdl[LaG].reshape((nef, 16))
+    a = np.random.default_rng(1).normal(size=(3, 2*nno))  # tres casos
+
+    deform = deformaciones_Q8(a[:, idx], dN)
+    esfuer = esfuerzos_Q8(deform, De, mat)
+
+    # ciclos de ejemplo_Q8_axisimetrico_original.py (caso por caso)
+    for k in range(a.shape[0]):
+        deform_ref = np.einsum('epqij,ej->epqi', B, a[k, idx])
+        esfuer_ref = np.array([deform_ref[e] @ De[mat[e]].T
+                               for e in range(nef)])
+        np.testing.assert_allclose(deform[k], deform_ref, atol=1e-12)
+        np.testing.assert_allclose(esfuer[k], esfuer_ref,
+                                   atol=1e-12*np.abs(esfuer_ref).max())
+
+        campos_gl = np.concatenate((deform_ref, esfuer_ref), axis=-1)
+        suma = np.zeros((nno, 8))
+        num_elem_ady = np.zeros(nno)
+        for e in range(nef):
+            suma[LaG[e]] += A_EXTRAP @ campos_gl[e].reshape((4, 8))
+            num_elem_ady[LaG[e]] += 1
+        np.testing.assert_allclose(extrapolar_promediar(campos_gl, LaG, nno),
+                                   suma/num_elem_ady[:, None],
+                                   atol=1e-12*np.abs(suma).max())
+
+
+def test_extrapolacion_solo_n_gl_2():
+    xnod, LaG = malla_Q8()
+    with pytest.raises(ValueError):
+        extrapolar_promediar(np.zeros((LaG.shape[0], 3, 3, 4)), LaG,
+                             xnod.shape[0])
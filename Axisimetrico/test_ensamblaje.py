@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del ensamblaje disperso de la matriz de rigidez global contra el
+ensamblaje con np.ix_ de ejemplo_Q8_axisimetrico_original.py
+(ejecutar con: python -m pytest test_ensamblaje.py).
+"""
+
+import numpy as np
+
+from ensamblaje import ensamblar_K
+
+
+def test_ensamblar_K_igual_a_np_ix():
+    rng = np.random.default_rng(0)
+    nef, ngdl = 30, 50
+    idx = np.array([rng.choice(ngdl, 16, replace=False) for e in range(nef)])
+    K_ef = rng.normal(size=(nef, 16, 16))
+
+    K_ref = np.zeros((ngdl, ngdl))
+    for e in range(nef):
+        K_ref[np.ix_(idx[e], idx[e])] += K_ef[e]
+
+    K = ensamblar_K(idx, K_ef, ngdl)
+    assert K.format == 'csr' and K.shape == (ngdl, ngdl)
+    np.testing.assert_allclose(K.toarray(), K_ref, atol=1e-12)
+
+    # también recibe idx como lista de arrays
+    np.testing.assert_allclose(ensamblar_K(list(idx), K_ef, ngdl).toarray(),
+                               K_ref, atol=1e-12)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los esfuerzos principales contra el ciclo con np.linalg.eigh por
+nodo de ejemplo_Q8_axisimetrico_original.py
+(ejecutar con: python -m pytest test_esfuerzos_principales.py).
+"""
+
+import numpy as np
+import pytest
+
+from esfuerzos_principales import esfuerzos_principales
+
+
+def ppales_original(sr, sz, st, trz, trt, ttz):
+    nno = sr.size
+    s = np.zeros((nno, 3))
+    n = np.zeros((nno, 3, 3))
+    for i in range(nno):
+        esfppales, dirppales = np.linalg.eigh([[sr[i],  trt[i], trz[i]],
+                                               [trt[i], st[i],  ttz[i]],
+                                               [trz[i], ttz[i], sz[i] ]])
+        idx_esf = esfppales.argsort()[::-1]
+        s[i] = esfppales[idx_esf]
+        n[i] = dirppales[:, idx_esf].T
+    return s, n
+
+
+@pytest.mark.parametrize('metodo, cortantes_theta', [('auto',    False),
+                                                      ('cerrada', False),
+                                                      ('eigh',    False),
+                                                      ('auto',    True)])
+def test_igual_al_ciclo_original(metodo, cortantes_theta):
+    rng = np.random.default_rng(0)
+    sr, sz, st, trz = rng.normal(size=(4, 50))*1e3
+    sr[:5], sz[:5], trz[:5] = sz[:5], sr[:5], 0   # casos con trz = 0
+    trt, ttz = rng.normal(size=(2, 50))*1e3*cortantes_theta
+
+    s1, s2, s3, n1, n2, n3, tmax, sv = esfuerzos_principales(
+                                        sr, sz, st, trz, trt, ttz, metodo)
+    s_ref, n_ref = ppales_original(sr, sz, st, trz, trt, ttz)
+
+    np.testing.assert_allclose(np.c_[s1, s2, s3], s_ref, atol=1e-9)
+    np.testing.assert_allclose(tmax, (s_ref[:, 0] - s_ref[:, 2])/2, atol=1e-9)
+    np.testing.assert_allclose(
+        sv, np.sqrt(((s_ref[:, 0] - s_ref[:, 1])**2 +
+                     (s_ref[:, 1] - s_ref[:, 2])**2 +
+                     (s_ref[:, 0] - s_ref[:, 2])**2)/2), atol=1e-9)
+
+    # las direcciones coinciden salvo el signo (todos los esfuerzos
+    # principales de las pruebas son distintos)
+    for k, nk in enumerate((n1, n2, n3)):
+        np.testing.assert_allclose(np.abs(np.sum(nk*n_ref[:, k], axis=1)), 1,
+                                   atol=1e-9)
+
+
+def test_forma_de_los_arreglos_y_errores():
+    sr = np.ones((4, 2, 2))
+    s1, s2, s3, n1, n2, n3, tmax, sv = esfuerzos_principales(sr, 2*sr, 0, 0)
+    assert s1.shape == (4, 2, 2) and n1.shape == (4, 2, 2, 3)
+    np.testing.assert_allclose(n1[..., 2], 1)
+
+    with pytest.raises(ValueError):
+        esfuerzos_principales(sr, sr, sr, sr, trt=1, metodo='cerrada')
+    with pytest.raises(ValueError):
+        esfuerzos_principales(sr, sr, sr, sr, metodo='mohr')
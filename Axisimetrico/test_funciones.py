@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de las fuerzas nodales equivalentes de las cargas distribuidas contra
+el ciclo de t2ft_R89_axisimetrico de la versión original de funciones.py
+(ejecutar con: python -m pytest test_funciones.py).
+"""
+
+import numpy as np
+import pytest
+
+from funciones import t2ft_R89_axisimetrico, t2ft_R89_axisimetrico_lados
+
+X, Y = 0, 1
+IDX_LADO = {123: [0, 1, 2], 345: [2, 3, 4], 567: [4, 5, 6], 781: [6, 7, 0]}
+
+
+def t2ft_original(xnod, lado, carga):
+    ''' Ciclo por punto de Gauss de la versión original (n_gl = 2). '''
+    idx = np.array(IDX_LADO[lado])
+    nno = xnod.shape[0]
+    x_gl, w_gl = np.polynomial.legendre.leggauss(2)
+    NN      = lambda xi: np.array([ xi*(xi-1)/2, (1+xi)*(1-xi), xi*(1+xi)/2 ])
+    dNN_dxi = lambda xi: np.array([ xi - 1/2   , -2*xi        , xi + 1/2    ])
+
+    te = np.zeros(2*nno)
+    te[np.c_[2*idx, 2*idx + 1].ravel()] = carga
+    suma = np.zeros((2*nno, 2*nno))
+    N, dN_dxi = np.zeros(nno), np.zeros(nno)
+    for p in range(2):
+        N[idx] = NN(x_gl[p])
+        matN = np.zeros((2, 2*nno))
+        matN[0, 0::2] = matN[1, 1::2] = N
+        dN_dxi[idx] = dNN_dxi(x_gl[p])
+        r = N @ xnod[:, X]
+        ds_dxi = np.hypot(dN_dxi @ xnod[:, X], dN_dxi @ xnod[:, Y])
+        suma += r * matN.T @ matN * ds_dxi*w_gl[p]
+    return suma @ te
+
+
+def elementos(nef=5, seed=0):
+    ''' Coordenadas de EF Q8 distorsionados alrededor de [1, 2] x [0, 1]. '''
+    rng = np.random.default_rng(seed)
+    xe = np.array([[1, 0], [1.5, 0], [2, 0], [2, 0.5],
+                   [2, 1], [1.5, 1], [1, 1], [1, 0.5]])
+    return xe + rng.uniform(-0.1, 0.1, (nef, 8, 2))
+
+
+@pytest.mark.parametrize('lado', [123, 345, 567, 781])
+def test_igual_al_ciclo_original(lado):
+    xe = elementos()
+    carga = np.random.default_rng(1).normal(size=(xe.shape[0], 6))
+    ref = np.array([t2ft_original(x, lado, c) for x, c in zip(xe, carga)])
+
+    for x, c, f in zip(xe, carga, ref):
+        np.testing.assert_allclose(t2ft_R89_axisimetrico(x, lado, c), f,
+                                   atol=1e-12)
+
+    # todos los lados a la vez: solo los gdl de los 3 nodos del lado
+    gdl_lado = np.c_[2*np.array(IDX_LADO[lado]),
+                     2*np.array(IDX_LADO[lado]) + 1].ravel()
+    np.testing.assert_allclose(
+        t2ft_R89_axisimetrico_lados(xe[:, IDX_LADO[lado]], carga),
+        ref[:, gdl_lado], atol=1e-12)
+
+
+def test_lado_no_valido():
+    with pytest.raises(Exception):
+        t2ft_R89_axisimetrico(elementos(1)[0], 135, np.zeros(6))
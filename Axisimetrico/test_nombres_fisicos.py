@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la lectura de los nombres de los grupos físicos
+(ejecutar con: python -m pytest test_nombres_fisicos.py).
+"""
+
+import pytest
+
+from nombres_fisicos import leer_nombres
+
+
+def test_nombres_validos():
+    datos = leer_nombres({1: (2, 'mat_1e6_0.3_2400'),
+                          2: (1, 'borde_res_xy'),
+                          3: (0, 'punto_des_y_-0.01'),
+                          4: (0, 'puntual_0_-1000'),
+                          5: (1, 'carga_0_-4000')})
+    assert datos['materiales'][['tag', 'E']].tolist() == [(1, 1e6)]
+    assert datos['apoyos'][['res_x', 'res_y']].tolist() == [(True, True),
+                                                             (False, True)]
+    assert datos['apoyos']['uy'].tolist() == [0, -0.01]
+    assert datos['puntuales'][['Px', 'Py']].tolist() == [(0, -1000)]
+    assert datos['cargas'][['fx', 'fy']].tolist() == [(0, -4000)]
+
+
+def test_desplazamientos_prescritos():
+    apoyos = leer_nombres({1: (0, 'punto_des_xy_1e-3_-2e-3'),
+                           2: (1, 'borde_des_x_0.5')})['apoyos']
+    assert apoyos[['res_x', 'res_y']].tolist() == [(True, True), (True, False)]
+    assert apoyos[['ux', 'uy']].tolist() == [(1e-3, -2e-3), (0.5, 0.0)]
+
+
+@pytest.mark.parametrize('nombre', ['material_base', 'bordes', 'cargas_viejas',
+                                    'puntuales', 'suelo', 'mat'])
+def test_nombres_ajenos_se_ignoran(nombre):
+    datos = leer_nombres({1: (2, nombre)})
+    assert all(registros.size == 0 for registros in datos.values())
+
+
+@pytest.mark.parametrize('nombre', ['mat_1e6_0.3_abc', 'mat_1e8_0.3',
+                                    'mat_1e8_0.3_2400_1', 'borde_res_z',
+                                    'borde_AB', 'punto_des_x', 'carga_x',
+                                    'carga_0_x', 'puntual_abc'])
+def test_registro_mal_escrito(nombre):
+    with pytest.raises(ValueError):
+        leer_nombres({1: (2, nombre)})
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de las restricciones y de la partición del sistema de ecuaciones
+contra las submatrices con np.ix_ de ejemplo_Q8_axisimetrico_original.py
+(ejecutar con: python -m pytest test_restricciones.py).
+"""
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from nombres_fisicos import leer_nombres
+from restricciones import restricciones, ParticionDC
+
+
+def test_restricciones():
+    apoyos = leer_nombres({1: (1, 'borde_res_y'),
+                           2: (0, 'punto_des_xy_1e-3_-2e-3'),
+                           3: (0, 'punto_res_x')})['apoyos']
+    dict_nodos = {1: np.array([1, 2, 3]), 2: np.array([4]), 3: np.array([5])}
+    gdl = np.arange(12).reshape((6, 2))
+
+    restringido, u = restricciones(apoyos, dict_nodos, gdl)
+    # c[i] = gdl[nodo - 1, dirección - 1] del ejemplo original
+    c = [gdl[0, 1], gdl[1, 1], gdl[2, 1], gdl[3, 0], gdl[3, 1], gdl[4, 0]]
+    np.testing.assert_array_equal(np.flatnonzero(restringido), np.sort(c))
+    np.testing.assert_array_equal(u[c], [0, 0, 0, 1e-3, -2e-3, 0])
+    assert np.all(u[~restringido] == 0)
+
+
+def test_desplazamientos_contradictorios():
+    apoyos = leer_nombres({1: (0, 'punto_des_y_0.1'),
+                           2: (1, 'borde_des_y_0.2')})['apoyos']
+    with pytest.raises(ValueError):
+        restricciones(apoyos, {1: np.array([2]), 2: np.array([1, 2])},
+                      np.arange(6).reshape((3, 2)))
+
+
+def test_submatrices_y_unir():
+    rng = np.random.default_rng(0)
+    ngdl = 40
+    K = sp.random(ngdl, ngdl, density=0.2, random_state=1, format='csr')
+    restringido = rng.random(ngdl) < 0.3
+    particion = ParticionDC(restringido)
+
+    c = np.flatnonzero(restringido)
+    d = np.setdiff1d(range(ngdl), c)
+    Kd = K.toarray()
+    ref = (Kd[np.ix_(d, d)], Kd[np.ix_(d, c)], Kd[np.ix_(c, d)],
+           Kd[np.ix_(c, c)])
+    for sub, sub_ref in zip(particion.submatrices(K), ref):
+        assert sub.format == 'csc'
+        np.testing.assert_array_equal(sub.toarray(), sub_ref)
+
+    # vectores y matrices con una columna por caso de carga
+    for forma in ((), (3,)):
+        a = rng.normal(size=(ngdl,) + forma)
+        np.testing.assert_array_equal(particion.unir(a[d], a[c]), a)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los solucionadores dispersos contra np.linalg.solve, que es el que
+usa ejemplo_Q8_axisimetrico_original.py
+(ejecutar con: python -m pytest test_solucionadores.py).
+"""
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from solucionadores import factorizar, resolver, cholesky, pyamg
+
+
+def sistema(n=60):
+    ''' Matriz dispersa simétrica y definida positiva (laplaciano 1D más un
+        término en la diagonal) y dos lados derechos.
+    '''
+    A = sp.diags([-np.ones(n - 1), 2.5*np.ones(n), -np.ones(n - 1)],
+                 [-1, 0, 1], format='csr')
+    b = np.random.default_rng(0).normal(size=(n, 2))
+    return A, b
+
+
+METODOS = [('superlu', None), ('gc', 'jacobi'), ('gc', 'ilu'), ('gc', None),
+           pytest.param('cholmod', None, marks=pytest.mark.skipif(
+               cholesky is None, reason='requiere scikit-sparse')),
+           pytest.param('gc', 'amg', marks=pytest.mark.skipif(
+               pyamg is None, reason='requiere pyamg'))]
+
+
+@pytest.mark.parametrize('metodo, precondicionador', METODOS)
+def test_igual_a_np_linalg_solve(metodo, precondicionador):
+    A, b = sistema()
+    x_ref = np.linalg.solve(A.toarray(), b)
+    resolver_b = factorizar(A, metodo, precondicionador=precondicionador)
+
+    # varios lados derechos a la vez y uno por uno con la misma factorización
+    np.testing.assert_allclose(resolver_b(b), x_ref, rtol=1e-8, atol=1e-10)
+    for j in range(b.shape[1]):
+        np.testing.assert_allclose(resolver_b(b[:, j]), x_ref[:, j],
+                                   rtol=1e-8, atol=1e-10)
+
+
+def test_auto_y_matriz_llena():
+    A, b = sistema()
+    np.testing.assert_allclose(resolver(A.toarray(), b[:, 0]),
+                               np.linalg.solve(A.toarray(), b[:, 0]))
+
+
+def test_argumentos_no_validos():
+    A, _ = sistema()
+    with pytest.raises(ValueError):
+        factorizar(A, 'gauss')
+    with pytest.raises(ValueError):
+        factorizar(A, 'gc', precondicionador='ssor')
@@ -4,143 +4,415 @@ Funciones para leer y graficar una malla creada en GMSH.
 
 Por: Alejandro Hincapié Giraldo
 """
+import mmap
+import os
+import traceback
+from collections import deque
+from itertools import islice
+
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 from matplotlib.colors import get_named_colors_mapping
 
+# La topología y los gráficos de la malla son los mismos del leer_GMSH.py de
+# la carpeta raíz (topologia_malla.py y graficos_malla.py son copias)
+from topologia_malla import LADOS_EF, Topologia
+from graficos_malla import (TIPO_EF, CONTORNO_EF, MAX_ETIQUETAS,
+                            graficar_malla, vista_previa_malla)
+
 # %% Funciones:
 
-def xnod_from_msh(archivo, dim=2):
-    ''' Obtiene la matriz de coordenadas de los nodos que contiene la malla de
-        EF a trabajar, a partir del archivo .msh exportado por el programa GMSH.
+# Número de nodos de cada tipo de EF de GMSH (necesario para leer los archivos
+# binarios, en los que el número de nodos por EF no se puede deducir del texto)
+NNO_TIPO_EF = {1: 2, 2: 3, 3: 4, 4: 4, 5: 8, 6: 6, 7: 5, 8: 3, 9: 6, 10: 9,
+               11: 10, 12: 27, 13: 18, 14: 14, 15: 1, 16: 8, 17: 20, 18: 15,
+               19: 13, 20: 9, 21: 10, 22: 12, 23: 15, 24: 15, 25: 21, 26: 4,
+               27: 5, 28: 6, 29: 20, 36: 16}
+
+
+def _leer_bloque(f, nlineas, dtype=float):
+    ''' Lee las siguientes "nlineas" líneas del archivo abierto "f" y las
+        convierte de una sola vez en un vector de números.
     '''
+    return np.fromstring(''.join(islice(f, nlineas)), dtype=dtype, sep=' ')
 
-    # Se lee el archivo y se toman cada una de sus líneas:
-    m = open(archivo)
-    malla = m.readlines()
-    malla = [linea.rstrip('\n') for linea in malla]
-
-    # Se determina en qué lineas comienza y termina el reporte de nodos del
-    # archivo:
-    inicio_nodos = malla.index('$Nodes')
-    fin_nodos = malla.index('$EndNodes')
-
-    # Se toma únicamente la parte del archivo que se requiere:
-    malla = malla[inicio_nodos+1:fin_nodos]
-
-    # Se leen los parámetros iniciales:
-    nblocks, nnodos = [int(n) for n in malla[0].split()[0:2]]
-
-    # Se inicializan las listas para cada una de las entidades que
-    # reporta el archivo:
-    nodos_puntos = []; xnod_puntos = []
-    nodos_bordes = []; xnod_bordes = []
-    nodos_superf = []; xnod_superf = []
-
-
-    for j in range(1, len(malla)):
-        line = malla[j]
-        if len(line.split()) == 4:             # Se busca el reporte de cada bloque
-            tipo_ent = int(line.split()[0])    # Punto, borde o superf.
-    
-            nno_bloque = int(line.split()[-1]) # No. de nodos del bloque
-            nodos_bloque = malla[j+1:j+1+nno_bloque]  # Lista de nodos del bloque
-            nodos_bloque = [int(n) for n in nodos_bloque] # Se convierten a enteros
-    
-            xnod_b = malla[j+1+nno_bloque:j+1+2*nno_bloque]
-    
-            # Se reportan las coordenadas como una "matriz":
-            xnod_bloque = []
-            for l in xnod_b:
-                coord = [float(n) for n in l.split()]
-                xnod_bloque.append(coord)
-
-            # Finalmente se agregan los datos leídos a la lista corres-
-            # pondiente según la entidad (punto, línea o superficie):
-            if tipo_ent == 0:
-                nodos_puntos.append(nodos_bloque)
-                xnod_puntos.append(xnod_bloque)
-            elif tipo_ent == 1:
-                nodos_bordes.append(nodos_bloque)
-                xnod_bordes.append(xnod_bloque)
-            elif tipo_ent == 2:
-                nodos_superf.append(nodos_bloque)
-                xnod_superf.append(xnod_bloque)
-
-    # Se ensambla finalmente la matriz xnod completa:
-
-    xnod = np.empty((nnodos, 3))
-
-    # Primero se adicionan los nodos correspondientes a los puntos:
-    for i in range(len(nodos_puntos)):
-        idx = np.array(nodos_puntos[i]) - 1
-        xnod[idx, :] = np.array(xnod_puntos[i])
-
-    # Luego se agregan los nodos correspondientes a los bordes:
-    for i in range(len(nodos_bordes)):
-        idx = np.array(nodos_bordes[i]) - 1
-        xnod[idx, :] = np.array(xnod_bordes[i])
-
-    # Finalmente se agregan los nodos correspondientes a la superficie:
-    for i in range(len(nodos_superf)):
-        idx = np.array(nodos_superf[i]) - 1
-        xnod[idx, :] = np.array(xnod_superf[i])
 
-    # Se toman las columnas necesarias según la dimensión
-    xnod = xnod[:, :dim]
+def _saltar_lineas(f, nlineas):
+    ''' Avanza "nlineas" líneas en el archivo abierto "f" sin procesarlas.
+    '''
+    deque(islice(f, nlineas), maxlen=0)
 
-    return xnod
 
-def LaG_from_msh(archivo):
-    ''' Obtiene la matriz de interconexión nodal (LaG) que contiene la malla de
-        EF a trabajar, a partir del archivo .msh exportado por el programa GMSH.
+def _nombres_fisicos(lineas):
+    ''' Lee las líneas de la sección $PhysicalNames (sin el encabezado) y
+        retorna un diccionario {(dim, tag): nombre}.
     '''
-    # Se lee el archivo y se toman cada una de sus líneas:
-    m = open(archivo)
-    malla = m.readlines()
-    malla = [linea.rstrip('\n') for linea in malla]
+    nombres = {}
+    for linea in lineas:
+        dim, tag, nombre = linea.split(maxsplit=2)
+        nombres[(int(dim), int(tag))] = nombre.strip().strip('"')
+    return nombres
+
+
+def _nodos(bloques, nnodos, max_tag, coordenadas):
+    ''' Arma la matriz xnod a partir de los bloques de nodos del archivo, dados
+        como tuplas (etiquetas, coordenadas), y el vector índice que asocia la
+        etiqueta de cada nodo con su fila en xnod.
+    '''
+    xnod = np.empty((nnodos, 3)) if coordenadas else None
+    tags = np.empty(nnodos, dtype=np.int64)
+
+    fila = 0
+    for tags_bloque, x in bloques:
+        nno_bloque = tags_bloque.size
+        tags[fila:fila+nno_bloque] = tags_bloque
+        if coordenadas:
+            # Los nodos paramétricos reportan además sus coordenadas locales,
+            # que no se requieren
+            xnod[fila:fila+nno_bloque] = x[:, :3]
+        fila += nno_bloque
+
+    # Las etiquetas de los nodos no son necesariamente contiguas ni ordenadas,
+    # así que se construye un vector índice que asocia cada etiqueta con su
+    # fila en xnod
+    orden = np.argsort(tags, kind='stable')
+    if coordenadas:
+        xnod = xnod[orden]
+    fila_nodo = np.full(max_tag + 1, -1, dtype=np.int64)
+    fila_nodo[tags[orden]] = np.arange(nnodos)
+
+    return xnod, fila_nodo
+
+
+def _elementos(bloques, nelem, fila_nodo, fisicos_entidad):
+    ''' Arma la matriz LaG a partir de los bloques de EF del archivo, dados como
+        tuplas (dim, tag, tipo_ef, datos), donde cada fila de datos es
+        [etiqueta del EF, etiquetas de sus nodos].
+
+        Además, reúne los nodos (etiquetas) de los EF de las entidades que
+        pertenecen a cada grupo físico, según el diccionario fisicos_entidad
+        {(dim, tag_entidad): [tags de los grupos físicos]}.
+    '''
+    LaG = None
+    fila = 0
+    nmat = 0
+    nodos_grupo = {}
+    for dim, tag, tipo_ef, datos in bloques:
+        for tag_fis in fisicos_entidad.get((dim, tag), []):
+            nodos_grupo.setdefault((dim, tag_fis), []).append(datos[:, 1:])
+
+        if dim != 2:  # solo se toman EF pertenecientes a superficies
+            continue
+
+        nef = datos.shape[0]
+        if LaG is None:
+            # Se reserva la memoria según el total de EF reportados, que es
+            # una cota superior de los EF 2D
+            LaG = np.empty((nelem, datos.shape[1]), dtype=np.int64)
+            tipo_2D = tipo_ef
+        elif tipo_ef != tipo_2D:
+            raise ValueError('La malla tiene varios tipos de elementos '
+                             'finitos 2D.')
+
+        # Se reporta la superficie a la que pertenece cada EF y los nodos se
+        # pasan de etiquetas a filas de xnod
+        LaG[fila:fila+nef, 0] = nmat
+        LaG[fila:fila+nef, 1:] = fila_nodo[datos[:, 1:]]
+        fila += nef
+        nmat += 1
+
+    if LaG is not None:
+        LaG = LaG[:fila]
+
+    nodos_grupo = {grupo: np.unique(np.concatenate([n.ravel() for n in nodos]))
+                   for grupo, nodos in nodos_grupo.items()}
+
+    return LaG, nodos_grupo
+
+
+def _leer_msh_ascii(archivo, coordenadas, elementos, grupos):
+    ''' Lee en una sola pasada un archivo .msh en formato 4.1 ASCII.
+
+        El archivo se recorre línea a línea y cada bloque de nodos o de EF se
+        convierte de una sola vez a un arreglo de numpy, por lo que en memoria
+        solo se tiene a la vez el texto de un bloque.
+    '''
+    xnod = None
+    LaG = None
+    nombres = {}
+    fisicos_entidad = {}
+    nodos_grupo = {}
+    with open(archivo) as f:
+        for linea in f:
+            linea = linea.strip()
+            if linea == '$PhysicalNames':
+                nombres = _nombres_fisicos(islice(f, int(next(f))))
+
+            elif linea == '$Entities' and grupos:
+                nent = [int(n) for n in next(f).split()]
+                for dim in range(4):
+                    for i in range(nent[dim]):
+                        datos = next(f).split()
+                        # los puntos reportan sus coordenadas y las demás
+                        # entidades su caja envolvente
+                        k = 4 if dim == 0 else 7
+                        nfis = int(datos[k])
+                        # (el signo de las etiquetas indica la orientación)
+                        if nfis > 0:
+                            fisicos_entidad[(dim, int(datos[0]))] = \
+                                [abs(int(t)) for t in datos[k+1:k+1+nfis]]
+
+            elif linea == '$Nodes':
+                nblocks, nnodos, min_tag, max_tag = \
+                    [int(n) for n in next(f).split()]
+
+                def bloques_nodos():
+                    for i in range(nblocks):
+                        dim, tag, parametrico, nno_bloque = \
+                            [int(n) for n in next(f).split()]
+                        tags = _leer_bloque(f, nno_bloque, np.int64)
+                        if coordenadas:
+                            x = _leer_bloque(f, nno_bloque)
+                            yield tags, x.reshape((nno_bloque, -1))
+                        else:
+                            _saltar_lineas(f, nno_bloque)
+                            yield tags, None
+
+                xnod, fila_nodo = _nodos(bloques_nodos(), nnodos, max_tag,
+                                         coordenadas)
+
+            elif linea == '$Elements' and (elementos or grupos):
+                nblocks, nelem, min_tag, max_tag = \
+                    [int(n) for n in next(f).split()]
+
+                def bloques_ef():
+                    for i in range(nblocks):
+                        dim, tag, tipo_ef, nef = \
+                            [int(n) for n in next(f).split()]
+                        if (elementos and dim == 2) or \
+                           (dim, tag) in fisicos_entidad:
+                            datos = _leer_bloque(f, nef, np.int64)
+                            yield dim, tag, tipo_ef, datos.reshape((nef, -1))
+                        else:
+                            _saltar_lineas(f, nef)
+
+                LaG, nodos_grupo = _elementos(bloques_ef(), nelem, fila_nodo,
+                                              fisicos_entidad)
+
+    return xnod, LaG, nombres, nodos_grupo
+
+
+def _leer_msh_binario(archivo, coordenadas, elementos, grupos):
+    ''' Lee un archivo .msh en formato 4.1 binario (Mesh.Binary=1).
+
+        El archivo se mapea en memoria (mmap), de modo que las etiquetas y las
+        coordenadas de cada bloque de nodos y de EF se leen como vistas de
+        numpy sobre el archivo, sin copiarlas ni convertirlas desde texto.
+    '''
+    with open(archivo, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        try:
+            return _leer_mmap(mm, coordenadas, elementos, grupos)
+        except Exception as error:
+            # El traceback conserva las variables de _leer_mmap, entre ellas
+            # vistas sobre mm que impedirían cerrarlo (BufferError en lugar
+            # del error original); se borran antes de salir del bloque with
+            traceback.clear_frames(error.__traceback__)
+            raise
+
+
+def _leer_mmap(mm, coordenadas, elementos, grupos):
+    ''' Lee el archivo binario mapeado en memoria "mm" (ver
+        _leer_msh_binario).
+
+        Los arreglos retornados no son vistas sobre mm (_nodos y _elementos
+        copian los datos de los bloques), así que al retornar no queda
+        ninguna referencia a mm y este se puede cerrar.
+    '''
+    pos = 0  # posición actual de lectura en el archivo
+
+    def leer_linea():
+        nonlocal pos
+        fin = mm.find(b'\n', pos)
+        if fin == -1:
+            raise ValueError('archivo .msh truncado')
+        linea = mm[pos:fin].decode().strip()
+        pos = fin + 1
+        return linea
+
+    def leer(dtype, n=1):
+        nonlocal pos
+        if pos + n*np.dtype(dtype).itemsize > len(mm):
+            raise ValueError('archivo .msh truncado')
+        datos = np.frombuffer(mm, dtype=dtype, count=n, offset=pos)
+        pos += datos.nbytes
+        return datos
+
+    def saltar_seccion(seccion):
+        nonlocal pos
+        pos = mm.find(b'$End' + seccion[1:].encode(), pos)
+        if pos == -1:
+            raise ValueError('archivo .msh truncado')
+        leer_linea()
+
+    # Encabezado: versión, tipo de archivo, tamaño de size_t y un entero 1
+    # que permite detectar el orden de los bytes
+    leer_linea()
+    version, tipo_archivo, tam_size_t = leer_linea().split()
+    orden = '<' if np.frombuffer(mm, '<i4', 1, pos)[0] == 1 else '>'
+    saltar_seccion('$MeshFormat')
+    INT = np.dtype(orden + 'i4')
+    DOUBLE = np.dtype(orden + 'f8')
+    SIZE_T = np.dtype(f'{orden}u{tam_size_t}')
+
+    xnod = None
+    LaG = None
+    nombres = {}
+    fisicos_entidad = {}
+    nodos_grupo = {}
+    while pos < len(mm):
+        seccion = leer_linea()
+        if not seccion.startswith('$'):
+            continue
+
+        if seccion == '$PhysicalNames':
+            nombres = _nombres_fisicos([leer_linea()
+                                        for i in range(int(leer_linea()))])
+
+        elif seccion == '$Entities' and grupos:
+            nent = leer(SIZE_T, 4)
+            for dim in range(4):
+                for i in range(nent[dim]):
+                    tag = int(leer(INT)[0])
+                    leer(DOUBLE, 3 if dim == 0 else 6)  # coord. o caja
+                    fisicos = leer(INT, int(leer(SIZE_T)[0]))
+                    if fisicos.size > 0:
+                        fisicos_entidad[(dim, tag)] = np.abs(fisicos).tolist()
+                    if dim > 0:  # entidades que la delimitan
+                        leer(INT, int(leer(SIZE_T)[0]))
+
+        elif seccion == '$Nodes':
+            nblocks, nnodos, min_tag, max_tag = \
+                [int(n) for n in leer(SIZE_T, 4)]
+
+            def bloques_nodos():
+                for i in range(nblocks):
+                    dim, tag, parametrico = leer(INT, 3)
+                    nno_bloque = int(leer(SIZE_T)[0])
+                    tags = leer(SIZE_T, nno_bloque)
+                    ncoord = 3 + dim if parametrico else 3
+                    x = leer(DOUBLE, nno_bloque*ncoord)
+                    yield tags, x.reshape((nno_bloque, ncoord))
+
+            xnod, fila_nodo = _nodos(bloques_nodos(), nnodos, max_tag,
+                                     coordenadas)
+
+        elif seccion == '$Elements' and (elementos or grupos):
+            nblocks, nelem, min_tag, max_tag = \
+                [int(n) for n in leer(SIZE_T, 4)]
+
+            def bloques_ef():
+                for i in range(nblocks):
+                    dim, tag, tipo_ef = [int(n) for n in leer(INT, 3)]
+                    nef = int(leer(SIZE_T)[0])
+                    if tipo_ef not in NNO_TIPO_EF:
+                        raise ValueError(f'Tipo de EF {tipo_ef} no soportado')
+                    datos = leer(SIZE_T, nef*(1 + NNO_TIPO_EF[tipo_ef]))
+                    yield dim, tag, tipo_ef, datos.reshape((nef, -1))
+
+            LaG, nodos_grupo = _elementos(bloques_ef(), nelem, fila_nodo,
+                                          fisicos_entidad)
+
+        # Se ubica la lectura al final de la sección (las secciones que no
+        # se requieren se saltan por completo)
+        if not seccion.startswith('$End'):
+            saltar_seccion(seccion)
+
+    return xnod, LaG, nombres, nodos_grupo
+
+
+def _leer_msh(archivo, coordenadas=True, elementos=True, grupos=False):
+    ''' Lee un archivo .msh en formato 4.1 (ASCII o binario) y retorna la
+        tupla (xnod, LaG, nombres, nodos_grupo).
+    '''
+    # Se lee el encabezado para determinar si el archivo es binario
+    with open(archivo, 'rb') as f:
+        if f.readline().strip() != b'$MeshFormat':
+            raise ValueError('El archivo no tiene el formato .msh de GMSH')
+        version, tipo_archivo = f.readline().split()[:2]
+    if version != b'4.1':
+        raise ValueError('Solo se admiten archivos .msh en formato 4.1')
+
+    if tipo_archivo == b'1':
+        return _leer_msh_binario(archivo, coordenadas, elementos, grupos)
+    return _leer_msh_ascii(archivo, coordenadas, elementos, grupos)
+
+
+def leer_msh(archivo, coordenadas=True, elementos=True):
+    ''' Lee en una sola pasada un archivo .msh (formato 4.1, ASCII o binario)
+        exportado por GMSH, sin usar la API de GMSH.
 
-    # Se determina en qué lineas comienza y termina el reporte de nodos del
-    # archivo:
-    for i in range(len(malla)):
-        inicio_elem = malla.index('$Elements')
-        fin_elem = malla.index('$EndElements')
+        Argumentos:
+        - archivo: str. Archivo de extensión .msh exportado por GMSH.
+        - coordenadas: bool. Si es False no se procesan las coordenadas.
+        - elementos: bool. Si es False no se procesan los EF.
+
+        Retorna: (xnod, LaG)
+        - xnod: array (nno, 3). Coordenadas nodales, ordenadas de forma
+                ascendente según la etiqueta de cada nodo (None si
+                coordenadas=False).
+        - LaG: array (nef, 1 + nno_ef). La primera columna es la superficie a
+               la que pertenece cada EF (desde 0) y las demás son los nodos
+               (desde 0) de cada EF (None si elementos=False).
+    '''
+    xnod, LaG, nombres, nodos_grupo = _leer_msh(archivo, coordenadas,
+                                                elementos)
+    return xnod, LaG
+
+
+def grupos_fisicos(archivo, dim=-1):
+    ''' Obtiene los grupos físicos de un archivo .msh (formato 4.1, ASCII o
+        binario) sin usar la API de GMSH, a partir de las secciones
+        $PhysicalNames, $Entities y $Elements.
+        Si se especifica el argumento dim, solo se reportan los grupos físicos
+        de tal dimensión, si no, se reportan todos.
+        Retorna (en el mismo formato de obtener_grupos_fisicos.py):
+            - Un diccionario {tag: (dim, nombre)} de los grupos físicos.
+            - Un diccionario {tag: nodos} con los nodos (etiquetas de GMSH)
+              asociados a cada grupo físico.
+    '''
+    xnod, LaG, nombres, nodos_grupo = _leer_msh(archivo, coordenadas=False,
+                                                elementos=False, grupos=True)
+    dict1 = {}
+    dict2 = {}
+    for d, tag in sorted(nodos_grupo):
+        if dim == -1 or d == dim:
+            dict1[tag] = (d, nombres.get((d, tag), ''))
+            dict2[tag] = nodos_grupo[(d, tag)]
 
-    # Se toman solo las líneas necesarias
-    malla = malla[inicio_elem+1:fin_elem]
+    return dict1, dict2
 
-    nblocks, nelem = [int(n) for n in malla[0].split()[0:2]]
-    matrices = []  # Guardará las matrices LaG asociadas a cada entidad
-    tags = []      # Tag correspondiente a cada entidad
-    fila = 1       # Contador de filas recorridas
-    nmat = 1
-    for i in range(nblocks):
-        linea = malla[fila]
 
-        dim, tag, tipo_ef, nef = [int(n) for n in linea.split()]
-        if dim==2:  # solo se toman nodos pertenecientes a superficies
-            tags.extend([nmat]*nef)
-            nmat += 1
-            matrices.append(malla[fila+1:fila+1+nef])
-        fila += (1+nef)
+def xnod_from_msh(archivo, dim=2):
+    ''' Obtiene la matriz de coordenadas de los nodos que contiene la malla de
+        EF a trabajar, a partir del archivo .msh exportado por el programa GMSH.
+    '''
+    xnod, LaG = leer_msh(archivo, elementos=False)
 
-    LaG = []  # Se inicializa la matriz LaG
+    # Se toman las columnas necesarias según la dimensión
+    return xnod[:, :dim]
 
-    for matriz in matrices:
-        for i in range(len(matriz)):
-            linea = [int(n) for n in matriz[i].split()]
-            LaG.append(linea)
-    LaG = np.array(LaG)
 
-    # Se reporta la superficie a la que pertenece cada elemento finito
-    LaG[:, 0] = np.array(tags)
+def LaG_from_msh(archivo):
+    ''' Obtiene la matriz de interconexión nodal (LaG) que contiene la malla de
+        EF a trabajar, a partir del archivo .msh exportado por el programa GMSH.
+    '''
+    xnod, LaG = leer_msh(archivo, coordenadas=False)
 
-    return LaG - 1
+    return LaG
 
 
 def plot_msh(file, tipo, mostrar_nodos=False, mostrar_num_nodo=False, 
-             mostrar_num_elem=False):
+             mostrar_num_elem=False, max_etiquetas=MAX_ETIQUETAS):
     ''' Función para graficar la malla contenida en el archivo "file".
         Argumentos:
         - file: str. Debe ser un archivo de extensión .msh exportado por GMSH.
@@ -149,106 +421,55 @@ def plot_msh(file, tipo, mostrar_nodos=False, mostrar_num_nodo=False,
         - mostrar_num_nodo: bool. Define si se muestra el número de cada nodo
                             en el gráfico.
         - mostrar_num_elem: bool. Define si se muestra el número de cada ele-
-                            mento finito en el gráfico.                            
+                            mento finito en el gráfico.
+        - max_etiquetas: int. Los números de los nodos o de los EF solo se
+                         escriben si hay a lo sumo esta cantidad.
+
+        Los contornos de todos los EF se dibujan con una sola colección de
+        líneas y los nodos con un solo scatter, de modo que el tiempo de
+        dibujo casi no depende del número de EF.
     '''
-    LaG_mat = LaG_from_msh(file)
-    mat = LaG_mat[:, 0]
+    # El archivo se lee una sola vez para obtener nodos y EF
+    xnod, LaG_mat = leer_msh(file)
+    graficar_malla(xnod, LaG_mat[:, 1:], LaG_mat[:, 0], tipo, mostrar_nodos,
+                   mostrar_num_nodo, mostrar_num_elem, max_etiquetas,
+                   colores=['k'] + list(get_named_colors_mapping().values()),
+                   color_num_elem='b')
+
+
+# topología de la última malla de vista_previa_msh(), que se reutiliza
+# mientras el archivo no cambie
+_topologia_previa = {}
+
+
+def vista_previa_msh(file, ancho=1200, alto=None, todas_aristas=False):
+    ''' Vista previa rápida de una malla 2D muy grande.
+
+        En lugar de dibujar cada EF, las aristas se rasterizan en una imagen
+        de ancho x alto píxeles (las aristas más pequeñas que un píxel se
+        funden en él), así que el costo del dibujo depende del número de
+        píxeles y no del número de EF.
+
+        Argumentos:
+        - file: str. Archivo .msh exportado por GMSH.
+        - ancho: int. Ancho de la imagen en píxeles.
+        - alto: int. Alto de la imagen en píxeles; si es None se calcula para
+                conservar la proporción de la malla.
+        - todas_aristas: bool. Si es False solo se dibujan la frontera de la
+                         malla (negro) y las interfaces entre materiales
+                         (rojo), obtenidas de la columna mat de LaG; si es
+                         True también se dibujan en gris las demás aristas.
+    '''
+    # El archivo se lee una sola vez para obtener nodos y EF
+    xnod, LaG_mat = leer_msh(file)
     LaG = LaG_mat[:, 1:]
-    nef = LaG.shape[0]
-    
-    # Se determina el tipo de elemento finito
-    if LaG.shape[1] == 3:
-        elem = 'T3'
-    elif LaG.shape[1] == 4:
-        elem = 'Q4'
-    elif LaG.shape[1] == 6:
-        elem = 'T6'
-    elif LaG.shape[1] == 8:
-        elem = 'Q8'
-    elif LaG.shape[1] == 9:
-        elem = 'Q9'
-    elif LaG.shape[1] == 10:
-        elem = 'T10'
-
-    if tipo=='shell':
-        xnod = xnod_from_msh(file, 3)
-        nno = xnod.shape[0]
-
-        cg = np.empty((nef,3))  # Centro de gravedad del EF
-        colores = ['k'] + list(get_named_colors_mapping().values())
-        fig = plt.figure(figsize=(12, 12))
-        ax = plt.gca(projection='3d')
-        for e in range(nef):
-            if elem=='T3' or elem=='Q4':
-                nodos = np.r_[LaG[e], LaG[e, 0]]
-            elif elem =='T6':
-                nodos = LaG[e, [0, 3, 1, 4, 2, 5, 0]]
-            elif elem =='Q8' or elem == 'Q9':
-                nodos = LaG[e, [0, 4, 1, 5, 2, 6, 3, 7, 0]]
-            elif elem == 'T10':
-                nodos = LaG[e, [0, 3, 4, 1, 5, 6, 2, 7, 8, 0]]
-            color = colores[mat[e]]
-            X = xnod[nodos,0]
-            Y = xnod[nodos,1]
-            Z = xnod[nodos,2]
-            
-            ax.plot3D(X, Y, Z, '-', lw=0.8, c=color)
-            if mostrar_nodos:
-                ax.plot3D(xnod[LaG[e],0], xnod[LaG[e],1], xnod[LaG[e],2],
-                          'ko', ms=5, mfc='r')
-            if mostrar_num_elem:
-                # se calcula la posición del centro de gravedad del EF
-                cg[e] = np.mean(xnod[LaG[e]], axis=0)
-        
-                # y se reporta el número del elemento actual
-                ax.text(cg[e,0], cg[e,1], cg[e,2], f'{e+1}', horizontalalignment='center',
-                        verticalalignment='center',  color='b')
-        if mostrar_num_nodo:
-            for i in range(nno):
-               ax.text(xnod[i,0], xnod[i,1], xnod[i,2], f'{i+1}', color='r')
-        fig.suptitle(f'Malla de EF Shell ({elem})', fontsize='x-large')
-        ax.set_xlabel('x')
-        ax.set_ylabel('y')
-        ax.set_zlabel('z')
-        ax.view_init(45, 45)
-        
-    elif tipo=='2D':
-        xnod = xnod_from_msh(file, 2)
-        nno = xnod.shape[0]
-
-        cg = np.empty((nef,2))
-        colores = ['k'] + list(get_named_colors_mapping().values())
-
-        fig = plt.figure(figsize=(12, 12))
-        ax = plt.gca()
-        for e in range(nef):
-            if elem=='T3' or elem=='Q4':
-                nodos = np.r_[LaG[e], LaG[e, 0]]
-            elif elem =='T6':
-                nodos = LaG[e, [0, 3, 1, 4, 2, 5, 0]]
-            elif elem =='Q8' or elem == 'Q9':
-                nodos = LaG[e, [0, 4, 1, 5, 2, 6, 3, 7, 0]]
-            elif elem == 'T10':
-                nodos = LaG[e, [0, 3, 4, 1, 5, 6, 2, 7, 8, 0]]
-            color = colores[mat[e]]
-            X = xnod[nodos,0]
-            Y = xnod[nodos,1]
-            ax.plot(X, Y, '-', lw=0.8, c=color)
-            if mostrar_nodos:
-                ax.plot(xnod[LaG[e],0], xnod[LaG[e],1], 'ko', ms=5, mfc='r')
-            if mostrar_num_elem:
-                # se calcula la posición del centro de gravedad del EF
-                cg[e] = np.mean(xnod[LaG[e]], axis=0)
-        
-                # y se reporta el número del elemento actual
-                ax.text(cg[e,0], cg[e,1], f'{e+1}', horizontalalignment='center',
-                        verticalalignment='center',  color='b')
-        if mostrar_num_nodo:
-            for i in range(nno):
-               ax.text(xnod[i,0], xnod[i,1], f'{i+1}', color='r')
-        fig.suptitle(f'Malla de EF 2D ({elem})', fontsize='x-large')
-        ax.set_xlabel('x')
-        ax.set_ylabel('y')
-        ax.set_aspect('equal', adjustable='box')
-    else:
-        raise ValueError('El argumento "tipo" introducido no es válido')
+
+    clave = (os.path.abspath(file), os.stat(file).st_mtime_ns)
+    def topologia():
+        if clave not in _topologia_previa:
+            _topologia_previa.clear()
+            _topologia_previa[clave] = Topologia(LaG)
+        return _topologia_previa[clave]
+
+    vista_previa_malla(xnod, LaG, LaG_mat[:, 0], topologia, ancho, alto,
+                       todas_aristas)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la lectura de archivos .msh sin la API de GMSH: los resultados se
+comparan con los que reporta la API de GMSH para la misma malla
+(ejecutar con: python -m pytest test_leer_GMSH.py).
+"""
+
+import numpy as np
+import pytest
+
+from leer_GMSH import leer_msh, grupos_fisicos, xnod_from_msh, LaG_from_msh
+
+gmsh = pytest.importorskip('gmsh')
+
+
+def crear_malla(archivo, binario=False, recombinar=()):
+    ''' Malla de triángulos de 6 nodos de dos rectángulos adyacentes, con un
+        grupo físico por dimensión. Las superficies en "recombinar" se mallan
+        con cuadriláteros.
+
+        Retorna los resultados de la API de GMSH: (xnod, LaG, nodos_grupo),
+        donde LaG es una lista con la LaG de cada superficie.
+    '''
+    gmsh.initialize()
+    try:
+        gmsh.option.setNumber('General.Terminal', 0)
+        gmsh.model.add('prueba')
+        gmsh.model.occ.addRectangle(0, 0, 0, 1, 1)
+        gmsh.model.occ.addRectangle(1, 0, 0, 2, 1)
+        gmsh.model.occ.fragment([(2, 1)], [(2, 2)])
+        gmsh.model.occ.synchronize()
+        gmsh.model.addPhysicalGroup(2, [1, 2], 1, 'placa')
+        gmsh.model.addPhysicalGroup(1, [4], 2, 'borde')
+        gmsh.model.addPhysicalGroup(0, [1], 3, 'esquina')
+        for s in recombinar:
+            gmsh.model.mesh.setRecombine(2, s)
+        gmsh.option.setNumber('Mesh.MeshSizeMax', 0.3)
+        gmsh.option.setNumber('Mesh.ElementOrder', 2)
+        gmsh.option.setNumber('Mesh.SecondOrderIncomplete', 1)
+        gmsh.model.mesh.generate(2)
+        gmsh.option.setNumber('Mesh.MshFileVersion', 4.1)
+        gmsh.option.setNumber('Mesh.Binary', int(binario))
+        gmsh.write(str(archivo))
+
+        tags, x, _ = gmsh.model.mesh.getNodes()
+        orden = np.argsort(tags)
+        xnod = x.reshape((-1, 3))[orden]
+        LaG = []
+        for nmat, (dim, s) in enumerate(gmsh.model.getEntities(2)):
+            tipos, ef, nodos = gmsh.model.mesh.getElements(2, s)
+            LaG.append(np.c_[np.full(len(ef[0]), nmat),
+                             np.searchsorted(tags[orden], nodos[0])
+                             .reshape((len(ef[0]), -1))])
+        nodos_grupo = {tag: np.sort(gmsh.model.mesh.getNodesForPhysicalGroup(
+                                    dim, tag)[0])
+                       for dim, tag in gmsh.model.getPhysicalGroups()}
+    finally:
+        gmsh.finalize()
+
+    return xnod, LaG, nodos_grupo
+
+
+@pytest.mark.parametrize('binario', [False, True])
+def test_igual_a_la_api_de_gmsh(tmp_path, binario):
+    archivo = tmp_path/'malla.msh'
+    xnod_ref, LaG_ref, nodos_ref = crear_malla(archivo, binario)
+
+    LaG_ref = np.concatenate(LaG_ref)
+
+    # (en ASCII GMSH escribe las coordenadas con 16 cifras significativas)
+    xnod, LaG = leer_msh(archivo)
+    np.testing.assert_allclose(xnod, xnod_ref, rtol=1e-15, atol=1e-15)
+    np.testing.assert_array_equal(LaG, LaG_ref)
+    np.testing.assert_array_equal(xnod_from_msh(archivo), xnod[:, :2])
+    np.testing.assert_array_equal(LaG_from_msh(archivo), LaG_ref)
+    assert leer_msh(archivo, coordenadas=False)[0] is None
+    assert leer_msh(archivo, elementos=False)[1] is None
+
+    nombres, nodos = grupos_fisicos(archivo)
+    assert nombres == {1: (2, 'placa'), 2: (1, 'borde'), 3: (0, 'esquina')}
+    assert nodos.keys() == nodos_ref.keys()
+    for tag in nodos:
+        np.testing.assert_array_equal(nodos[tag], nodos_ref[tag])
+    assert grupos_fisicos(archivo, dim=1)[0] == {2: (1, 'borde')}
+
+
+@pytest.mark.parametrize('binario', [False, True])
+def test_varios_tipos_de_EF(tmp_path, binario):
+    archivo = tmp_path/'malla.msh'
+    crear_malla(archivo, binario, recombinar=[2])
+    with pytest.raises(ValueError, match='varios tipos'):
+        leer_msh(archivo)
+
+
+def test_formato_no_soportado(tmp_path):
+    archivo = tmp_path/'malla.msh'
+    archivo.write_text('$MeshFormat\n2.2 0 8\n$EndMeshFormat\n')
+    with pytest.raises(ValueError, match='4.1'):
+        leer_msh(archivo)
+
+
+@pytest.mark.parametrize('seccion', [b'$Entities', b'$Nodes', b'$Elements'])
+def test_binario_truncado(tmp_path, seccion):
+    archivo = tmp_path/'malla.msh'
+    crear_malla(archivo, binario=True)
+    datos = archivo.read_bytes()
+    archivo.write_bytes(datos[:datos.index(seccion) + 100])
+
+    # ValueError, y no un BufferError al cerrar el mmap
+    with pytest.raises(ValueError, match='truncado'):
+        leer_msh(archivo)
+    with pytest.raises(ValueError, match='truncado'):
+        grupos_fisicos(archivo)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Índice topológico (aristas, vecinos e incidencia nodo -> EF) de una malla de
+EF, a partir de su matriz LaG.
+
+Lo usan leer_GMSH.py (Mesh.topologia), Mallas_python/leer_GMSH.py y
+Axisimetrico/cargas.py.
+
+Este archivo está copiado, sin cambios, en Axisimetrico/ y Mallas_python/,
+para que cada carpeta funcione por sí sola; los cambios se hacen en la copia
+de la carpeta raíz y se copian a las demás.
+"""
+
+import numpy as np
+
+# Lados de cada tipo de EF (según su número de nodos), con la numeración local
+# de GMSH; cada lado se recorre de una esquina a la siguiente
+LADOS_EF = {3:  [[0, 1], [1, 2], [2, 0]],
+            4:  [[0, 1], [1, 2], [2, 3], [3, 0]],
+            6:  [[0, 3, 1], [1, 4, 2], [2, 5, 0]],
+            8:  [[0, 4, 1], [1, 5, 2], [2, 6, 3], [3, 7, 0]],
+            9:  [[0, 4, 1], [1, 5, 2], [2, 6, 3], [3, 7, 0]],
+            10: [[0, 3, 4, 1], [1, 5, 6, 2], [2, 7, 8, 0]]}
+
+
+class Topologia:
+    ''' Índice topológico de una malla de EF, construido una sola vez a partir
+        de LaG.
+
+        Cada arista (lado de un EF) se identifica con la clave
+        min(n1, n2)*nno + max(n1, n2), donde n1 y n2 son sus nodos esquina. Las
+        claves se guardan ordenadas, de modo que ubicar cualquier cantidad de
+        aristas es una sola búsqueda binaria vectorizada (np.searchsorted), en
+        lugar de recorrer todos los EF.
+
+        Argumentos:
+        - LaG: array (nef, nno_ef). Matriz de interconexión nodal (desde 0).
+        - lados: array (nlados, nno_lado). Nodos locales de cada lado del EF,
+                 según el orden de las columnas de LaG. Por defecto se usa
+                 LADOS_EF (numeración de GMSH).
+
+        Atributos:
+        - clave: array (nar,). Claves ordenadas de las aristas de la malla.
+        - nodos_arista: array (nar, nno_lado). Nodos de cada arista, en el
+                        sentido en que la recorre el primer EF que la contiene.
+        - ef_arista, lado_arista: arrays (nar, 2). EF que comparten cada
+                        arista y lado del EF al que corresponde (-1 en la
+                        segunda columna si la arista es de frontera).
+        - arista_ef: array (nef, nlados). Arista de cada lado de cada EF.
+        - vecinos: array (nef, nlados). EF vecino por cada lado (-1 si el lado
+                   está en la frontera).
+        - ptr_ef_nodo, ef_nodo: incidencia nodo -> EF en formato CSR; los EF
+                   que contienen al nodo i son
+                   ef_nodo[ptr_ef_nodo[i]:ptr_ef_nodo[i+1]].
+    '''
+
+    def __init__(self, LaG, lados=None):
+        if lados is None:
+            lados = LADOS_EF[LaG.shape[1]]
+        self.lados = lados = np.asarray(lados)
+        nef, nlados = LaG.shape[0], lados.shape[0]
+        self.nno = nno = int(LaG.max()) + 1
+
+        # Nodos de todos los lados de todos los EF y clave de cada uno
+        nodos_lado = LaG[:, lados].reshape((nef*nlados, -1))
+        clave = self._claves(nodos_lado[:, 0], nodos_lado[:, -1])
+        self.clave, primero, inv, veces = np.unique(clave, return_index=True,
+                                                    return_inverse=True,
+                                                    return_counts=True)
+        if np.any(veces > 2):
+            raise ValueError('Hay aristas compartidas por más de dos EF')
+        inv = inv.ravel()
+        self.nodos_arista = nodos_lado[primero]
+        self.arista_ef = inv.reshape((nef, nlados))
+
+        # EF y lado que comparten cada arista: los lados se agrupan por arista
+        # y de cada grupo se toma el primero y, si lo hay, el segundo
+        orden = np.argsort(inv, kind='stable')
+        inicio = np.r_[0, np.cumsum(veces)[:-1]]
+        lado_global = np.full((self.clave.size, 2), -1, dtype=np.int64)
+        lado_global[:, 0] = orden[inicio]
+        compartida = veces == 2
+        lado_global[compartida, 1] = orden[inicio[compartida] + 1]
+        existe = lado_global >= 0
+        self.ef_arista = np.where(existe, lado_global // nlados, -1)
+        self.lado_arista = np.where(existe, lado_global % nlados, -1)
+
+        # EF vecino por cada lado: el otro EF de la arista respectiva
+        ef_lado = self.ef_arista[self.arista_ef]
+        propio = np.arange(nef)[:, None]
+        self.vecinos = np.where(ef_lado[..., 0] == propio,
+                                ef_lado[..., 1], ef_lado[..., 0])
+
+        # Incidencia nodo -> EF (formato CSR)
+        nodos = LaG.ravel()
+        self.ef_nodo = np.argsort(nodos, kind='stable') // LaG.shape[1]
+        self.ptr_ef_nodo = np.r_[0, np.cumsum(np.bincount(nodos,
+                                                          minlength=nno))]
+
+    def _claves(self, n1, n2):
+        return np.minimum(n1, n2).astype(np.int64)*self.nno \
+               + np.maximum(n1, n2)
+
+    @property
+    def aristas_frontera(self):
+        ''' Aristas que pertenecen a un solo EF. '''
+        return np.flatnonzero(self.ef_arista[:, 1] == -1)
+
+    def buscar_aristas(self, n1, n2):
+        ''' Retorna el número de las aristas cuyos nodos esquina son n1 y n2
+            (en cualquier orden), o -1 si no existen.
+        '''
+        clave = self._claves(np.asarray(n1), np.asarray(n2))
+        pos = np.searchsorted(self.clave, clave)
+        pos = np.minimum(pos, self.clave.size - 1)
+        return np.where(self.clave[pos] == clave, pos, -1)
+
+    def lados_frontera(self, nodos=None):
+        ''' Retorna (e, lado): EF y lado de cada arista de la frontera. Si se
+            dan "nodos", solo se retornan las aristas cuyos nodos están todos
+            entre ellos (por ejemplo, los nodos de un grupo físico).
+        '''
+        aristas = self.aristas_frontera
+        if nodos is not None:
+            nodos = np.asarray(nodos)
+            dentro = np.zeros(self.nno, dtype=bool)
+            dentro[nodos[nodos < self.nno]] = True
+            aristas = aristas[dentro[self.nodos_arista[aristas]].all(axis=1)]
+        return self.ef_arista[aristas, 0], self.lado_arista[aristas, 0]
+
+    def elementos_nodo(self, i):
+        ''' EF que contienen al nodo i. '''
+        return self.ef_nodo[self.ptr_ef_nodo[i]:self.ptr_ef_nodo[i+1]]
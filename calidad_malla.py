@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Indicadores de calidad de una malla de EF, calculados para todos los EF a la
+vez a partir de xnod y LaG (numeración de GMSH, como en medidas_malla.py).
+
+Para cada EF se calculan:
+- 'jacobiano_escalado': mínimo, en las esquinas, del seno del ángulo entre
+  los dos lados que llegan a cada esquina (con signo, según la normal del EF);
+  en los triángulos se multiplica por 2/sqrt(3), de modo que el cuadrado y el
+  triángulo equilátero valen 1. Un valor <= 0 indica un EF invertido o no
+  convexo.
+- 'razon_jacobiano': det(J) mínimo / |det(J)| máximo, evaluados en los nodos
+  y en los puntos de Gauss; mide la distorsión de los EF de lados curvos. Un
+  valor <= 0 indica que det(J) se anula dentro del EF.
+- 'relacion_aspecto': lado más largo / lado más corto (esquinas).
+- 'sesgo': sesgo equiangular, max((t_max - t_e)/(180 - t_e), (t_e - t_min)/t_e),
+  con t_e = 60° en triángulos y 90° en cuadriláteros (0 = EF ideal, 1 = EF
+  degenerado).
+- 'alabeo': en grados, ángulo máximo entre las normales de los dos triángulos
+  en que se divide el cuadrilátero por cada diagonal (EF shell, como los de
+  scordelis.msh); es 0 en triángulos y en mallas planas.
+
+En los EF planos (xnod de dos columnas o con z constante) la normal de
+referencia es +z, así que los EF numerados en sentido horario aparecen como
+invertidos.
+
+Las mallas grandes se dividen en bloques que se reparten entre varios
+procesos; xnod y LaG se leen desde memoria compartida (ver
+memoria_compartida.py), así que a cada tarea solo se le envía el rango de EF
+que debe evaluar.
+
+NOTA: en los sistemas que no tienen "fork" (por ejemplo Windows), la llamada
+a calidad_malla() con varios procesos debe quedar dentro de un bloque
+if __name__ == '__main__':
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from medidas_malla import TIPOS_EF, XI_Q, ETA_Q, cuadratura_gauss
+from memoria_compartida import mapa_compartido
+
+# coordenadas naturales de los nodos de los triángulos (numeración GMSH)
+XI_T  = np.array([0, 1, 0, 0.5, 0.5, 0  ])
+ETA_T = np.array([0, 0, 1, 0,   0.5, 0.5])
+
+# indicadores: (descripción, True si los valores pequeños son los peores)
+METRICAS = {'jacobiano_escalado': ('Jacobiano escalado mínimo',  True ),
+            'razon_jacobiano':    ('det(J) mín / |det(J)| máx',  True ),
+            'relacion_aspecto':   ('Relación de aspecto',         False),
+            'sesgo':              ('Sesgo equiangular',           False),
+            'alabeo':             ('Alabeo [°]',                  False)}
+
+
+# %% Cálculo de los indicadores:
+
+def _unitario(v):
+    ''' Normaliza los vectores de la última dimensión (los nulos quedan 0). '''
+    norma = np.linalg.norm(v, axis=-1, keepdims=True)
+    return np.divide(v, norma, out=np.zeros_like(v), where=norma > 0)
+
+
+def _angulo(u, v):
+    ''' Ángulo en grados entre los vectores u y v (última dimensión). '''
+    cos = np.einsum('...k,...k->...', _unitario(u), _unitario(v))
+    return np.degrees(np.arccos(np.clip(cos, -1, 1)))
+
+
+def _calidad_bloque(xnod, LaG, plano):
+    ''' Indicadores de calidad de los EF de LaG (ver calidad_malla). '''
+    nno_ef = LaG.shape[1]
+    forma, triangulo, nesq, n_gl = TIPOS_EF[nno_ef]
+
+    xe = xnod[LaG]                                      # (nef, nno_ef, dim)
+    if xe.shape[2] == 2:
+        xe = np.concatenate((xe, np.zeros(xe.shape[:2] + (1,))), axis=2)
+    esq = xe[:, :nesq]
+
+    # normal de referencia de cada EF
+    if plano:
+        n = np.broadcast_to([0., 0., 1.], (xe.shape[0], 3))
+    elif triangulo:
+        n = _unitario(np.cross(esq[:, 1] - esq[:, 0], esq[:, 2] - esq[:, 0]))
+    else:
+        n = _unitario(np.cross(esq[:, 2] - esq[:, 0], esq[:, 3] - esq[:, 1]))
+
+    # lados que salen de cada esquina hacia la siguiente y hacia la anterior
+    sig = np.roll(esq, -1, axis=1) - esq
+    ant = np.roll(esq,  1, axis=1) - esq
+    l_sig = np.linalg.norm(sig, axis=2)
+    l_ant = np.linalg.norm(ant, axis=2)
+
+    # jacobiano escalado en las esquinas
+    seno = np.einsum('eik,ek->ei', np.cross(sig, ant), n)
+    seno = np.divide(seno, l_sig*l_ant, out=np.zeros_like(seno),
+                     where=l_sig*l_ant > 0)
+    jac_escalado = seno.min(axis=1)*(2/np.sqrt(3) if triangulo else 1)
+
+    # det(J) en los nodos y en los puntos de Gauss
+    xi_g, eta_g, _ = cuadratura_gauss(triangulo, n_gl)
+    xi_n, eta_n = (XI_T, ETA_T) if triangulo else (XI_Q, ETA_Q)
+    _, dN_dxi, dN_deta = forma(np.r_[xi_n[:nno_ef], xi_g],
+                               np.r_[eta_n[:nno_ef], eta_g])
+    x_xi  = np.einsum('gi,eik->egk', dN_dxi,  xe)
+    x_eta = np.einsum('gi,eik->egk', dN_deta, xe)
+    det_J = np.einsum('egk,ek->eg', np.cross(x_xi, x_eta), n)
+    det_max = np.abs(det_J).max(axis=1)
+    razon_jac = np.divide(det_J.min(axis=1), det_max,
+                          out=np.zeros_like(det_max), where=det_max > 0)
+
+    # relación de aspecto
+    aspecto = np.divide(l_sig.max(axis=1), l_sig.min(axis=1),
+                        out=np.full(len(xe), np.inf), where=l_sig.min(axis=1) > 0)
+
+    # sesgo equiangular
+    theta = _angulo(sig, ant)
+    theta_e = 60 if triangulo else 90
+    sesgo = np.maximum((theta.max(axis=1) - theta_e)/(180 - theta_e),
+                       (theta_e - theta.min(axis=1))/theta_e)
+
+    # alabeo: ángulo entre las normales de los triángulos de cada diagonal
+    if triangulo or plano:
+        alabeo = np.zeros(len(xe))
+    else:
+        p0, p1, p2, p3 = esq.transpose(1, 0, 2)
+        alabeo = np.maximum(
+            _angulo(np.cross(p1 - p0, p2 - p0), np.cross(p2 - p0, p3 - p0)),
+            _angulo(np.cross(p2 - p1, p3 - p1), np.cross(p3 - p1, p0 - p1)))
+
+    return {'jacobiano_escalado': jac_escalado, 'razon_jacobiano': razon_jac,
+            'relacion_aspecto': aspecto, 'sesgo': sesgo, 'alabeo': alabeo}
+
+
+def _evaluar(trabajador, bloque):
+    ini, fin, plano = bloque
+    return _calidad_bloque(trabajador['xnod'], trabajador['LaG'][ini:fin],
+                           plano)
+
+
+def calidad_malla(xnod, LaG, procesos=None, tam_bloque=100000):
+    ''' Calcula los indicadores de calidad de todos los EF de la malla.
+
+        Argumentos:
+        - xnod: array (nno, 2) o (nno, 3). Coordenadas nodales.
+        - LaG: array (nef, nno_ef). Nodos de cada EF (numeración de GMSH),
+               con nno_ef = 3 (T3), 6 (T6), 4 (Q4), 8 (Q8) o 9 (Q9).
+        - procesos: número de procesos; por defecto, uno por núcleo. Si la
+                    malla cabe en un solo bloque (o procesos=1), el cálculo se
+                    hace en el proceso actual.
+        - tam_bloque: número de EF de cada bloque (tarea).
+
+        Retorna un diccionario {indicador: array (nef,)} con los indicadores
+        de METRICAS (ver la descripción del módulo).
+    '''
+    if LaG.shape[1] not in TIPOS_EF:
+        raise ValueError(f'No se soportan EF de {LaG.shape[1]} nodos')
+    plano = xnod.shape[1] == 2 or np.ptp(xnod[:, 2]) == 0
+
+    nef = LaG.shape[0]
+    bloques = [(ini, min(ini + tam_bloque, nef))
+               for ini in range(0, nef, tam_bloque)]
+    if procesos == 1 or len(bloques) <= 1:
+        return _calidad_bloque(xnod, LaG, plano)
+
+    resultados = mapa_compartido(_evaluar,
+                                 [(ini, fin, plano) for ini, fin in bloques],
+                                 {'xnod': xnod, 'LaG': LaG},
+                                 procesos=procesos)
+
+    return {metrica: np.concatenate([r[metrica] for r in resultados])
+            for metrica in METRICAS}
+
+
+# %% Resumen y gráficos:
+
+def _histograma(valores, nbins):
+    ''' np.histogram de los valores finitos; si todos son (casi) iguales, el
+        rango se amplía para que los intervalos no resulten de tamaño nulo.
+    '''
+    finitos = valores[np.isfinite(valores)]
+    rango = None
+    if finitos.size and np.isclose(finitos.min(), finitos.max()):
+        rango = (finitos.min() - 0.5, finitos.max() + 0.5)
+    return np.histogram(finitos, bins=nbins, range=rango)
+
+
+def peores_elementos(calidad, metrica, n=10):
+    ''' Índices de los n EF con el peor valor del indicador dado, ordenados
+        del peor al mejor.
+    '''
+    valores = calidad[metrica]
+    if METRICAS[metrica][1]:
+        valores = -valores     # en este indicador, el peor es el menor
+    n = min(n, len(valores))
+    if n == 0:
+        return np.empty(0, dtype=int)
+    idx = np.argpartition(-valores, n - 1)[:n]
+    return idx[np.argsort(-valores[idx], kind='stable')]
+
+
+def resumen_calidad(calidad, nbins=20, n_peores=10):
+    ''' Estadísticas de cada indicador de calidad.
+
+        Retorna un diccionario {indicador: dict} con:
+        - 'min', 'max', 'media': valores extremos y promedio (finitos).
+        - 'histograma': (conteos, bordes), como los retorna np.histogram.
+        - 'peores': índices de los n_peores EF, del peor al mejor.
+    '''
+    resumen = {}
+    for metrica, valores in calidad.items():
+        finitos = valores[np.isfinite(valores)]
+        resumen[metrica] = {
+            'min':   finitos.min()  if finitos.size else np.nan,
+            'max':   finitos.max()  if finitos.size else np.nan,
+            'media': finitos.mean() if finitos.size else np.nan,
+            'histograma': _histograma(valores, nbins),
+            'peores': peores_elementos(calidad, metrica, n_peores)}
+    return resumen
+
+
+def plot_calidad(calidad, nbins=20):
+    ''' Grafica los histogramas de los indicadores de calidad. '''
+    fig, axs = plt.subplots(2, 3, figsize=(15, 9))
+    for ax, (metrica, valores) in zip(axs.ravel(), calidad.items()):
+        conteos, bordes = _histograma(valores, nbins)
+        ax.stairs(conteos, bordes, fill=True, color='tab:blue')
+        ax.set_title(METRICAS[metrica][0])
+        ax.set_ylabel('Número de EF')
+        if conteos.sum() < valores.size:
+            ax.set_xlabel(f'({valores.size - conteos.sum()} EF degenerados '
+                          'no se muestran)')
+    for ax in axs.ravel()[len(calidad):]:
+        ax.set_visible(False)
+    nef = len(next(iter(calidad.values())))
+    fig.suptitle(f'Calidad de la malla ({nef} EF)', fontsize='x-large')
+    fig.tight_layout()
+    plt.show()
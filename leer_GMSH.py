@@ -5,177 +5,434 @@ Funciones para leer y graficar una malla creada en GMSH.
 Por: Alejandro Hincapié G.
 """
 
+import hashlib
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping
+
 import gmsh  # pip install --upgrade gmsh
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-from matplotlib.colors import BASE_COLORS, TABLEAU_COLORS
+
+# La topología y los gráficos de la malla se comparten con
+# Mallas_python/leer_GMSH.py
+from topologia_malla import LADOS_EF, Topologia
+from graficos_malla import (TIPO_EF, CONTORNO_EF, MAX_ETIQUETAS,
+                            graficar_malla, vista_previa_malla)
 
 # %% Funciones:
 
-def xnod_from_msh(archivo, dim=2):
+class Mesh:
+    ''' Malla de EF leída a partir del archivo .msh exportado por GMSH.
+
+        El archivo se abre una sola vez con la API de GMSH y de él se extraen
+        todos los datos que requiere el análisis, de modo que no sea necesario
+        volver a leerlo en cada consulta.
+
+        Atributos:
+        - archivo: str. Nombre del archivo .msh leído.
+        - xnod: array (nno, 3). Coordenadas nodales, fila = número del nodo-1.
+                Si las etiquetas de los nodos en GMSH no son consecutivas,
+                los nodos se renumeran 1, 2, ..., nno en el orden de sus
+                etiquetas; LaG y nodos_grupo usan esa numeración.
+        - LaG: array (nef, nno_ef). Matriz de interconexión nodal (desde 0).
+        - mat: array (nef,). Superficie a la que pertenece cada EF (desde 0).
+        - superficies: array (nmat,). Etiqueta en GMSH de la superficie que
+                       corresponde a cada valor de mat.
+        - grupos: dict {tag: (dim, nombre)} de los grupos físicos.
+        - nodos_grupo: diccionario {tag: nodos} con los nodos (desde 1, con
+                       la numeración de xnod) asociados a cada grupo físico.
+                       Los nodos de cada grupo se extraen la primera vez que
+                       se piden (ver NodosGrupo).
+        - entidades_grupo: dict {tag: entidades} con las etiquetas de las
+                       entidades geométricas (puntos, curvas o superficies)
+                       de cada grupo físico.
+        - nodos_entidad: dict {(dim, tag): nodos} con los nodos (desde 1,
+                       con repetidos) de los EF de cada punto o curva que
+                       pertenece a algún grupo físico.
+
+        El índice topológico (aristas, vecinos, frontera) se obtiene con el
+        método topologia().
+
+        Si cache=True (o el nombre de un directorio), los datos leídos se
+        guardan en una caché en disco, de tal forma que las siguientes veces
+        que se lea el mismo archivo (mismo contenido y fecha de modificación)
+        se carguen de allí sin usar GMSH. En ese caso los arreglos son de solo
+        lectura, ya que se mapean en memoria desde la caché.
+    '''
+
+    def __init__(self, archivo, cache=False):
+        self.archivo = archivo
+        self._topologias = {}
+
+        dir_cache = _dir_cache(cache)
+        if dir_cache is not None:
+            clave = _clave_cache(archivo)
+            if _leer_cache(self, dir_cache, clave):
+                return
+
+        gmsh.initialize()
+        try:
+            gmsh.open(archivo)
+            self._leer_nodos()
+            self._leer_elementos()
+            self._leer_grupos_fisicos()
+        finally:
+            gmsh.finalize()
+
+        if dir_cache is not None:
+            _guardar_cache(self, dir_cache, clave)
+
+    def _leer_nodos(self):
+        nod, xnod, pxnod = gmsh.model.mesh.getNodes()
+        xnod = xnod.reshape((nod.size, -1))
+        nod = nod.astype(np.int64)
+
+        # Los nodos se ordenan según su etiqueta (GMSH no garantiza que los
+        # reporte en orden) y se construye el vector índice que asocia cada
+        # etiqueta con su fila en xnod; así, si las etiquetas no son
+        # consecutivas, no quedan filas de nodos inexistentes
+        orden = np.argsort(nod, kind='stable')
+        self.xnod = xnod[orden]
+        self._fila_nodo = np.full(int(nod.max(initial=0)) + 1, -1,
+                                  dtype=np.int64)
+        self._fila_nodo[nod[orden]] = np.arange(nod.size)
+
+    def _leer_elementos(self):
+        # Se piden a GMSH los bloques de EF de cada superficie; cada bloque
+        # se conserva tal cual (sin copiarlo) hasta conocer el tamaño total
+        bloques, superficies = [], []
+        for dim, tag in gmsh.model.getEntities(2):
+            tipos, efs, nodos = gmsh.model.mesh.getElements(dim, tag)
+            if tipos.size == 0:
+                continue  # Superficie sin EF
+            if tipos.size > 1 or (bloques and tipos[0] != bloques[0][0]):
+                raise ValueError('La malla tiene varios tipos de elementos '
+                                 'finitos 2D.')
+            bloques.append((tipos[0], efs[0].size, nodos[0]))
+            superficies.append(tag)
+
+        nef = sum(b[1] for b in bloques)
+        nno_ef = bloques[0][2].size // bloques[0][1] if bloques else 0
+
+        # Se reserva la memoria una sola vez y cada bloque se copia en su
+        # tajada correspondiente, sin pasar por arreglos de tipo float
+        LaG = np.empty((nef, nno_ef), dtype=np.int64) # Matriz de interconexión
+        mat = np.empty(nef, dtype=np.int32) # Material al que pertenece cada EF
+        fila = 0
+        for material, (tipo, nef_bloque, nodos) in enumerate(bloques):
+            LaG[fila:fila+nef_bloque] = \
+                self._fila_nodo[nodos.reshape((nef_bloque, nno_ef))]
+            mat[fila:fila+nef_bloque] = material
+            fila += nef_bloque
+
+        self.LaG = LaG
+        self.mat = mat
+        self.superficies = np.array(superficies, dtype=np.int64)
+
+    def _leer_grupos_fisicos(self):
+        # Solo se leen las entidades de cada grupo; los nodos de los grupos de
+        # superficies se obtienen luego de LaG, y los de los puntos y curvas
+        # de la conectividad de sus EF, que se guarda una vez por entidad
+        self.grupos = {}
+        self.entidades_grupo = {}
+        self.nodos_entidad = {}
+        for dim, tag in gmsh.model.getPhysicalGroups():
+            self.grupos[tag] = (dim, gmsh.model.getPhysicalName(dim, tag))
+            self.entidades_grupo[tag] = np.asarray(
+                gmsh.model.getEntitiesForPhysicalGroup(dim, tag), dtype=np.int64)
+            if dim == 2:
+                continue
+            for entidad in self.entidades_grupo[tag].tolist():
+                if (dim, entidad) not in self.nodos_entidad:
+                    tipos, efs, nodos = gmsh.model.mesh.getElements(dim, entidad)
+                    self.nodos_entidad[(dim, entidad)] = self._fila_nodo[
+                        np.concatenate([np.asarray(n, dtype=np.int64)
+                                        for n in nodos]
+                                       + [np.empty(0, dtype=np.int64)])] + 1
+        self.nodos_grupo = NodosGrupo(self)
+
+    @property
+    def LaG_mat(self):
+        ''' Matriz LaG con el material de cada EF en la primera columna. '''
+        return np.c_[self.mat, self.LaG]
+
+    def grupos_fisicos(self, dim=-1):
+        ''' Retorna los grupos físicos de la malla en el mismo formato de la
+            función grupos_fisicos() de obtener_grupos_fisicos.py. Si se
+            especifica dim, solo se reportan los grupos de tal dimensión.
+        '''
+        tags = [tag for tag, (d, nombre) in self.grupos.items()
+                if dim == -1 or d == dim]
+        dict1 = {tag: self.grupos[tag] for tag in tags}
+        dict2 = {tag: self.nodos_grupo[tag] for tag in tags}
+
+        return dict1, dict2
+
+    def topologia(self, lados=None):
+        ''' Índice topológico de la malla (ver Topologia). Se construye la
+            primera vez que se pide y se reutiliza en las siguientes.
+        '''
+        clave = None if lados is None else tuple(map(tuple, lados))
+        if clave not in self._topologias:
+            self._topologias[clave] = Topologia(self.LaG, lados)
+        return self._topologias[clave]
+
+
+class NodosGrupo(Mapping):
+    ''' Diccionario {tag: nodos} de los grupos físicos de una malla (Mesh)
+        cuyos nodos se extraen la primera vez que se pide cada grupo: los de
+        un grupo de superficies son los de sus EF en LaG, y los de un grupo
+        de puntos o curvas, los de los EF de sus entidades. Los nodos se
+        retornan desde 1 (con la numeración de xnod, que es la de GMSH si sus
+        etiquetas son consecutivas), ordenados y sin repetidos.
+    '''
+
+    def __init__(self, malla):
+        self.malla = malla
+        self._nodos = {}
+
+    def __getitem__(self, tag):
+        if tag not in self._nodos:
+            malla = self.malla
+            dim = malla.grupos[tag][0]
+            entidades = malla.entidades_grupo[tag]
+            if dim == 2:
+                mats = np.flatnonzero(np.isin(malla.superficies, entidades))
+                nodos = np.unique(malla.LaG[np.isin(malla.mat, mats)]) + 1
+            else:
+                nodos = np.unique(np.concatenate(
+                    [malla.nodos_entidad[(dim, e)] for e in entidades.tolist()]
+                    + [np.empty(0, dtype=np.int64)]))
+            nodos.setflags(write=False)
+            self._nodos[tag] = nodos
+        return self._nodos[tag]
+
+    def __iter__(self):
+        return iter(self.malla.grupos)
+
+    def __len__(self):
+        return len(self.malla.grupos)
+
+
+# %% Caché en disco de las mallas leídas:
+
+# Directorio por defecto de la caché y tamaño máximo que puede ocupar [bytes]
+DIR_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'leer_GMSH')
+TAMANO_MAX_CACHE = 2*1024**3
+
+# Versión del formato de las entradas de la caché; se incrementa cada vez que
+# cambian los arreglos que se guardan, para que las entradas de versiones
+# anteriores no se lean (depurar_cache las elimina como a las demás, por
+# antigüedad)
+VERSION_CACHE = 4
+
+
+def _dir_cache(cache):
+    ''' Retorna el directorio de la caché según el argumento "cache" (False,
+        True o el nombre de un directorio), o None si no se usa caché.
+    '''
+    if cache is False or cache is None:
+        return None
+    return DIR_CACHE if cache is True else cache
+
+
+def _clave_cache(archivo):
+    ''' Clave de la malla en la caché: hash del contenido del archivo más su
+        fecha de modificación y la versión del formato de la caché.
+    '''
+    h = hashlib.sha1()
+    with open(archivo, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloque)
+    return (f'{h.hexdigest()}_{os.stat(archivo).st_mtime_ns}'
+            f'_v{VERSION_CACHE}')
+
+
+def _leer_cache(malla, dir_cache, clave):
+    ''' Carga en el objeto "malla" los datos guardados en la caché. Los arre-
+        glos se mapean en memoria (solo lectura). Retorna False si la malla
+        no está en la caché.
+    '''
+    dir_malla = os.path.join(dir_cache, clave)
+    if not os.path.isdir(dir_malla):
+        return False
+
+    cargar = lambda nombre: np.load(os.path.join(dir_malla, nombre + '.npy'),
+                                    mmap_mode='r')
+    malla.xnod = cargar('xnod')
+    malla.LaG = cargar('LaG')
+    malla.mat = cargar('mat')
+    malla.superficies = cargar('superficies')
+
+    tags = cargar('grupos_tag')
+    dims = cargar('grupos_dim')
+    nombres = cargar('grupos_nombre')
+    entidades = cargar('grupos_entidades')
+    inicio_ent = cargar('grupos_inicio_entidades')
+    malla.grupos = {}
+    malla.entidades_grupo = {}
+    for i, tag in enumerate(tags.tolist()):
+        malla.grupos[tag] = (int(dims[i]), str(nombres[i]))
+        malla.entidades_grupo[tag] = entidades[inicio_ent[i]:inicio_ent[i+1]]
+
+    claves = cargar('entidades_clave')
+    nodos = cargar('entidades_nodos')
+    inicio = cargar('entidades_inicio')
+    malla.nodos_entidad = {(int(d), int(e)): nodos[inicio[i]:inicio[i+1]]
+                           for i, (d, e) in enumerate(claves)}
+    malla.nodos_grupo = NodosGrupo(malla)
+
+    # Se marca la entrada como usada recientemente (política LRU)
+    os.utime(dir_malla)
+    return True
+
+
+def _guardar_cache(malla, dir_cache, clave):
+    ''' Guarda los datos de la malla en la caché como un directorio de
+        archivos .npy y luego depura la caché para que no supere su tamaño
+        máximo.
+    '''
+    os.makedirs(dir_cache, exist_ok=True)
+
+    # Se escribe en un directorio temporal que luego se renombra, para que
+    # nunca se lea una entrada escrita a medias
+    dir_tmp = tempfile.mkdtemp(dir=dir_cache, prefix='.tmp_')
+    guardar = lambda nombre, arr: np.save(os.path.join(dir_tmp, nombre), arr)
+    guardar('xnod', malla.xnod)
+    guardar('LaG', malla.LaG)
+    guardar('mat', malla.mat)
+    guardar('superficies', malla.superficies)
+
+    tags = list(malla.grupos.keys())
+    guardar('grupos_tag', np.array(tags, dtype=np.int64))
+    guardar('grupos_dim', np.array([malla.grupos[t][0] for t in tags],
+                                   dtype=np.int32))
+    guardar('grupos_nombre', np.array([malla.grupos[t][1] for t in tags],
+                                      dtype=str))
+    claves = list(malla.nodos_entidad.keys())
+    nodos = [malla.nodos_entidad[c] for c in claves]
+    guardar('entidades_clave', np.array(claves, dtype=np.int64).reshape((-1, 2)))
+    guardar('entidades_nodos', np.concatenate(nodos) if nodos
+                               else np.array([], dtype=np.int64))
+    guardar('entidades_inicio', np.r_[0, np.cumsum([n.size for n in nodos],
+                                                   dtype=np.int64)])
+    entidades = [malla.entidades_grupo[tag] for tag in tags]
+    guardar('grupos_entidades', np.concatenate(entidades) if entidades
+                                else np.array([], dtype=np.int64))
+    guardar('grupos_inicio_entidades',
+            np.r_[0, np.cumsum([e.size for e in entidades], dtype=np.int64)])
+    try:
+        os.rename(dir_tmp, os.path.join(dir_cache, clave))
+    except OSError:
+        # Otro proceso guardó la misma malla primero
+        shutil.rmtree(dir_tmp, ignore_errors=True)
+
+    depurar_cache(dir_cache, conservar=clave)
+
+
+def depurar_cache(dir_cache=DIR_CACHE, tamano_max=None, conservar=None):
+    ''' Elimina de la caché las mallas usadas hace más tiempo hasta que el
+        tamaño total de la caché no supere tamano_max [bytes] (por defecto,
+        TAMANO_MAX_CACHE). La entrada "conservar" nunca se elimina.
+    '''
+    if tamano_max is None:
+        tamano_max = TAMANO_MAX_CACHE
+
+    entradas = []
+    for clave in os.listdir(dir_cache):
+        dir_malla = os.path.join(dir_cache, clave)
+        if clave.startswith('.') or not os.path.isdir(dir_malla):
+            continue
+        tamano = sum(os.path.getsize(os.path.join(dir_malla, a))
+                     for a in os.listdir(dir_malla))
+        entradas.append((os.path.getmtime(dir_malla), tamano, clave))
+
+    total = sum(e[1] for e in entradas)
+    for fecha, tamano, clave in sorted(entradas):
+        if total <= tamano_max:
+            break
+        if clave != conservar:
+            shutil.rmtree(os.path.join(dir_cache, clave), ignore_errors=True)
+            total -= tamano
+
+
+def cargar_malla(archivo, cache=False):
+    ''' Retorna un objeto Mesh. El argumento "archivo" puede ser el nombre
+        del archivo .msh o una malla (Mesh) ya leída, en cuyo caso no se
+        vuelve a leer el archivo. Ver Mesh para el argumento "cache".
+    '''
+    if isinstance(archivo, Mesh):
+        return archivo
+    return Mesh(archivo, cache)
+
+
+def xnod_from_msh(archivo, dim=2, cache=False):
     ''' Obtiene la matriz de coordenadas de los nodos que contiene la malla de
         EF a trabajar, a partir del archivo .msh exportado por el programa GMSH.
+        "archivo" puede ser también un objeto Mesh ya leído. Con cache=True
+        los datos se guardan/cargan desde la caché en disco (ver Mesh).
     '''
-    gmsh.initialize()
-    gmsh.open(archivo)
-    nod, xnod, pxnod = gmsh.model.mesh.getNodes()
-    xnod = xnod.reshape((nod.size, -1))
-    gmsh.finalize()
-
-    return xnod[:, :dim]
+    return cargar_malla(archivo, cache).xnod[:, :dim]
 
 
-def LaG_from_msh(archivo):
+def LaG_from_msh(archivo, cache=False):
     ''' Obtiene la matriz de interconexión nodal (LaG) que contiene la malla de
         EF a trabajar, a partir del archivo .msh exportado por el programa GMSH.
+        "archivo" puede ser también un objeto Mesh ya leído. Con cache=True
+        los datos se guardan/cargan desde la caché en disco (ver Mesh).
         
         Retorna: Matriz LaG_mat, donde la primera columna representa la super-
         ficie a la que pertenece cada elemento finito (ordenadas de forma
         ascendente desde 0), de tal manera que diferencie elementos finitos con
         propiedades distintas
     '''
-    gmsh.initialize()
-    gmsh.open(archivo)
-
-    LaG   = np.array([]) # Matriz de interconexión nodal
-    elems = np.array([]) # vector de elementos finitos
-    mats  = np.array([]) # Vector de materiales al que pertenece cada EF
-    material = 0  # Se inicializa el material
-
-    for ent in gmsh.model.getEntities(2):
-        dim, tag = ent
-        tipo, efs, nodos = gmsh.model.mesh.getElements(dim, tag)
-        if tipo.size == 1:
-            nodos = nodos[0]
-            elems = np.append(elems, efs[0]).astype(int)
-            LaG = np.append(LaG, nodos).astype(int)
-            mats = np.append(mats, np.tile(material, efs[0].size)).astype(int)
-            material += 1
-        else:
-            raise ValueError('La malla tiene varios tipos de elementos '
-                             'finitos 2D.')
-
-    nef = elems.size
-    LaG = LaG.reshape((nef, -1)) - 1
-    LaG_mat = np.c_[mats, LaG]
-    gmsh.finalize()
-
-    return LaG_mat
+    return cargar_malla(archivo, cache).LaG_mat
 
 
 def plot_msh(file, tipo, mostrar_nodos=False, mostrar_num_nodo=False, 
-             mostrar_num_elem=False):
+             mostrar_num_elem=False, max_etiquetas=MAX_ETIQUETAS):
     ''' Función para graficar la malla contenida en el archivo "file".
         Argumentos:
-        - file: str. Debe ser un archivo de extensión .msh exportado por GMSH.
+        - file: str. Debe ser un archivo de extensión .msh exportado por GMSH
+                (o un objeto Mesh ya leído).
         - tipo: str. 'shell' o '2D'
         - mostrar_nodos: bool. Define si se muestran los nodos en el gráfico.
         - mostrar_num_nodo: bool. Define si se muestra el número de cada nodo
                             en el gráfico.
         - mostrar_num_elem: bool. Define si se muestra el número de cada ele-
-                            mento finito en el gráfico.                            
+                            mento finito en el gráfico.
+        - max_etiquetas: int. Los números de los nodos o de los EF solo se
+                         escriben si hay a lo sumo esta cantidad.
+
+        Los contornos de todos los EF se dibujan con una sola colección de
+        líneas y los nodos con un solo scatter, de modo que el tiempo de
+        dibujo casi no depende del número de EF.
     '''
+    malla = cargar_malla(file)  # El archivo se lee una única vez
+    graficar_malla(malla.xnod, malla.LaG, malla.mat, tipo, mostrar_nodos,
+                   mostrar_num_nodo, mostrar_num_elem, max_etiquetas)
 
-    LaG_mat = LaG_from_msh(file)
-    mat = LaG_mat[:, 0]
-    LaG = LaG_mat[:, 1:]
-    nef = LaG.shape[0]
-    
-    # Se determina el tipo de elemento finito
-    if LaG.shape[1] == 3:
-        elem = 'T3'
-    elif LaG.shape[1] == 4:
-        elem = 'Q4'
-    elif LaG.shape[1] == 6:
-        elem = 'T6'
-    elif LaG.shape[1] == 8:
-        elem = 'Q8'
-    elif LaG.shape[1] == 9:
-        elem = 'Q9'
-    elif LaG.shape[1] == 10:
-        elem = 'T10'
-
-    if tipo=='shell':
-        xnod = xnod_from_msh(file, 3)
-        nno = xnod.shape[0]
-
-        cg = np.empty((nef,3))  # Centro de gravedad del EF
-        colores = list(BASE_COLORS.values()) + list(TABLEAU_COLORS.values())
-
-        fig = plt.figure(figsize=(12, 12))
-        ax = plt.gca(projection='3d')
-        for e in range(nef):
-            if elem=='T3' or elem=='Q4':
-                nodos = np.r_[LaG[e], LaG[e, 0]]
-            elif elem =='T6':
-                nodos = LaG[e, [0, 3, 1, 4, 2, 5, 0]]
-            elif elem =='Q8' or elem == 'Q9':
-                nodos = LaG[e, [0, 4, 1, 5, 2, 6, 3, 7, 0]]
-            elif elem == 'T10':
-                nodos = LaG[e, [0, 3, 4, 1, 5, 6, 2, 7, 8, 0]]
-            color = colores[mat[e]]
-            X = xnod[nodos,0]
-            Y = xnod[nodos,1]
-            Z = xnod[nodos,2]
-            
-            ax.plot3D(X, Y, Z, '-', lw=0.8, c=color)
-            if mostrar_nodos:
-                ax.plot3D(xnod[LaG[e],0], xnod[LaG[e],1], xnod[LaG[e],2],
-                          'ko', ms=5, mfc='r')
-            if mostrar_num_elem:
-                # se calcula la posición del centro de gravedad del EF
-                cg[e] = np.mean(xnod[LaG[e]], axis=0)
-        
-                # y se reporta el número del elemento actual
-                ax.text(cg[e,0], cg[e,1], cg[e,2], f'{e+1}',
-                        horizontalalignment='center',
-                        verticalalignment='center',  color=color)
-        if mostrar_num_nodo:
-            for i in range(nno):
-               ax.text(xnod[i,0], xnod[i,1], xnod[i,2], f'{i+1}', color='r')
-        fig.suptitle(f'Malla de EF Shell ({elem})', fontsize='x-large')
-        ax.set_xlabel('x')
-        ax.set_ylabel('y')
-        ax.set_zlabel('z')
-        ax.view_init(45, 45)
-        
-    elif tipo=='2D':
-        xnod = xnod_from_msh(file, 2)
-        nno = xnod.shape[0]
-
-        cg = np.empty((nef,2))
-        colores = list(BASE_COLORS.values()) + list(TABLEAU_COLORS.values())
-        fig = plt.figure(figsize=(12, 12))
-        ax = plt.gca()
-        for e in range(nef):
-            if elem=='T3' or elem=='Q4':
-                nodos = np.r_[LaG[e], LaG[e, 0]]
-            elif elem =='T6':
-                nodos = LaG[e, [0, 3, 1, 4, 2, 5, 0]]
-            elif elem =='Q8' or elem == 'Q9':
-                nodos = LaG[e, [0, 4, 1, 5, 2, 6, 3, 7, 0]]
-            elif elem == 'T10':
-                nodos = LaG[e, [0, 3, 4, 1, 5, 6, 2, 7, 8, 0]]
-            color = colores[mat[e]]
-            X = xnod[nodos,0]
-            Y = xnod[nodos,1]
-            ax.plot(X, Y, '-', lw=0.8, c=color)
-            if mostrar_nodos:
-                ax.plot(xnod[LaG[e],0], xnod[LaG[e],1], 'ko', ms=5, mfc='r')
-            if mostrar_num_elem:
-                # se calcula la posición del centro de gravedad del EF
-                cg[e] = np.mean(xnod[LaG[e]], axis=0)
-        
-                # y se reporta el número del elemento actual
-                ax.text(cg[e,0], cg[e,1], f'{e+1}', horizontalalignment='center',
-                        verticalalignment='center',  color=color)
-        if mostrar_num_nodo:
-            for i in range(nno):
-               ax.text(xnod[i,0], xnod[i,1], f'{i+1}', color='r')
-        fig.suptitle(f'Malla de EF 2D ({elem})', fontsize='x-large')
-        ax.set_xlabel('x')
-        ax.set_ylabel('y')
-        ax.set_aspect('equal', adjustable='box')
-    else:
-        raise ValueError('El argumento "tipo" introducido no es válido')
\ No newline at end of file
+
+def vista_previa_msh(file, ancho=1200, alto=None, todas_aristas=False):
+    ''' Vista previa rápida de una malla 2D muy grande.
+
+        En lugar de dibujar cada EF, las aristas se rasterizan en una imagen
+        de ancho x alto píxeles (las aristas más pequeñas que un píxel se
+        funden en él), así que el costo del dibujo depende del número de
+        píxeles y no del número de EF.
+
+        Argumentos:
+        - file: str. Archivo .msh exportado por GMSH (o un objeto Mesh ya
+                leído).
+        - ancho: int. Ancho de la imagen en píxeles.
+        - alto: int. Alto de la imagen en píxeles; si es None se calcula para
+                conservar la proporción de la malla.
+        - todas_aristas: bool. Si es False solo se dibujan la frontera de la
+                         malla (negro) y las interfaces entre materiales
+                         (rojo), obtenidas de la columna mat de LaG; si es
+                         True también se dibujan en gris las demás aristas.
+    '''
+    malla = cargar_malla(file)  # El archivo se lee una única vez
+    vista_previa_malla(malla.xnod, malla.LaG, malla.mat, malla.topologia,
+                       ancho, alto, todas_aristas)
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Medidas geométricas de una malla de EF (áreas, centroides y calidad de los
+elementos), calculadas para todos los EF a la vez.
+
+Se soportan EF triangulares (T3, T6) y cuadriláteros (Q4, Q8, Q9), tanto
+planos como de tipo shell (en 3D), con la numeración local de los nodos que
+usa GMSH (la de la matriz LaG de leer_GMSH.py). El área de cada EF se calcula
+integrando con una cuadratura de Gauss la norma del producto cruz
+|dx/dxi x dx/deta|, de modo que también es correcta para EF de lados curvos.
+"""
+
+import numpy as np
+
+# %% Funciones de forma y sus derivadas en el elemento de referencia:
+#    triángulos: (0,0), (1,0), (0,1); cuadriláteros: [-1, 1] x [-1, 1]
+
+# coordenadas naturales de los nodos de los cuadriláteros (numeración GMSH)
+XI_Q  = np.array([-1,  1, 1, -1,  0, 1, 0, -1, 0])
+ETA_Q = np.array([-1, -1, 1,  1, -1, 0, 1,  0, 0])
+
+
+def _forma_T3(xi, eta):
+    uno, cero = np.ones_like(xi), np.zeros_like(xi)
+    N       = np.c_[1 - xi - eta, xi, eta]
+    dN_dxi  = np.c_[-uno, uno, cero]
+    dN_deta = np.c_[-uno, cero, uno]
+    return N, dN_dxi, dN_deta
+
+
+def _forma_T6(xi, eta):
+    L1, L2, L3 = 1 - xi - eta, xi, eta
+    cero = np.zeros_like(xi)
+    N       = np.c_[L1*(2*L1 - 1), L2*(2*L2 - 1), L3*(2*L3 - 1),
+                    4*L1*L2,       4*L2*L3,       4*L3*L1      ]
+    dN_dxi  = np.c_[1 - 4*L1,      4*L2 - 1,      cero,
+                    4*(L1 - L2),   4*L3,          -4*L3        ]
+    dN_deta = np.c_[1 - 4*L1,      cero,          4*L3 - 1,
+                    -4*L2,         4*L2,          4*(L1 - L3)  ]
+    return N, dN_dxi, dN_deta
+
+
+def _forma_Q4(xi, eta):
+    xi_i, eta_i = XI_Q[:4], ETA_Q[:4]
+    xi, eta = xi[:, None], eta[:, None]
+    N       = (1 + xi*xi_i)*(1 + eta*eta_i)/4
+    dN_dxi  = xi_i*(1 + eta*eta_i)/4
+    dN_deta = (1 + xi*xi_i)*eta_i/4
+    return N, dN_dxi, dN_deta
+
+
+def _forma_Q8(xi, eta):
+    xi_i, eta_i = XI_Q[:8], ETA_Q[:8]
+    xi, eta = xi[:, None], eta[:, None]
+    esq = np.arange(8) < 4   # nodos esquina
+
+    # esquinas: (1 + xi*xi_i)*(1 + eta*eta_i)*(xi*xi_i + eta*eta_i - 1)/4
+    a, b = 1 + xi*xi_i, 1 + eta*eta_i
+    c = xi*xi_i + eta*eta_i - 1
+    N_e       = a*b*c/4
+    dN_dxi_e  = xi_i*b*(c + a)/4
+    dN_deta_e = eta_i*a*(c + b)/4
+
+    # nodos intermedios de los lados
+    N_m       = np.where(xi_i == 0, (1 - xi**2)*b, a*(1 - eta**2))/2
+    dN_dxi_m  = np.where(xi_i == 0, -2*xi*b,       xi_i*(1 - eta**2))/2
+    dN_deta_m = np.where(xi_i == 0, (1 - xi**2)*eta_i, -2*eta*a)/2
+
+    return (np.where(esq, N_e, N_m), np.where(esq, dN_dxi_e, dN_dxi_m),
+            np.where(esq, dN_deta_e, dN_deta_m))
+
+
+def _lagrange_1D(s, s_i):
+    ''' Polinomios de Lagrange cuadráticos (nodos -1, 0, 1) y sus derivadas. '''
+    L  = np.select([s_i == -1, s_i == 0], [s*(s - 1)/2, 1 - s**2], s*(s + 1)/2)
+    dL = np.select([s_i == -1, s_i == 0], [s - 1/2,     -2*s    ], s + 1/2   )
+    return L, dL
+
+
+def _forma_Q9(xi, eta):
+    Lx, dLx = _lagrange_1D(xi[:, None],  XI_Q)
+    Ly, dLy = _lagrange_1D(eta[:, None], ETA_Q)
+    return Lx*Ly, dLx*Ly, Lx*dLy
+
+
+# tipo de EF según su número de nodos: (funciones de forma, es triángulo,
+# número de esquinas, orden por defecto de la cuadratura)
+TIPOS_EF = {3: (_forma_T3, True,  3, 1),
+            6: (_forma_T6, True,  3, 2),
+            4: (_forma_Q4, False, 4, 2),
+            8: (_forma_Q8, False, 4, 3),
+            9: (_forma_Q9, False, 4, 3)}
+
+
+def cuadratura_gauss(triangulo, n_gl):
+    ''' Puntos (xi, eta) y pesos de la cuadratura de Gauss-Legendre de orden
+        n_gl en el cuadrado, o de su transformación (colapsada) al triángulo.
+    '''
+    x_gl, w_gl = np.polynomial.legendre.leggauss(n_gl)
+    u, v = [c.ravel() for c in np.meshgrid(x_gl, x_gl, indexing='ij')]
+    w = np.outer(w_gl, w_gl).ravel()
+    if triangulo:
+        xi  = (1 + u)/2
+        eta = (1 - u)*(1 + v)/4
+        w   = w*(1 - u)/8
+        return xi, eta, w
+    return u, v, w
+
+
+# %% Medidas de la malla:
+
+def medidas_malla(xnod, LaG, mat=None, n_gl=None, tam_bloque=200000):
+    ''' Calcula, para todos los EF a la vez, sus áreas, centroides y calidad.
+
+        Argumentos:
+        - xnod: array (nno, 2) o (nno, 3). Coordenadas nodales.
+        - LaG: array (nef, nno_ef). Nodos de cada EF (numeración de GMSH),
+               con nno_ef = 3 (T3), 6 (T6), 4 (Q4), 8 (Q8) o 9 (Q9).
+        - mat: array (nef,). Material de cada EF (opcional).
+        - n_gl: orden de la cuadratura de Gauss; por defecto, uno que integra
+                exactamente el área de los EF planos.
+        - tam_bloque: número de EF que se procesan a la vez; limita la
+                      memoria de los arreglos intermedios.
+
+        Retorna un diccionario con:
+        - 'area': array (nef,). Área de cada EF.
+        - 'area_total': float. Área de la malla.
+        - 'area_material': array (nmat,). Área de cada material (solo si se
+                           da mat).
+        - 'centroide': array (nef, dim). Centroide de cada EF.
+        - 'calidad': array (nef,). Calidad de forma de cada EF, c*A/sum(l²),
+                     calculada con sus esquinas (A = área del polígono de las
+                     esquinas, l = longitud de sus lados y c tal que el
+                     triángulo equilátero y el cuadrado tienen calidad 1); es
+                     cercana a 0 para EF degenerados.
+    '''
+    if LaG.shape[1] not in TIPOS_EF:
+        raise ValueError(f'No se soportan EF de {LaG.shape[1]} nodos')
+    forma, triangulo, nesq, n_gl_defecto = TIPOS_EF[LaG.shape[1]]
+    if n_gl is None:
+        n_gl = n_gl_defecto + (xnod.shape[1] == 3 and
+                               np.ptp(xnod[:, 2]) > 0)  # shell: +1
+
+    # funciones de forma y sus derivadas en los puntos de Gauss (se evalúan
+    # una sola vez para todos los EF)
+    xi, eta, w = cuadratura_gauss(triangulo, n_gl)
+    N, dN_dxi, dN_deta = forma(xi, eta)
+
+    nef, dim = LaG.shape[0], xnod.shape[1]
+    area      = np.empty(nef)
+    centroide = np.empty((nef, dim))
+    calidad   = np.empty(nef)
+    for ini in range(0, nef, tam_bloque):
+        b = slice(ini, min(ini + tam_bloque, nef))
+        xe = xnod[LaG[b]]                                   # (nef_b, nno_ef, dim)
+        if dim == 2:
+            xe = np.concatenate((xe, np.zeros(xe.shape[:2] + (1,))), axis=2)
+
+        # diferencial de área |dx/dxi x dx/deta| en cada punto de Gauss
+        x_xi  = np.einsum('gi,eik->egk', dN_dxi,  xe)
+        x_eta = np.einsum('gi,eik->egk', dN_deta, xe)
+        dA = np.linalg.norm(np.cross(x_xi, x_eta), axis=2)*w
+
+        area[b] = dA.sum(axis=1)
+        centroide[b] = np.einsum('egk,eg->ek', np.einsum('gi,eik->egk', N, xe),
+                                 dA)[:, :dim]/area[b, None]
+
+        # calidad con el polígono de las esquinas
+        esq = xe[:, :nesq]
+        lados = np.roll(esq, -1, axis=1) - esq
+        if triangulo:
+            A_esq = np.linalg.norm(np.cross(lados[:, 0], -lados[:, 2]),
+                                   axis=1)/2
+            c = 4*np.sqrt(3)
+        else:
+            A_esq = np.linalg.norm(np.cross(esq[:, 2] - esq[:, 0],
+                                            esq[:, 3] - esq[:, 1]), axis=1)/2
+            c = 4
+        calidad[b] = c*A_esq/(lados**2).sum(axis=(1, 2))
+
+    medidas = {'area': area, 'area_total': area.sum(),
+               'centroide': centroide, 'calidad': calidad}
+    if mat is not None:
+        medidas['area_material'] = np.bincount(mat, weights=area)
+
+    return medidas
@@ -10,13 +10,153 @@ de GMSH en Python, usar el comando pip install --upgrade gmsh
 Por: Alejandro Hincapié G.
 """
 
-import gmsh  # pip install --upgrade gmsh
+import os
+from functools import lru_cache
 
-def grupos_fisicos(archivo, dim=-1):
+import numpy as np
+
+from leer_GMSH import Mesh, cargar_malla
+
+
+class GruposFisicos:
+    ''' Índice de los grupos físicos de una malla, construido una sola vez.
+
+        Los grupos se buscan por nombre o por etiqueta (tag) en diccionarios,
+        sin recorrer listas. Los nodos y EF de cada grupo se extraen solo
+        cuando se piden y se guardan como arrays ordenados de enteros (sin
+        repetidos), de modo que se pueden unir o intersectar directamente con
+        np.union1d / np.intersect1d(..., assume_unique=True).
+
+        Argumentos:
+        - archivo: nombre del archivo .msh o malla (Mesh) ya leída.
+        - cache: ver leer_GMSH.Mesh.
+
+        Atributos:
+        - malla: Mesh. Malla de la que se obtienen los grupos.
+        - por_tag: dict {tag: (dim, nombre)}.
+        - por_nombre: dict {nombre: [tags]}. Un mismo nombre puede estar
+                      asignado a grupos de distinta dimensión.
+    '''
+
+    def __init__(self, archivo, cache=False):
+        if not isinstance(archivo, Mesh) and archivo[-4:] != '.msh':
+            raise ValueError('Solo se admite un archivo de extensión .msh')
+        self.malla = cargar_malla(archivo, cache)
+        self.por_tag = dict(self.malla.grupos)
+        self.por_nombre = {}
+        for tag, (dim, nombre) in self.por_tag.items():
+            self.por_nombre.setdefault(nombre, []).append(tag)
+        self._nodos = {}
+        self._elementos = {}
+
+    def __len__(self):
+        return len(self.por_tag)
+
+    def __iter__(self):
+        return iter(self.por_tag)
+
+    def __contains__(self, grupo):
+        return grupo in self.por_tag or grupo in self.por_nombre
+
+    def tag(self, grupo):
+        ''' Etiqueta del grupo físico dado por su nombre o su etiqueta. '''
+        if isinstance(grupo, str):
+            tags = self.por_nombre.get(grupo)
+            if tags is None:
+                raise ValueError('El nombre de grupo físico ingresado no existe.')
+            if len(tags) > 1:
+                raise ValueError(f'Hay varios grupos físicos de nombre "{grupo}"'
+                                 f' (tags {tags}); búsquelo por su etiqueta.')
+            return tags[0]
+        if grupo not in self.por_tag:
+            raise ValueError(f'No existe el grupo físico de etiqueta {grupo}.')
+        return grupo
+
+    def nombre(self, grupo):
+        return self.por_tag[self.tag(grupo)][1]
+
+    def dim(self, grupo):
+        return self.por_tag[self.tag(grupo)][0]
+
+    def nodos(self, grupo):
+        ''' Nodos del grupo físico (desde 0, es decir, filas de xnod),
+            ordenados y sin repetidos. El array es de solo lectura.
+        '''
+        tag = self.tag(grupo)
+        if tag not in self._nodos:
+            nodos = self.malla.nodos_grupo[tag] - 1
+            nodos.setflags(write=False)
+            self._nodos[tag] = nodos
+        return self._nodos[tag]
+
+    def elementos(self, grupo):
+        ''' EF (filas de LaG) del grupo físico, ordenados. Para un grupo de
+            superficies son los EF de tales superficies; para un grupo de
+            curvas o puntos, los EF que tienen al menos un nodo del grupo. El
+            array es de solo lectura.
+        '''
+        tag = self.tag(grupo)
+        if tag not in self._elementos:
+            malla = self.malla
+            if self.dim(tag) == 2:
+                mats = np.flatnonzero(np.isin(malla.superficies,
+                                              malla.entidades_grupo[tag]))
+                efs = np.flatnonzero(np.isin(malla.mat, mats))
+            else:
+                dentro = np.zeros(malla.xnod.shape[0], dtype=bool)
+                dentro[self.nodos(tag)] = True
+                efs = np.flatnonzero(dentro[malla.LaG].any(axis=1))
+            efs.setflags(write=False)
+            self._elementos[tag] = efs
+        return self._elementos[tag]
+
+    def union_nodos(self, grupos):
+        ''' Nodos que pertenecen a alguno de los grupos dados. '''
+        nodos = [self.nodos(g) for g in grupos]
+        return np.unique(np.concatenate(nodos)) if nodos \
+               else np.empty(0, dtype=np.int64)
+
+    def interseccion_nodos(self, grupos):
+        ''' Nodos que pertenecen a todos los grupos dados. '''
+        grupos = list(grupos)
+        nodos = self.nodos(grupos[0])
+        for g in grupos[1:]:
+            nodos = np.intersect1d(nodos, self.nodos(g), assume_unique=True)
+        return nodos
+
+
+# Solo se conserva el índice del último archivo consultado, ya que cada índice
+# mantiene viva su malla completa (xnod, LaG, ...)
+@lru_cache(maxsize=1)
+def _indice_archivo(ruta, fecha, cache):
+    return GruposFisicos(ruta, cache)
+
+
+def indice_grupos(archivo, cache=False):
+    ''' Retorna el índice (GruposFisicos) de los grupos físicos de la malla.
+        Para un mismo archivo .msh (y la misma fecha de modificación) el
+        índice se construye una sola vez y se reutiliza mientras se sigan
+        consultando grupos de ese archivo. "archivo" puede ser también un
+        objeto Mesh ya leído o un índice GruposFisicos.
+    '''
+    if isinstance(archivo, GruposFisicos):
+        return archivo
+    if isinstance(archivo, Mesh):
+        return GruposFisicos(archivo)
+    if archivo[-4:] != '.msh':
+        raise ValueError('Solo se admite un archivo de extensión .msh')
+    return _indice_archivo(os.path.abspath(archivo),
+                           os.stat(archivo).st_mtime_ns, cache)
+
+def grupos_fisicos(archivo, dim=-1, cache=False):
     ''' Lee un archivo de texto con extensión .msh que contiene los datos de
         una malla generada en GMSH.
+        "archivo" puede ser también un objeto Mesh ya leído, en cuyo caso no
+        se vuelve a abrir el archivo.
         Si se especifica el argumento dim, solo se reportan los grupos físicos
         de tal dimensión, si no, se reportan todos.
+        Con cache=True los grupos se guardan/cargan desde la caché en disco
+        de leer_GMSH.py (ver leer_GMSH.Mesh).
         Retorna:
             - Un diccionario en el cual las claves son las ETIQUETAS de los 
               grupos físicos y los valores son tuplas con la DIMENSIÓN y el
@@ -25,37 +165,24 @@ def grupos_fisicos(archivo, dim=-1):
               grupos físicos y los valores son listas con los nodos asociados
               a cada grupo físico.
     '''
-    if archivo[-4:] != '.msh':
+    if not isinstance(archivo, Mesh) and archivo[-4:] != '.msh':
         raise ValueError('Solo se admite un archivo de extensión .msh')
 
-    gmsh.initialize()
-    gmsh.open(archivo)
-
-    grupos = gmsh.model.getPhysicalGroups(dim)
-    dims = [d[0] for d in grupos]
-    tags = [d[1] for d in grupos]
-    nombres = [(dim, gmsh.model.getPhysicalName(dim, tag))
-                for dim, tag in grupos]
+    return cargar_malla(archivo, cache).grupos_fisicos(dim)
 
-    dict1 = dict(zip(tags, nombres))  # Primer diccionario a reportar
 
-    nodos = [gmsh.model.mesh.getNodesForPhysicalGroup(dims[i], tags[i])[0]
-             for i in range(len(dims))]
-    dict2 = dict(zip(tags, nodos))  # Segundo diccionario a reportar
+def obtener_nodos(archivo, nombre_grupo, cache=False):
+    ''' Lee un archivo de extensión .msh (o un objeto Mesh o GruposFisicos)
+        y obtiene los nodos asociados al grupo físico de nombre
+        "nombre_grupo", tal como los reporta GMSH (desde 1).
 
-    gmsh.finalize()
-
-    return dict1, dict2
-
-
-def obtener_nodos(archivo, nombre_grupo):
-    ''' Lee un archivo de extensión .msh y obtiene los nodos asociados al grupo
-        físico de nombre "nombre_grupo".
+        La malla se lee una sola vez por archivo (ver indice_grupos), así que
+        se pueden pedir los nodos de muchos grupos sin volver a leerla. Si
+        varios grupos tienen ese nombre, se retornan los del primero (use
+        GruposFisicos para buscarlos por su etiqueta).
     '''
-    d1, d2 = grupos_fisicos(archivo)
-    nombres = [t[1] for t in d1.values()]
-    if nombre_grupo in nombres:
-        nodos = d2[list(d2.keys())[nombres.index(nombre_grupo)]]
-        return nodos
-    else:
+    indice = indice_grupos(archivo, cache)
+    tags = indice.por_nombre.get(nombre_grupo)
+    if tags is None:
         raise ValueError('El nombre de grupo físico ingresado no existe.')
+    return indice.malla.nodos_grupo[tags[0]]
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de los indicadores de calidad de la malla con EF cuyos valores se
+conocen de antemano
+(ejecutar con: python -m pytest test_calidad_malla.py).
+"""
+
+import matplotlib
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from calidad_malla import (calidad_malla, peores_elementos, resumen_calidad,
+                           plot_calidad)
+
+S3 = np.sqrt(3)
+
+
+def con_nodos_intermedios(xnod, LaG, lados):
+    ''' Agrega a la malla los nodos en la mitad de los lados de cada EF. '''
+    medios = xnod[LaG[:, lados]].mean(axis=2)
+    nef, nlados = LaG.shape[0], len(lados)
+    nuevos = xnod.shape[0] + np.arange(nef*nlados).reshape((nef, nlados))
+    return np.r_[xnod, medios.reshape((-1, xnod.shape[1]))], np.c_[LaG, nuevos]
+
+
+def cuadrilateros():
+    ''' Cuadrado, rectángulo 2x1, rombo de 60° y cuadrado en sentido
+        horario. '''
+    xnod = np.array([[0, 0], [1, 0], [1, 1], [0, 1],
+                     [2, 0], [4, 0], [4, 1], [2, 1],
+                     [5, 0], [6, 0], [6.5, S3/2], [5.5, S3/2]])
+    LaG = np.array([[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11],
+                    [0, 3, 2, 1]])
+    return xnod, LaG
+
+
+def triangulos():
+    ''' Triángulo equilátero y triángulo rectángulo isósceles. '''
+    xnod = np.array([[0, 0], [1, 0], [0.5, S3/2], [2, 0], [3, 0], [2, 1]])
+    return xnod, np.array([[0, 1, 2], [3, 4, 5]])
+
+
+@pytest.mark.parametrize('cuadraticos', [False, True])
+def test_cuadrilateros(cuadraticos):
+    xnod, LaG = cuadrilateros()
+    if cuadraticos:
+        xnod, LaG = con_nodos_intermedios(xnod, LaG,
+                                          [[0, 1], [1, 2], [2, 3], [3, 0]])
+    calidad = calidad_malla(xnod, LaG, procesos=1)
+    np.testing.assert_allclose(calidad['jacobiano_escalado'],
+                               [1, 1, S3/2, -1], atol=1e-12)
+    np.testing.assert_allclose(calidad['razon_jacobiano'][:3], 1, atol=1e-12)
+    assert calidad['razon_jacobiano'][3] < 0
+    np.testing.assert_allclose(calidad['relacion_aspecto'], [1, 2, 1, 1])
+    np.testing.assert_allclose(calidad['sesgo'], [0, 0, 1/3, 0], atol=1e-12)
+    np.testing.assert_allclose(calidad['alabeo'], 0)
+
+
+@pytest.mark.parametrize('cuadraticos', [False, True])
+def test_triangulos(cuadraticos):
+    xnod, LaG = triangulos()
+    if cuadraticos:
+        xnod, LaG = con_nodos_intermedios(xnod, LaG, [[0, 1], [1, 2], [2, 0]])
+    calidad = calidad_malla(xnod, LaG, procesos=1)
+    np.testing.assert_allclose(calidad['jacobiano_escalado'],
+                               [1, 2/S3*np.sin(np.pi/4)], atol=1e-12)
+    np.testing.assert_allclose(calidad['razon_jacobiano'], 1, atol=1e-12)
+    np.testing.assert_allclose(calidad['relacion_aspecto'], [1, np.sqrt(2)])
+    np.testing.assert_allclose(calidad['sesgo'], [0, 0.25], atol=1e-12)
+    np.testing.assert_allclose(calidad['alabeo'], 0)
+
+
+def test_alabeo():
+    xnod = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0.2], [0, 1, 0]])
+    calidad = calidad_malla(xnod, np.array([[0, 1, 2, 3]]), procesos=1)
+    assert calidad['alabeo'][0] > 0
+
+
+def test_varios_procesos_igual_a_uno():
+    rng = np.random.default_rng(0)
+    xnod, LaG = cuadrilateros()
+    xnod = np.r_[xnod, xnod + 10] + rng.uniform(-0.1, 0.1, (24, 2))
+    LaG = np.r_[LaG, LaG + 12]
+    serial = calidad_malla(xnod, LaG, procesos=1)
+    paralelo = calidad_malla(xnod, LaG, procesos=2, tam_bloque=3)
+    for metrica in serial:
+        np.testing.assert_array_equal(paralelo[metrica], serial[metrica])
+
+
+def test_resumen_y_grafico():
+    xnod, LaG = cuadrilateros()
+    calidad = calidad_malla(xnod, LaG, procesos=1)
+    np.testing.assert_array_equal(
+        peores_elementos(calidad, 'jacobiano_escalado', 2), [3, 2])
+    np.testing.assert_array_equal(
+        peores_elementos(calidad, 'relacion_aspecto', 1), [1])
+    resumen = resumen_calidad(calidad, n_peores=2)
+    assert resumen['sesgo']['max'] == pytest.approx(1/3)
+    assert resumen['alabeo']['histograma'][0].sum() == LaG.shape[0]
+
+    plot_calidad(calidad)
+    fig = plt.gcf()
+    assert fig._suptitle.get_text() == 'Calidad de la malla (4 EF)'
+    plt.close(fig)
+
+
+def test_EF_no_soportados():
+    with pytest.raises(ValueError):
+        calidad_malla(np.zeros((5, 2)), np.array([[0, 1, 2, 3, 4]]))
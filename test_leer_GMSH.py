@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de la lectura de mallas con la clase Mesh: los resultados se comparan
+con los de las funciones originales de leer_GMSH.py y obtener_grupos_fisicos.py,
+que consultaban la API de GMSH en cada llamado
+(ejecutar con: python -m pytest test_leer_GMSH.py).
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+gmsh = pytest.importorskip('gmsh')
+
+from leer_GMSH import (Mesh, xnod_from_msh, LaG_from_msh, depurar_cache,
+                       _clave_cache)
+
+
+def crear_malla(archivo, renumerar=False):
+    ''' Malla de cuadriláteros de 8 nodos de dos rectángulos adyacentes, con
+        grupos físicos de superficies, curvas y puntos. Si renumerar=True,
+        las etiquetas de los nodos no son consecutivas ni empiezan en 1.
+    '''
+    gmsh.initialize()
+    try:
+        gmsh.option.setNumber('General.Terminal', 0)
+        gmsh.model.add('prueba')
+        gmsh.model.occ.addRectangle(0, 0, 0, 1, 1)
+        gmsh.model.occ.addRectangle(1, 0, 0, 2, 1)
+        gmsh.model.occ.fragment([(2, 1)], [(2, 2)])
+        gmsh.model.occ.synchronize()
+        gmsh.model.addPhysicalGroup(2, [1], 1, 'izquierda')
+        gmsh.model.addPhysicalGroup(2, [2], 2, 'derecha')
+        gmsh.model.addPhysicalGroup(1, [4, 5], 3, 'borde')
+        gmsh.model.addPhysicalGroup(0, [1], 4, 'esquina')
+        gmsh.option.setNumber('Mesh.RecombineAll', 1)
+        gmsh.option.setNumber('Mesh.MeshSizeMax', 0.3)
+        gmsh.option.setNumber('Mesh.ElementOrder', 2)
+        gmsh.option.setNumber('Mesh.SecondOrderIncomplete', 1)
+        gmsh.model.mesh.generate(2)
+        if renumerar:
+            tags = gmsh.model.mesh.getNodes()[0]
+            gmsh.model.mesh.renumberNodes(tags, 3*tags[::-1] + 10)
+        gmsh.write(str(archivo))
+    finally:
+        gmsh.finalize()
+    return str(archivo)
+
+
+def leer_original(archivo):
+    ''' xnod, LaG_mat y los grupos físicos según las funciones originales.
+    '''
+    gmsh.initialize()
+    try:
+        gmsh.option.setNumber('General.Terminal', 0)
+        gmsh.open(archivo)
+        nod, xnod, pxnod = gmsh.model.mesh.getNodes()
+        xnod = xnod.reshape((nod.size, -1))
+
+        LaG, mats = [], []
+        for material, (dim, tag) in enumerate(gmsh.model.getEntities(2)):
+            tipo, efs, nodos = gmsh.model.mesh.getElements(dim, tag)
+            LaG.append(nodos[0].reshape((efs[0].size, -1)).astype(int) - 1)
+            mats.append(np.full(efs[0].size, material))
+        LaG_mat = np.c_[np.concatenate(mats), np.concatenate(LaG)]
+
+        grupos = {tag: (dim, gmsh.model.getPhysicalName(dim, tag))
+                  for dim, tag in gmsh.model.getPhysicalGroups()}
+        nodos = {tag: gmsh.model.mesh.getNodesForPhysicalGroup(dim, tag)[0]
+                 for dim, tag in gmsh.model.getPhysicalGroups()}
+    finally:
+        gmsh.finalize()
+    return xnod, LaG_mat, grupos, nodos
+
+
+def test_igual_a_las_funciones_originales(tmp_path):
+    archivo = crear_malla(tmp_path/'malla.msh')
+    xnod_ref, LaG_ref, grupos_ref, nodos_ref = leer_original(archivo)
+
+    malla = Mesh(archivo)
+    np.testing.assert_array_equal(malla.xnod, xnod_ref)
+    np.testing.assert_array_equal(malla.LaG_mat, LaG_ref)
+    assert malla.LaG.shape[1] == 8
+    np.testing.assert_array_equal(xnod_from_msh(malla), xnod_ref[:, :2])
+    np.testing.assert_array_equal(LaG_from_msh(archivo), LaG_ref)
+
+    grupos, nodos = malla.grupos_fisicos()
+    assert grupos == grupos_ref
+    for tag in grupos:
+        np.testing.assert_array_equal(nodos[tag], np.sort(nodos_ref[tag]))
+    assert malla.grupos_fisicos(dim=1)[0] == {3: (1, 'borde')}
+
+
+def test_etiquetas_no_consecutivas(tmp_path):
+    archivo = crear_malla(tmp_path/'malla.msh', renumerar=True)
+    gmsh.initialize()
+    try:
+        gmsh.option.setNumber('General.Terminal', 0)
+        gmsh.open(archivo)
+        tipos, efs, nodos = gmsh.model.mesh.getElements(2)
+        x_ef = np.array([gmsh.model.mesh.getNode(n)[0] for n in nodos[0]])
+        x_grupo = {tag: gmsh.model.mesh.getNodesForPhysicalGroup(dim, tag)[1]
+                   for dim, tag in gmsh.model.getPhysicalGroups()}
+        nno = gmsh.model.mesh.getNodes()[0].size
+    finally:
+        gmsh.finalize()
+
+    # los nodos se renumeran 1, ..., nno sin cambiar la geometría de los EF
+    malla = Mesh(archivo)
+    assert malla.xnod.shape[0] == nno and malla.LaG.max() == nno - 1
+    np.testing.assert_array_equal(malla.xnod[malla.LaG].reshape((-1, 3)),
+                                  x_ef)
+    for tag, x in x_grupo.items():
+        np.testing.assert_array_equal(
+            np.sort(malla.xnod[malla.nodos_grupo[tag] - 1], axis=0),
+            np.sort(x.reshape((-1, 3)), axis=0))
+
+
+def test_cache(tmp_path, monkeypatch):
+    archivo = crear_malla(tmp_path/'malla.msh', renumerar=True)
+    dir_cache = str(tmp_path/'cache')
+    malla = Mesh(archivo)
+    Mesh(archivo, cache=dir_cache)
+    assert len(os.listdir(dir_cache)) == 1
+
+    # la segunda lectura no usa GMSH
+    def sin_gmsh():
+        raise AssertionError('Se usó GMSH en lugar de la caché')
+    monkeypatch.setattr(gmsh, 'initialize', sin_gmsh)
+    en_cache = Mesh(archivo, cache=dir_cache)
+    for atributo in ('xnod', 'LaG', 'mat', 'superficies'):
+        np.testing.assert_array_equal(getattr(en_cache, atributo),
+                                      getattr(malla, atributo))
+    assert not en_cache.LaG.flags.writeable
+    assert en_cache.grupos == malla.grupos
+    for tag in malla.grupos:
+        np.testing.assert_array_equal(en_cache.nodos_grupo[tag],
+                                      malla.nodos_grupo[tag])
+    monkeypatch.undo()
+
+    # si el archivo cambia (fecha de modificación) se crea otra entrada, y
+    # depurar_cache elimina las más antiguas salvo la que se debe conservar
+    os.utime(archivo, ns=(0, os.stat(archivo).st_mtime_ns + 10**9))
+    Mesh(archivo, cache=dir_cache)
+    assert len(os.listdir(dir_cache)) == 2
+    depurar_cache(dir_cache, tamano_max=0, conservar=_clave_cache(archivo))
+    assert os.listdir(dir_cache) == [_clave_cache(archivo)]
+    depurar_cache(dir_cache, tamano_max=0)
+    assert os.listdir(dir_cache) == []
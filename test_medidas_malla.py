@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de las medidas de la malla contra el cálculo del área EF por EF de la
+versión original de area_malla.py
+(ejecutar con: python -m pytest test_medidas_malla.py).
+"""
+
+import numpy as np
+import pytest
+
+from medidas_malla import medidas_malla
+from test_calidad_malla import con_nodos_intermedios, cuadrilateros
+
+LADOS_T = [[0, 1], [1, 2], [2, 0]]
+LADOS_Q = [[0, 1], [1, 2], [2, 3], [3, 0]]
+
+
+def area_triangulo(coord):
+    ''' area_triangulo() de la versión original de area_malla.py. '''
+    c1, c2, c3 = coord
+    return np.linalg.norm(np.cross(c2 - c1, c3 - c1))/2
+
+
+def area_poligono(x):
+    ''' Fórmula del área de Gauss (polígono plano). '''
+    return abs(np.dot(x[:, 0], np.roll(x[:, 1], -1))
+               - np.dot(x[:, 1], np.roll(x[:, 0], -1)))/2
+
+
+@pytest.mark.parametrize('cuadraticos', [False, True])
+def test_triangulos_igual_al_ciclo_original(cuadraticos):
+    rng = np.random.default_rng(0)
+    xnod = rng.uniform(0, 1, (30, 3))               # triángulos en 3D
+    LaG = np.arange(30).reshape((10, 3))
+    area_ref = np.array([area_triangulo(xnod[n]) for n in LaG])
+    if cuadraticos:
+        xnod, LaG = con_nodos_intermedios(xnod, LaG, LADOS_T)
+
+    medidas = medidas_malla(xnod, LaG, mat=np.arange(10) % 2)
+    np.testing.assert_allclose(medidas['area'], area_ref, rtol=1e-12)
+    assert medidas['area_total'] == pytest.approx(area_ref.sum())
+    np.testing.assert_allclose(medidas['area_material'],
+                               [area_ref[0::2].sum(), area_ref[1::2].sum()])
+    np.testing.assert_allclose(medidas['centroide'],
+                               xnod[LaG[:, :3]].mean(axis=1), atol=1e-12)
+
+
+@pytest.mark.parametrize('nno_ef', [4, 8, 9])
+def test_cuadrilateros(nno_ef):
+    xnod, LaG = cuadrilateros()
+    xnod = xnod + np.random.default_rng(1).uniform(-0.1, 0.1, (12, 2))
+    LaG = LaG[:3]                       # sin el EF en sentido horario
+    area_ref = np.array([area_poligono(xnod[n]) for n in LaG])
+    if nno_ef >= 8:
+        xnod, LaG = con_nodos_intermedios(xnod, LaG, LADOS_Q)
+    if nno_ef == 9:
+        xnod, LaG = con_nodos_intermedios(xnod, LaG, [[0, 1, 2, 3]])
+
+    medidas = medidas_malla(xnod, LaG)
+    np.testing.assert_allclose(medidas['area'], area_ref, rtol=1e-12)
+    assert 'area_material' not in medidas
+    assert np.all((medidas['calidad'] > 0) & (medidas['calidad'] <= 1))
+
+
+def test_calidad_y_bloques():
+    xnod, LaG = cuadrilateros()
+    medidas = medidas_malla(xnod, LaG[:2])
+    np.testing.assert_allclose(medidas['calidad'], [1, 0.8])
+    np.testing.assert_allclose(medidas['centroide'], [[0.5, 0.5], [3, 0.5]])
+
+    xnod, LaG = con_nodos_intermedios(xnod, LaG, LADOS_Q)
+    por_bloques = medidas_malla(xnod, LaG, tam_bloque=3)
+    for medida, valor in medidas_malla(xnod, LaG).items():
+        np.testing.assert_allclose(por_bloques[medida], valor)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del índice de grupos físicos contra las funciones originales de
+obtener_grupos_fisicos.py, que consultaban la API de GMSH en cada llamado
+(ejecutar con: python -m pytest test_obtener_grupos_fisicos.py).
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+gmsh = pytest.importorskip('gmsh')
+
+from obtener_grupos_fisicos import indice_grupos, grupos_fisicos, obtener_nodos
+from test_leer_GMSH import crear_malla, leer_original
+
+
+def test_igual_a_las_funciones_originales(tmp_path):
+    archivo = crear_malla(tmp_path/'malla.msh')
+    xnod, LaG_mat, grupos_ref, nodos_ref = leer_original(archivo)
+
+    grupos, nodos = grupos_fisicos(archivo)
+    assert grupos == grupos_ref
+    for tag, (dim, nombre) in grupos_ref.items():
+        np.testing.assert_array_equal(nodos[tag], np.sort(nodos_ref[tag]))
+        np.testing.assert_array_equal(obtener_nodos(archivo, nombre),
+                                      np.sort(nodos_ref[tag]))
+    assert grupos_fisicos(archivo, dim=0)[0] == {4: (0, 'esquina')}
+    with pytest.raises(ValueError, match='no existe'):
+        obtener_nodos(archivo, 'techo')
+
+
+def test_indice(tmp_path):
+    archivo = crear_malla(tmp_path/'malla.msh')
+    indice = indice_grupos(archivo)
+    assert indice_grupos(archivo) is indice      # no se vuelve a leer
+    malla = indice.malla
+
+    assert len(indice) == 4 and 'borde' in indice and 3 in indice
+    assert indice.tag('derecha') == 2 and indice.dim('borde') == 1
+    np.testing.assert_array_equal(indice.nodos('borde'),
+                                  malla.nodos_grupo[3] - 1)
+    np.testing.assert_array_equal(indice.elementos('derecha'),
+                                  np.flatnonzero(malla.mat == 1))
+    np.testing.assert_array_equal(
+        indice.elementos('esquina'),
+        np.flatnonzero(np.any(malla.LaG == indice.nodos('esquina')[0],
+                              axis=1)))
+    np.testing.assert_array_equal(
+        indice.union_nodos(['izquierda', 'derecha']),
+        np.arange(malla.xnod.shape[0]))
+    np.testing.assert_array_equal(
+        indice.interseccion_nodos(['izquierda', 'borde']),
+        np.intersect1d(indice.nodos('izquierda'), indice.nodos('borde')))
+    with pytest.raises(ValueError):
+        indice.tag(99)
+
+    # si el archivo cambia se construye un índice nuevo
+    os.utime(archivo, ns=(0, os.stat(archivo).st_mtime_ns + 10**9))
+    assert indice_grupos(archivo) is not indice
+
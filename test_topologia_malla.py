@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas del índice topológico de la malla contra una búsqueda exhaustiva de
+las aristas de cada EF
+(ejecutar con: python -m pytest test_topologia_malla.py).
+"""
+
+import numpy as np
+import pytest
+
+from topologia_malla import LADOS_EF, Topologia
+
+
+def malla_Q4(nx=4, ny=3):
+    ''' Malla estructurada de nx x ny cuadriláteros de 4 nodos (numeración
+        de GMSH). '''
+    num = np.arange((nx + 1)*(ny + 1)).reshape((nx + 1, ny + 1))
+    return np.array([[num[i, j], num[i+1, j], num[i+1, j+1], num[i, j+1]]
+                     for i in range(nx) for j in range(ny)])
+
+
+def malla_T3(nx=4, ny=3):
+    ''' La misma malla, con cada cuadrilátero dividido en dos triángulos. '''
+    Q4 = malla_Q4(nx, ny)
+    return np.r_[Q4[:, [0, 1, 2]], Q4[:, [0, 2, 3]]]
+
+
+def aristas_exhaustivo(LaG):
+    ''' Diccionario {(n1, n2): [(e, lado), ...]} armado EF por EF. '''
+    aristas = {}
+    for e, nodos in enumerate(LaG):
+        for lado, locales in enumerate(LADOS_EF[LaG.shape[1]]):
+            n1, n2 = nodos[locales[0]], nodos[locales[-1]]
+            aristas.setdefault((min(n1, n2), max(n1, n2)), []).append((e, lado))
+    return aristas
+
+
+@pytest.mark.parametrize('LaG', [malla_Q4(), malla_T3()])
+def test_igual_a_la_busqueda_exhaustiva(LaG):
+    topo = Topologia(LaG)
+    aristas = aristas_exhaustivo(LaG)
+    assert topo.clave.size == len(aristas)
+
+    for (n1, n2), ef_lado in aristas.items():
+        ar = int(topo.buscar_aristas(n1, n2))
+        assert ar >= 0 and topo.buscar_aristas(n2, n1) == ar
+        assert sorted(zip(topo.ef_arista[ar], topo.lado_arista[ar])) == \
+               sorted(ef_lado + [(-1, -1)]*(2 - len(ef_lado)))
+        for e, lado in ef_lado:
+            assert topo.arista_ef[e, lado] == ar
+            otros = [o for o, l in ef_lado if o != e]
+            assert topo.vecinos[e, lado] == (otros[0] if otros else -1)
+
+    frontera = sorted(ef_lado[0] for ef_lado in aristas.values()
+                      if len(ef_lado) == 1)
+    assert sorted(zip(*topo.lados_frontera())) == frontera
+    assert topo.buscar_aristas(0, LaG.max()) == -1
+
+    for i in range(LaG.max() + 1):
+        np.testing.assert_array_equal(topo.elementos_nodo(i),
+                                      np.flatnonzero(np.any(LaG == i, axis=1)))
+
+
+def test_lados_frontera_de_un_grupo_de_nodos():
+    LaG = malla_Q4(nx=4, ny=3)
+    topo = Topologia(LaG)
+    # nodos del borde x = 0 (los primeros ny + 1 nodos)
+    e, lado = topo.lados_frontera(nodos=np.arange(4))
+    assert sorted(zip(e, lado)) == [(0, 3), (1, 3), (2, 3)]
+
+
+def test_aristas_compartidas_por_mas_de_dos_EF():
+    LaG = np.array([[0, 1, 2], [1, 0, 3], [0, 1, 4]])
+    with pytest.raises(ValueError):
+        Topologia(LaG)